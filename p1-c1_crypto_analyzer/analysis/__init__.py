@@ -1,4 +1,5 @@
+from .features import TextFeatures
 from .scorer import TextScorer
-from .combined_analyzer import CombinedAnalyzer
+from .combined_analyzer import CombinedAnalyzer, CaesarHypothesis
 
-__all__ = ["TextScorer", "CombinedAnalyzer"]
\ No newline at end of file
+__all__ = ["TextFeatures", "TextScorer", "CombinedAnalyzer", "CaesarHypothesis"]
\ No newline at end of file
@@ -0,0 +1,160 @@
+# analysis/cache.py - Persistent SQLite cache of analysis results
+"""
+On-disk cache of CombinedAnalyzer results.
+
+Entries are keyed by a SHA-256 digest of the ciphertext together with
+everything that can change the result (analysis options, scoring weights,
+data file versions). Payloads are marshal dumps of plain Python values, so
+loading an entry never runs code. Entries older than max_age_seconds are
+ignored and purged; when the cache grows past max_bytes the least recently
+used entries are evicted.
+"""
+import hashlib
+import marshal
+import os
+import sqlite3
+import time
+from typing import Any, Dict, Optional
+
+CACHE_FORMAT = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key TEXT PRIMARY KEY,
+    payload BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    created REAL NOT NULL,
+    accessed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed);
+"""
+
+
+def cache_key(ciphertext: str, *parts: Any) -> str:
+    """
+    Digest of a ciphertext and the parameters its result depends on
+    (any values with a stable repr: strings, numbers, tuples, sorted items).
+    """
+    digest = hashlib.sha256()
+    digest.update(repr((CACHE_FORMAT,) + parts).encode('utf-8'))
+    digest.update(b'\0')
+    digest.update(ciphertext.encode('utf-8', 'surrogatepass'))
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """
+    SQLite-backed result cache with size- and age-based eviction.
+
+    get/put store marshal-compatible payloads (dicts, lists, tuples,
+    strings, numbers, None). stats() reports hits, misses and size.
+    """
+
+    # Eviction runs once every EVICTION_INTERVAL stores
+    EVICTION_INTERVAL = 64
+
+    def __init__(self, path: str, max_bytes: int = 256 << 20,
+                 max_age_seconds: Optional[float] = 30 * 24 * 3600):
+        self.path = str(path)
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        self._connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.executescript(_SCHEMA)
+        self.evict()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Stored payload for a key, or None on a miss or an expired entry."""
+        row = self._connection.execute(
+            "SELECT payload, created FROM results WHERE key = ?", (key,)).fetchone()
+        now = time.time()
+        if row is None or self._expired(row[1], now):
+            self.misses += 1
+            return None
+        try:
+            payload = marshal.loads(row[0])
+        except (EOFError, ValueError, TypeError):
+            self.misses += 1
+            return None
+
+        self._connection.execute("UPDATE results SET accessed = ? WHERE key = ?", (now, key))
+        self.hits += 1
+        return payload
+
+    def put(self, key: str, payload: Any) -> None:
+        """Store a payload, replacing any previous entry for the key."""
+        data = marshal.dumps(payload)
+        now = time.time()
+        self._connection.execute(
+            "INSERT OR REPLACE INTO results (key, payload, size, created, accessed) "
+            "VALUES (?, ?, ?, ?, ?)", (key, data, len(data), now, now))
+        self.stores += 1
+        if self.stores % self.EVICTION_INTERVAL == 0:
+            self.evict()
+
+    def evict(self) -> int:
+        """
+        Delete expired entries, then least recently used ones until the
+        total payload size fits in max_bytes. Returns the entries deleted.
+        """
+        deleted = 0
+        if self.max_age_seconds is not None:
+            deleted += self._connection.execute(
+                "DELETE FROM results WHERE created < ?",
+                (time.time() - self.max_age_seconds,)).rowcount
+
+        total = self._connection.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+        if total > self.max_bytes:
+            excess = total - self.max_bytes
+            cutoff = None
+            for accessed, size in self._connection.execute(
+                    "SELECT accessed, size FROM results ORDER BY accessed"):
+                excess -= size
+                cutoff = accessed
+                if excess <= 0:
+                    break
+            deleted += self._connection.execute(
+                "DELETE FROM results WHERE accessed <= ?", (cutoff,)).rowcount
+
+        self.evictions += deleted
+        return deleted
+
+    def clear(self) -> None:
+        """Delete every entry."""
+        self._connection.execute("DELETE FROM results")
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters of this instance and the current cache size."""
+        entries, size = self._connection.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results").fetchone()
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'stores': self.stores,
+            'evictions': self.evictions,
+            'entries': entries,
+            'bytes': size
+        }
+
+    def close(self) -> None:
+        self._connection.close()
+
+    def __enter__(self) -> 'ResultCache':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _expired(self, created: float, now: float) -> bool:
+        return self.max_age_seconds is not None and created < now - self.max_age_seconds
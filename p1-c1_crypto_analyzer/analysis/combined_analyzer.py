@@ -1,10 +1,127 @@
 # analysis/combined_analyzer.py - VERSION CORRIGÉE P1-C1
+import copy
+import os
 import time
-import json
-from typing import Dict, List, Any, Optional
+from typing import Callable, Dict, List, Any, Optional, Iterable, Iterator, Tuple
 
-from analysis.scorer import TextScorer
+from analysis.features import TextFeatures
+from analysis.scorer import TextScorer, _add_timing
 from crypto.caesar import CaesarCipher
+from crypto.utils import count_letters
+
+
+class CaesarHypothesis(dict):
+    """
+    Hypothèse de déchiffrement paresseuse renvoyée par analyze_caesar.
+    
+    Ne stocke que la clé, le score et la confiance: 'plaintext' est déchiffré
+    au premier accès et 'preview' ne déchiffre que les 120 premiers
+    caractères. Se comporte comme le dictionnaire historique (mêmes clés,
+    même ordre, même export JSON).
+    """
+    
+    FIELDS = ('key', 'plaintext', 'score', 'confidence', 'preview')
+    PREVIEW_LENGTH = 120
+    
+    def __init__(self, ciphertext: str, key: int, score: float, confidence: str):
+        super().__init__(key=key, score=score, confidence=confidence)
+        self._ciphertext = ciphertext
+    
+    def __missing__(self, name: str) -> Any:
+        if name == 'plaintext':
+            value = CaesarCipher.decrypt(self._ciphertext, dict.__getitem__(self, 'key'))
+        elif name == 'preview':
+            # Le déchiffrement conserve la longueur: inutile de tout déchiffrer
+            value = CaesarCipher.decrypt(self._ciphertext[:self.PREVIEW_LENGTH],
+                                         dict.__getitem__(self, 'key'))
+            if len(self._ciphertext) > self.PREVIEW_LENGTH:
+                value += "..."
+        else:
+            raise KeyError(name)
+        self[name] = value
+        return value
+    
+    def __contains__(self, name: object) -> bool:
+        return name in self.FIELDS or dict.__contains__(self, name)
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.FIELDS)
+    
+    def __len__(self) -> int:
+        return len(self.FIELDS)
+    
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, dict):
+            return dict(self.items()) == dict(other.items())
+        return NotImplemented
+    
+    def __ne__(self, other: object) -> bool:
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+    
+    def __repr__(self) -> str:
+        return repr(dict(self.items()))
+    
+    def get(self, name: str, default: Any = None) -> Any:
+        return self[name] if name in self else default
+    
+    def keys(self) -> List[str]:
+        return list(self.FIELDS)
+    
+    def values(self) -> List[Any]:
+        return [self[name] for name in self.FIELDS]
+    
+    def items(self) -> List[Tuple[str, Any]]:
+        return [(name, self[name]) for name in self.FIELDS]
+    
+    def copy(self) -> Dict[str, Any]:
+        return dict(self.items())
+    
+    def __reduce__(self):
+        # Transmis entre processus sans le texte clair (recalculé à la lecture)
+        return (CaesarHypothesis, (self._ciphertext, dict.__getitem__(self, 'key'),
+                                   dict.__getitem__(self, 'score'),
+                                   dict.__getitem__(self, 'confidence')))
+
+
+# Analyseur propre à chaque processus de travail de analyze_many
+_worker_analyzer = None
+
+
+def _init_worker(data_dir: str, scoring_weights: Dict[str, float],
+                 dictionary_backend: str = "auto", language: str = "en") -> None:
+    """
+    Construit une seule fois l'analyseur d'un processus de travail; ses
+    tables volumineuses (dictionnaire compacté, n-grammes) sont projetées
+    en mémoire et partagées entre processus.
+    """
+    global _worker_analyzer
+    _worker_analyzer = CombinedAnalyzer(data_dir, dictionary_backend=dictionary_backend,
+                                        language=language)
+    _worker_analyzer.scoring_weights = dict(scoring_weights)
+
+
+def _analyze_in_worker(index: int, ciphertext: str, top_n: int,
+                       crib: Optional[str]) -> Tuple[int, Dict[str, Any]]:
+    """Tâche exécutée dans un processus de travail."""
+    return index, _worker_analyzer.analyze_caesar(ciphertext, top_n=top_n, crib=crib)
+
+
+def _rank_in_worker(index: int, ciphertext: str,
+                    top_n: int) -> Tuple[int, Dict[str, Any], Dict[str, Any]]:
+    """
+    Tâche d'un processus de travail pour les textes dédupliqués par forme
+    canonique: renvoie aussi le classement canonique, réutilisable par le
+    processus principal pour les rotations du même texte.
+    """
+    start_time = time.perf_counter_ns()
+    timings: Dict[str, int] = {}
+    canonical, offset = CaesarCipher.canonicalize(ciphertext)
+    _add_timing(timings, 'canonicalize', start_time)
+    ranking = _worker_analyzer._canonical_ranking(canonical, timings)
+    results = _worker_analyzer._results_from_ranking(ciphertext, offset, ranking, top_n,
+                                                     start_time, timings, "computed")
+    return index, results, ranking
 
 
 class CombinedAnalyzer:
@@ -13,14 +130,39 @@ class CombinedAnalyzer:
     Déchiffre automatiquement le chiffrement César avec scoring avancé.
     """
     
-    def __init__(self, data_dir: str = "data"):
+    # Crib des drapeaux CTF (recherche directe sous les 25 clés)
+    FLAG_CRIB = "FLAG{"
+    
+    # Classements canoniques gardés en mémoire par analyze_many
+    BATCH_MEMO_SIZE = 4096
+    
+    # Écart top-1/top-2 (en écarts-types des 25 scores n-grammes) à partir
+    # duquel analyze_caesar_sampled conclut. Mesuré sur data/samples:
+    # au moins 3,6 pour 40 extraits anglais de 128 caractères ou plus, au
+    # plus 2,5 pour des lettres tirées au hasard
+    SAMPLE_CONFIDENCE_THRESHOLD = 3.0
+    
+    def __init__(self, data_dir: str = "data",
+                 telemetry: Optional[Callable[[Dict[str, Any]], None]] = None,
+                 cache: Optional['ResultCache'] = None,
+                 dictionary_backend: str = "auto", language: str = "en"):
         """
         Initialise l'analyseur intelligent.
         
         Args:
             data_dir: Répertoire contenant les fichiers de données
+            telemetry: Fonction appelée après chaque analyse avec les durées
+                par étape (ns) et les compteurs, pour une télémétrie externe
+            cache: ResultCache (analysis.cache) consulté par analyze_caesar
+            dictionary_backend: Stockage du dictionnaire ("auto", "set" ou
+                "packed", voir TextScorer)
+            language: Langue du texte clair attendu ("en", ou un
+                répertoire data/<langue>/, voir analysis.languages)
         """
-        self.scorer = TextScorer(data_dir)
+        self.data_dir = data_dir
+        self.telemetry = telemetry
+        self.cache = cache
+        self.scorer = TextScorer(data_dir, dictionary_backend=dictionary_backend, language=language)
         
         # Pondérations intelligentes pour le scoring combiné
         self.scoring_weights = {
@@ -31,71 +173,796 @@ class CombinedAnalyzer:
             'entropy': 0.10       # Détection de bruit/aléatoire
         }
     
-    def analyze_caesar(self, ciphertext: str, top_n: int = 5) -> Dict[str, Any]:
+    def analyze_caesar(self, ciphertext: str, top_n: int = 5,
+                       ranking: str = "histogram",
+                       crib: Optional[str] = None) -> Dict[str, Any]:
         """
         Analyse et déchiffre automatiquement un chiffrement César.
         
         Args:
             ciphertext: Texte chiffré à analyser
             top_n: Nombre de meilleures solutions à retourner
+            ranking: "histogram" (défaut) score les 25 clés par rotation des
+                histogrammes du texte chiffré, sans le déchiffrer 25 fois;
+                "brute_force" déchiffre puis score chaque hypothèse.
+                Les deux modes donnent des scores identiques.
+            crib: Fragment connu du texte clair (ex. FLAG_CRIB). S'il est
+                trouvé sous une clé, cette clé est retenue sans aucun scoring
+                (score fixé à 100) et 'crib_match' donne la clé et la position.
+            
+        Avec un cache (self.cache), un texte déjà analysé avec les mêmes
+        options, pondérations et fichiers de données est restitué sans
+        nouveau scoring ('cache_hit' dans les statistiques). En mode
+        "histogram" sans crib, le cache est indexé par la forme
+        canonique du texte (CaesarCipher.canonicalize): un même texte clair
+        chiffré sous une autre clé réutilise le classement déjà calculé,
+        dont les clés sont simplement décalées ('canonical_offset').
             
         Returns:
             Dictionnaire avec résultats complets d'analyse intelligente
         """
-        start_time = time.time()
+        if self.cache is None:
+            return self._analyze_caesar(ciphertext, top_n, ranking, crib)
+        if ranking == "histogram" and crib is None:
+            return self._analyze_canonical(ciphertext, top_n)
         
-        # Générer toutes les hypothèses de déchiffrement (25 possibilités)
-        hypotheses = CaesarCipher.brute_force(ciphertext)
+        start_time = time.perf_counter_ns()
+        key = self._cache_key(ciphertext, top_n, ranking, crib)
+        results = self._lookup_cache(ciphertext, key, ranking, start_time)
+        if results is not None:
+            return results
         
-        # Évaluer chaque hypothèse avec scoring intelligent
-        evaluated_hypotheses = []
-        for key, plaintext in hypotheses:
-            score = self.scorer.combined_score(plaintext, self.scoring_weights)
-            confidence = self._get_confidence_level(score)
-            
-            evaluated_hypotheses.append({
-                'key': key,
-                'plaintext': plaintext,
-                'score': round(score, 2),
-                'confidence': confidence,
-                'preview': plaintext[:120] + "..." if len(plaintext) > 120 else plaintext
-            })
+        results = self._analyze_caesar(ciphertext, top_n, ranking, crib)
+        results['statistics']['cache_hit'] = False
+        self.cache.put(key, self._cache_payload(results))
+        return results
+    
+    def detect_language(self, ciphertext: str,
+                        candidates: Optional[Iterable[str]] = None) -> List[Dict[str, Any]]:
+        """
+        Classe les langues candidates pour un texte chiffré, d'après la
+        meilleure clé de chacune. Le texte n'est parcouru qu'une fois: les
+        modèles de langue (chargés au premier usage) notent tous les mêmes
+        caractéristiques.
         
-        # Trier par score (décroissant) - décision intelligente
-        evaluated_hypotheses.sort(key=lambda x: x['score'], reverse=True)
+        Args:
+            ciphertext: Texte chiffré à analyser
+            candidates: Codes de langue (défaut: toutes les langues de data/)
+            
+        Returns:
+            Liste de {'language', 'key', 'score'}, meilleure langue en tête
+        """
+        return [{'language': language, 'key': key, 'score': score}
+                for language, key, score in self.scorer.rank_languages(
+                    ciphertext, candidates, self.scoring_weights)]
+    
+    def for_language(self, language: str) -> 'CombinedAnalyzer':
+        """
+        Analyseur de même configuration (cache, télémétrie, pondérations)
+        pour une autre langue; les tables de la langue sont partagées avec
+        self.scorer.for_language.
+        """
+        if language == self.scorer.language:
+            return self
+        analyzer = copy.copy(self)
+        analyzer.scorer = self.scorer.for_language(language)
+        analyzer.scoring_weights = dict(self.scoring_weights)
+        return analyzer
+    
+    def _analyze_caesar(self, ciphertext: str, top_n: int, ranking: str,
+                        crib: Optional[str]) -> Dict[str, Any]:
+        """Analyse effective (sans cache) de analyze_caesar."""
+        start_time = time.perf_counter_ns()
+        timings: Dict[str, int] = {}
         
-        # Meilleure solution identifiée
-        best_solution = evaluated_hypotheses[0] if evaluated_hypotheses else None
+        if ranking not in ("histogram", "brute_force"):
+            raise ValueError(f"Mode de classement inconnu: {ranking!r}")
         
-        # Analyse fréquentielle pour comparaison
-        freq_analysis = CaesarCipher.frequency_analysis(ciphertext)
+        crib_match = None
+        if crib is not None:
+            start = time.perf_counter_ns()
+            found = CaesarCipher.find_crib(ciphertext, crib)
+            _add_timing(timings, 'crib_search', start)
+            if found is not None:
+                key, offset = found
+                crib_match = {'crib': crib, 'key': key, 'offset': offset}
+                
+                # Clé prouvée par le crib: inutile de scorer les 25 hypothèses
+                results = self._assemble_results(ciphertext, [(key, 100.0)], top_n, ciphertext, timings)
+                results['crib_match'] = crib_match
+                results['statistics'].update({
+                    'evaluated_hypotheses': 0,
+                    'skipped_evaluations': 25
+                })
+                counters = {'characters': len(ciphertext), 'characters_scanned': offset + len(crib)}
+                return self._finish_results(results, ranking, start_time, timings, counters)
         
-        analysis_time = time.time() - start_time
+        start = time.perf_counter_ns()
+        if ranking == "histogram":
+            # Un seul passage sur le texte chiffré pour les 25 clés
+            features = TextFeatures.from_text(CaesarCipher.decrypt(ciphertext, 0))
+            _add_timing(timings, 'features', start)
+            ranked = self.scorer.rank_shifts(features, self.scoring_weights, timings=timings)
+            scanned = len(ciphertext)
+        else:
+            # Générer toutes les hypothèses de déchiffrement (25 possibilités)
+            hypotheses = CaesarCipher.brute_force(ciphertext)
+            _add_timing(timings, 'decrypt', start)
+            ranked = []
+            for key, plaintext in hypotheses:
+                start = time.perf_counter_ns()
+                features = self.scorer.features(plaintext)
+                _add_timing(timings, 'features', start)
+                scores = self.scorer._method_scores(features, timings)
+                ranked.append((key, round(self.scorer._weighted_score(scores, self.scoring_weights), 2)))
+            # Trier par score (décroissant) - décision intelligente
+            start = time.perf_counter_ns()
+            ranked.sort(key=lambda x: x[1], reverse=True)
+            _add_timing(timings, 'sorting', start)
+            scanned = len(ciphertext) * (len(hypotheses) + 1)
         
-        # Calculer des statistiques intelligentes
-        scores = [h['score'] for h in evaluated_hypotheses]
-        score_range = (min(scores), max(scores)) if scores else (0, 0)
+        results = self._assemble_results(ciphertext, ranked, top_n, ciphertext, timings)
+        if crib is not None:
+            results['crib_match'] = crib_match
+        counters = {
+            'characters': len(ciphertext),
+            'characters_scanned': scanned,
+            'letters': features.letter_total,
+            'words': features.word_total,
+            'distinct_words': len(features.word_counts),
+            'hypotheses_scored': len(ranked)
+        }
+        return self._finish_results(results, ranking, start_time, timings, counters)
+    
+    def _analyze_canonical(self, ciphertext: str, top_n: int,
+                           memo: Optional[Dict[str, Dict[str, Any]]] = None,
+                           data_signature: Optional[Tuple] = None) -> Dict[str, Any]:
+        """
+        Analyse "histogram" via le classement de la forme canonique, repris
+        de memo ou du cache s'il y figure, calculé et enregistré sinon.
+        """
+        start_time = time.perf_counter_ns()
+        timings: Dict[str, int] = {}
+        canonical, offset = CaesarCipher.canonicalize(ciphertext)
+        key = self._ranking_key(canonical, data_signature)
+        _add_timing(timings, 'canonicalize', start_time)
         
+        ranking, source = self._lookup_ranking(key, memo, timings)
+        if ranking is None:
+            ranking = self._canonical_ranking(canonical, timings)
+            self._store_ranking(key, ranking, memo)
+        return self._results_from_ranking(ciphertext, offset, ranking, top_n,
+                                          start_time, timings, source)
+    
+    def _canonical_ranking(self, canonical: str, timings: Dict[str, int]) -> Dict[str, Any]:
+        """
+        Classement des 26 clés (0 comprise) d'un texte canonique, valable
+        pour toutes ses rotations, et compteurs du texte.
+        """
+        start = time.perf_counter_ns()
+        features = TextFeatures.from_text(CaesarCipher.decrypt(canonical, 0))
+        _add_timing(timings, 'features', start)
+        ranked = self.scorer.rank_shifts(features, self.scoring_weights,
+                                         timings=timings, keys=range(26))
         return {
+            'ranked': ranked,
+            'letters': features.letter_total,
+            'words': features.word_total,
+            'distinct_words': len(features.word_counts)
+        }
+    
+    def _results_from_ranking(self, ciphertext: str, offset: int, ranking: Dict[str, Any],
+                              top_n: int, start_time: int, timings: Dict[str, int],
+                              source: str) -> Dict[str, Any]:
+        """
+        Résultats de analyze_caesar pour un texte dont decrypt(ciphertext,
+        offset) est la forme canonique classée dans ranking. source indique
+        l'origine du classement: "computed" (calculé pour ce texte), "memo"
+        (mémoire du lot de analyze_many, 'memo_hit') ou "cache" (ResultCache,
+        'cache_hit').
+        """
+        # La clé j du texte canonique est la clé (j + offset) du texte chiffré;
+        # la clé 0 (texte inchangé) n'est pas une hypothèse. Même ordre que
+        # rank_shifts: score décroissant, puis clé croissante.
+        ranked = [((key + offset) % 26, score) for key, score in ranking['ranked']]
+        ranked = sorted((item for item in ranked if item[0]), key=lambda item: (-item[1], item[0]))
+        
+        results = self._assemble_results(ciphertext, ranked, top_n, ciphertext, timings)
+        results['statistics'].update({
+            'cache_hit': source == "cache",
+            'memo_hit': source == "memo",
+            'canonical_offset': offset
+        })
+        reused = source != "computed"
+        counters = {
+            'characters': len(ciphertext),
+            'characters_scanned': len(ciphertext) * (1 if reused else 2),
+            'letters': ranking['letters'],
+            'words': ranking['words'],
+            'distinct_words': ranking['distinct_words'],
+            'hypotheses_scored': 0 if reused else len(ranking['ranked'])
+        }
+        return self._finish_results(results, "histogram", start_time, timings, counters)
+    
+    def _ranking_key(self, canonical: str, data_signature: Optional[Tuple] = None) -> str:
+        """
+        Clé de cache d'un classement canonique (indépendante de top_n).
+        data_signature: self.scorer.data_signature(), calculée une seule
+        fois par lot par analyze_many.
+        """
+        from analysis.cache import cache_key
+        
+        if data_signature is None:
+            data_signature = self.scorer.data_signature()
+        return cache_key(canonical, 'canonical_ranking',
+                         tuple(sorted(self.scoring_weights.items())), data_signature)
+    
+    def _lookup_ranking(self, key: str, memo: Optional[Dict[str, Dict[str, Any]]],
+                        timings: Dict[str, int]) -> Tuple[Optional[Dict[str, Any]], str]:
+        """
+        Classement canonique connu (memo puis cache) et son origine ("memo"
+        ou "cache"), ou (None, "computed") s'il reste à calculer.
+        """
+        if memo is not None and key in memo:
+            return memo[key], "memo"
+        if self.cache is None:
+            return None, "computed"
+        start = time.perf_counter_ns()
+        ranking = self.cache.get(key)
+        _add_timing(timings, 'cache_lookup', start)
+        if ranking is None:
+            return None, "computed"
+        if memo is not None:
+            self._remember(memo, key, ranking)
+        return ranking, "cache"
+    
+    def _store_ranking(self, key: str, ranking: Dict[str, Any],
+                       memo: Optional[Dict[str, Dict[str, Any]]]) -> None:
+        """Enregistre un classement canonique dans memo et dans le cache."""
+        if memo is not None:
+            self._remember(memo, key, ranking)
+        if self.cache is not None:
+            self.cache.put(key, ranking)
+    
+    def _remember(self, memo: Dict[str, Dict[str, Any]], key: str, ranking: Dict[str, Any]) -> None:
+        """Ajoute à memo en oubliant le plus ancien au-delà de BATCH_MEMO_SIZE."""
+        if len(memo) >= self.BATCH_MEMO_SIZE:
+            del memo[next(iter(memo))]
+        memo[key] = ranking
+    
+    def _cache_key(self, ciphertext: str, top_n: int, ranking: str,
+                   crib: Optional[str]) -> str:
+        """Clé de cache: texte, options, pondérations et versions des données."""
+        from analysis.cache import cache_key
+        
+        return cache_key(ciphertext, 'analyze_caesar', top_n, ranking, crib,
+                         tuple(sorted(self.scoring_weights.items())),
+                         self.scorer.data_signature())
+    
+    def _lookup_cache(self, ciphertext: str, key: str, ranking: str,
+                      start_time: int) -> Optional[Dict[str, Any]]:
+        """Résultats en cache pour une clé (statistiques du calcul d'origine), ou None."""
+        payload = self.cache.get(key)
+        if payload is None:
+            return None
+        results = self._results_from_cache(ciphertext, payload)
+        results['statistics']['cache_hit'] = True
+        return self._finish_results(results, ranking, start_time,
+                                    {'cache_lookup': time.perf_counter_ns() - start_time},
+                                    results['statistics']['counters'])
+    
+    def _cache_payload(self, results: Dict[str, Any]) -> Dict[str, Any]:
+        """Résultats réduits à des valeurs simples (sans textes déchiffrés)."""
+        def hypothesis(solution):
+            return (solution['key'], solution['score'], solution['confidence'])
+        
+        payload = {name: value for name, value in results.items()
+                   if name not in ('best_solution', 'top_solutions')}
+        payload['best_solution'] = hypothesis(results['best_solution']) if results['best_solution'] else None
+        payload['top_solutions'] = [hypothesis(solution) for solution in results['top_solutions']]
+        payload['statistics'] = dict(results['statistics'])
+        payload['statistics'].pop('cache_hit', None)
+        return payload
+    
+    def _results_from_cache(self, ciphertext: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Reconstruit les résultats (hypothèses paresseuses) depuis le cache."""
+        top_solutions = [CaesarHypothesis(ciphertext, *solution) for solution in payload['top_solutions']]
+        best = payload['best_solution']
+        if best is None:
+            best_solution = None
+        elif top_solutions and tuple(best) == tuple(payload['top_solutions'][0]):
+            best_solution = top_solutions[0]
+        else:
+            best_solution = CaesarHypothesis(ciphertext, *best)
+        
+        results = {'best_solution': best_solution, 'top_solutions': top_solutions}
+        results.update((name, value) for name, value in payload.items()
+                       if name not in ('best_solution', 'top_solutions'))
+        return results
+    
+    def _finish_results(self, results: Dict[str, Any], ranking: str, start_time: int,
+                        timings: Dict[str, int], counters: Dict[str, int]) -> Dict[str, Any]:
+        """
+        Ajoute mode de classement, temps par étape et compteurs aux
+        statistiques, puis les transmet au crochet de télémétrie éventuel.
+        """
+        total_ns = time.perf_counter_ns() - start_time
+        results['statistics'].update({
+            'ranking': ranking,
+            'analysis_time_seconds': round(total_ns / 1e9, 3),
+            'analysis_time_ns': total_ns,
+            'stage_timings_ns': timings,
+            'counters': counters
+        })
+        self._emit_telemetry(results)
+        return results
+    
+    def _emit_telemetry(self, results: Dict[str, Any]) -> None:
+        """
+        Appelle self.telemetry avec les mesures d'une analyse (aussi pour
+        les résultats venus d'un processus de travail de analyze_many).
+        """
+        if self.telemetry is None:
+            return
+        stats = results['statistics']
+        self.telemetry({
+            'ranking': stats['ranking'],
+            'total_ns': stats['analysis_time_ns'],
+            'stage_timings_ns': dict(stats['stage_timings_ns']),
+            'counters': dict(stats['counters']),
+            'crib_hit': bool(results.get('crib_match'))
+        })
+    
+    def analyze_caesar_sampled(self, ciphertext: str, top_n: int = 5,
+                               sample_size: int = 4096,
+                               confidence_threshold: float = SAMPLE_CONFIDENCE_THRESHOLD,
+                               growth_factor: int = 4, strategy: str = "prefix",
+                               windows: int = 8) -> Dict[str, Any]:
+        """
+        Analyse un texte chiffré long à partir d'un échantillon borné.
+        
+        Les clés sont classées sur un échantillon (préfixe ou fenêtres
+        régulièrement espacées) par le score n-grammes de chaque clé
+        (TextScorer.rank_ngram_shifts, classement "ngrams"), qui reconnaît
+        la bonne clé dès quelques dizaines de lettres. Si l'écart top-1/top-2,
+        rapporté à l'écart-type des 25 scores, reste sous le seuil,
+        l'échantillon grandit géométriquement jusqu'à couvrir tout le texte.
+        Les solutions rapportées déchiffrent le texte complet.
+        
+        Args:
+            ciphertext: Texte chiffré à analyser
+            top_n: Nombre de meilleures solutions à retourner
+            sample_size: Taille initiale de l'échantillon (caractères)
+            confidence_threshold: Écart normalisé suffisant pour conclure
+                (voir SAMPLE_CONFIDENCE_THRESHOLD)
+            growth_factor: Facteur d'agrandissement de l'échantillon
+            strategy: "prefix" (début du texte) ou "windows" (fenêtres réparties)
+            windows: Nombre de fenêtres pour la stratégie "windows"
+            
+        Returns:
+            Résultats au format de analyze_caesar; les statistiques indiquent
+            les caractères du texte chiffré réellement examinés, le nombre de
+            tours et l'écart normalisé du dernier tour ('sample_confidence')
+            
+        Raises:
+            ValueError: Si la stratégie ou les paramètres sont invalides
+        """
+        if strategy not in ("prefix", "windows"):
+            raise ValueError(f"Stratégie d'échantillonnage inconnue: {strategy!r}")
+        if sample_size <= 0 or growth_factor < 2 or windows <= 0:
+            raise ValueError("sample_size et windows doivent être positifs, growth_factor >= 2")
+        
+        start_time = time.perf_counter_ns()
+        timings: Dict[str, int] = {}
+        
+        size = sample_size
+        examined = 0
+        rounds = 0
+        while True:
+            start = time.perf_counter_ns()
+            parts = self._sample_parts(ciphertext, size, strategy, windows)
+            # Fenêtres jointes par un saut de ligne, non compté parmi les caractères examinés
+            sample = "\n".join(parts)
+            taken = sum(map(len, parts))
+            _add_timing(timings, 'sampling', start)
+            ranked = self.scorer.rank_ngram_shifts(sample, timings=timings)
+            examined += taken
+            rounds += 1
+            
+            confidence = self._normalized_gap(ranked)
+            if confidence >= confidence_threshold or size >= len(ciphertext):
+                break
+            size *= growth_factor
+        
+        results = self._assemble_results(ciphertext, ranked, top_n, sample, timings)
+        results['statistics'].update({
+            'characters_examined': examined,
+            'sample_size': taken,
+            'sample_rounds': rounds,
+            'sample_confidence': round(confidence, 2),
+            'sampling_strategy': strategy
+        })
+        counters = {
+            'characters': len(ciphertext),
+            'characters_scanned': examined,
+            'sample_rounds': rounds,
+            'hypotheses_scored': len(ranked) * rounds
+        }
+        return self._finish_results(results, "ngrams", start_time, timings, counters)
+    
+    def _normalized_gap(self, ranked: List[Tuple[int, float]]) -> float:
+        """Écart top-1/top-2 d'un classement, en écarts-types des scores (0 sans dispersion)."""
+        scores = [score for _, score in ranked]
+        std_dev = self._calculate_std_dev(scores)
+        if len(scores) < 2 or not std_dev:
+            return 0.0
+        return (scores[0] - scores[1]) / std_dev
+    
+    def analyze_many(self, ciphertexts: Iterable[str], workers: Optional[int] = None,
+                     ordered: bool = False, top_n: int = 5,
+                     max_pending: Optional[int] = None,
+                     crib: Optional[str] = None) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """
+        Analyse un grand nombre de textes chiffrés sur plusieurs processus.
+        
+        Chaque processus de travail construit son analyseur une seule fois
+        (initialiseur du pool); les textes sont lus au fil de l'eau et le
+        nombre de tâches en vol est borné, si bien qu'un itérable de dizaines
+        de milliers de textes n'est jamais chargé entièrement en mémoire.
+        Un grand dictionnaire est publié une fois en fichier compacté
+        projeté en mémoire (TextScorer.publish_dictionary): la mémoire d'un
+        processus de travail ne croît pas avec la taille des listes de mots.
+        
+        Args:
+            ciphertexts: Itérable de textes chiffrés
+            workers: Nombre de processus (défaut: nombre de cœurs);
+                1 analyse dans le processus courant, sans pool
+            ordered: Rend les résultats dans l'ordre d'entrée plutôt que
+                dans l'ordre d'achèvement
+            top_n: Nombre de meilleures solutions par texte
+            max_pending: Nombre maximal de tâches en vol (défaut: 4 par processus)
+            crib: Fragment connu du texte clair (voir analyze_caesar)
+        
+        Yields:
+            Couples (index dans l'itérable, résultats de analyze_caesar);
+            'memo_hit' signale un classement repris d'une rotation déjà
+            classée dans le lot, 'cache_hit' un classement lu dans self.cache
+        """
+        # Import différé: concurrent.futures/multiprocessing pèsent au démarrage
+        from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+        
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if workers < 1:
+            raise ValueError("workers doit être positif")
+        
+        # Sans crib, les rotations d'un même texte (forme canonique
+        # identique) ne sont classées qu'une fois
+        canonical_mode = crib is None
+        memo: Dict[str, Dict[str, Any]] = {}
+        # Versions des fichiers de données, lues une fois pour tout le lot
+        data_signature = self.scorer.data_signature() if canonical_mode else None
+        
+        if workers == 1:
+            for index, ciphertext in enumerate(ciphertexts):
+                if canonical_mode:
+                    yield index, self._analyze_canonical(ciphertext, top_n, memo, data_signature)
+                else:
+                    yield index, self.analyze_caesar(ciphertext, top_n=top_n, crib=crib)
+            return
+        
+        if max_pending is None:
+            max_pending = 4 * workers
+        if max_pending < 1:
+            raise ValueError("max_pending doit être positif")
+        tasks = enumerate(ciphertexts)
+        pending = set()
+        completed = {}     # résultats en attente de leur tour (mode ordonné)
+        cache_keys = {}    # index -> clé de cache des tâches soumises
+        ranking_keys = {}  # index -> clé du classement canonique des tâches soumises
+        waiting = {}       # clé de classement en cours -> rotations en attente
+        held = 0           # nombre de textes en attente dans waiting
+        next_index = 0
+        exhausted = False
+        
+        # Le dictionnaire est publié une fois, en fichier compacté que les
+        # processus de travail projettent en mémoire sans le recopier
+        dictionary_backend = self.scorer.publish_dictionary()
+        
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(self.data_dir, self.scoring_weights,
+                                           dictionary_backend, self.scorer.language)) as pool:
+            while True:
+                # Remplir la fenêtre (les résultats mis de côté en font partie)
+                while not exhausted and len(pending) + len(completed) + held < max_pending:
+                    task = next(tasks, None)
+                    if task is None:
+                        exhausted = True
+                        continue
+                    
+                    # Le cache est consulté ici: les textes connus ne partent pas au pool
+                    index, ciphertext = task
+                    if canonical_mode:
+                        start_time = time.perf_counter_ns()
+                        timings: Dict[str, int] = {}
+                        canonical, offset = CaesarCipher.canonicalize(ciphertext)
+                        key = self._ranking_key(canonical, data_signature)
+                        _add_timing(timings, 'canonicalize', start_time)
+                        if key in waiting:
+                            # Une rotation de ce texte est déjà en cours d'analyse
+                            waiting[key].append((index, ciphertext, offset, timings))
+                            held += 1
+                            continue
+                        ranking, source = self._lookup_ranking(key, memo, timings)
+                        if ranking is not None:
+                            results = self._results_from_ranking(ciphertext, offset, ranking, top_n,
+                                                                 start_time, timings, source)
+                            if ordered:
+                                completed[index] = results
+                            else:
+                                yield index, results
+                            continue
+                        waiting[key] = []
+                        ranking_keys[index] = key
+                        pending.add(pool.submit(_rank_in_worker, index, ciphertext, top_n))
+                        continue
+                    
+                    if self.cache is not None:
+                        start_time = time.perf_counter_ns()
+                        key = self._cache_key(ciphertext, top_n, "histogram", crib)
+                        results = self._lookup_cache(ciphertext, key, "histogram", start_time)
+                        if results is not None:
+                            if ordered:
+                                completed[index] = results
+                            else:
+                                yield index, results
+                            continue
+                        cache_keys[index] = key
+                    pending.add(pool.submit(_analyze_in_worker, index, ciphertext, top_n, crib))
+                
+                while next_index in completed:
+                    yield next_index, completed.pop(next_index)
+                    next_index += 1
+                
+                if not pending:
+                    if exhausted:
+                        break
+                    continue
+                
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index, results, *ranking = future.result()
+                    self._emit_telemetry(results)
+                    finished = [(index, results)]
+                    if index in ranking_keys:
+                        key = ranking_keys.pop(index)
+                        self._store_ranking(key, ranking[0], memo)
+                        for other, ciphertext, offset, timings in waiting.pop(key):
+                            held -= 1
+                            # Temps propre à la rotation: forme canonique, puis assemblage
+                            start_time = time.perf_counter_ns() - sum(timings.values())
+                            finished.append((other, self._results_from_ranking(
+                                ciphertext, offset, ranking[0], top_n,
+                                start_time, timings, "memo")))
+                    elif index in cache_keys:
+                        results['statistics']['cache_hit'] = False
+                        self.cache.put(cache_keys.pop(index), self._cache_payload(results))
+                    
+                    for index, results in finished:
+                        if not ordered:
+                            yield index, results
+                        else:
+                            completed[index] = results
+                
+                while next_index in completed:
+                    yield next_index, completed.pop(next_index)
+                    next_index += 1
+    
+    def analyze_file(self, path: str, top_n: int = 5, workers: Optional[int] = None,
+                     range_size: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Analyse un fichier volumineux sans le charger en mémoire.
+        
+        Le fichier est projeté en mémoire (mmap) et découpé en plages
+        d'octets alignées sur des séparateurs; les effectifs de lettres,
+        bigrammes et mots de chaque plage sont comptés en parallèle puis
+        fusionnés (analysis.mapped_file). Les 25 clés sont classées à partir
+        des effectifs fusionnés, avec les mêmes scores qu'analyze_caesar sur
+        le texte entier. Les hypothèses n'ont pas de 'plaintext': le texte
+        de la clé retenue se déchiffre en flux (CaesarCipher.decrypt_stream).
+        
+        Args:
+            path: Chemin du fichier (UTF-8; octets invalides traités comme
+                des séparateurs)
+            top_n: Nombre de meilleures solutions à retourner
+            workers: Nombre de processus (défaut: nombre de cœurs)
+            range_size: Taille des plages en octets (défaut: selon la taille
+                du fichier et le nombre de processus)
+        
+        Returns:
+            Résultats au format de analyze_caesar ('file_size' et 'ranges'
+            dans les métadonnées), sauf les hypothèses: dictionnaires simples
+            avec seulement 'key', 'score', 'confidence' et 'preview' (aperçu
+            du début du fichier)
+        """
+        from analysis import mapped_file
+        
+        start_time = time.perf_counter_ns()
+        timings: Dict[str, int] = {}
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if workers < 1:
+            raise ValueError("workers doit être positif")
+        
+        start = time.perf_counter_ns()
+        file_size, ranges = mapped_file.file_ranges(path, workers, range_size)
+        _add_timing(timings, 'ranges', start)
+        
+        # Comptage parallèle; la fusion se fait au fil des plages, dans l'ordre du fichier
+        start = time.perf_counter_ns()
+        features = TextFeatures.empty()
+        for part in mapped_file.iter_range_features(path, ranges, workers):
+            features.update(part)
+        _add_timing(timings, 'features', start)
+        
+        ranked = self.scorer.rank_shifts(features, self.scoring_weights, timings=timings)
+        
+        start = time.perf_counter_ns()
+        with open(path, 'r', encoding='utf-8', errors='surrogateescape', newline='') as f:
+            head = f.read(CaesarHypothesis.PREVIEW_LENGTH + 1)
+        
+        def hypothesis(key: int, score: float) -> Dict[str, Any]:
+            preview = CaesarCipher.decrypt(head[:CaesarHypothesis.PREVIEW_LENGTH], key)
+            if len(head) > CaesarHypothesis.PREVIEW_LENGTH:
+                preview += "..."
+            return {'key': key, 'score': score, 'confidence': self._get_confidence_level(score),
+                    'preview': preview}
+        
+        top_solutions = [hypothesis(key, score) for key, score in ranked[:top_n]]
+        results = {
+            'best_solution': top_solutions[0] if top_solutions else None,
+            'top_solutions': top_solutions,
+            'frequency_analysis': CaesarCipher.frequency_analysis_from_counts(
+                features.letter_counts, self.scorer.letter_frequencies),
+            'statistics': self._score_statistics(ranked),
+            'metadata': {
+                'file': str(path),
+                'file_size': file_size,
+                'ranges': len(ranges),
+                'workers': workers,
+                'alphabetic_chars': features.letter_total,
+                'analysis_date': time.strftime("%Y-%m-%d %H:%M:%S"),
+                'language': self.scorer.language,
+                'scoring_methods': list(self.scoring_weights.keys()),
+                'weights_used': self.scoring_weights
+            }
+        }
+        _add_timing(timings, 'assembly', start)
+        
+        counters = {
+            'bytes': file_size,
+            'ranges': len(ranges),
+            'letters': features.letter_total,
+            'words': features.word_total,
+            'distinct_words': len(features.word_counts),
+            'hypotheses_scored': len(ranked)
+        }
+        return self._finish_results(results, "histogram", start_time, timings, counters)
+    
+    def _sample_parts(self, text: str, size: int, strategy: str, windows: int) -> List[str]:
+        """
+        Extrait un échantillon d'environ `size` caractères, coupé aux
+        frontières de mots pour ne pas fausser les scores par mots.
+        
+        Args:
+            text: Texte complet
+            size: Taille visée de l'échantillon
+            strategy: "prefix" ou "windows"
+            windows: Nombre de fenêtres pour "windows"
+            
+        Returns:
+            Morceaux du texte retenus, dans l'ordre (le texte entier s'il
+            est assez court)
+        """
+        if size >= len(text):
+            return [text]
+        if strategy == "prefix" or windows == 1:
+            return [text[:self._word_end(text, size)]]
+        
+        # Fenêtres régulièrement espacées
+        width = max(size // windows, 1)
+        step = (len(text) - width) / (windows - 1)
+        parts = []
+        for index in range(windows):
+            start = int(index * step)
+            if start and text[start - 1].isalpha():
+                # Ne pas commencer au milieu d'un mot
+                start = self._word_end(text, start)
+            parts.append(text[start:self._word_end(text, start + width)])
+        return parts
+    
+    def _word_end(self, text: str, position: int) -> int:
+        """Avance position jusqu'à la fin du mot en cours (au plus 64 caractères)."""
+        limit = min(position + 64, len(text))
+        while position < limit and text[position].isalpha():
+            position += 1
+        return position
+    
+    def _assemble_results(self, ciphertext: str, ranked: List[Tuple[int, float]],
+                          top_n: int, analyzed_text: str,
+                          timings: Optional[Dict[str, int]] = None) -> Dict[str, Any]:
+        """
+        Construit le dictionnaire de résultats à partir du classement des clés.
+        
+        Args:
+            ciphertext: Texte chiffré complet (déchiffré paresseusement)
+            ranked: Liste (clé, score arrondi) triée, meilleure en tête
+            top_n: Nombre de meilleures solutions à retourner
+            analyzed_text: Texte soumis à l'analyse fréquentielle
+            timings: Durées par étape (ns) complétées par 'frequency_analysis'
+                et 'assembly'
+            
+        Returns:
+            Résultats au format de analyze_caesar
+        """
+        start = time.perf_counter_ns()
+        
+        # Hypothèses paresseuses: texte clair déchiffré seulement à la lecture
+        evaluated_hypotheses = [
+            CaesarHypothesis(ciphertext, key, score, self._get_confidence_level(score))
+            for key, score in ranked[:top_n]
+        ]
+        
+        # Meilleure solution identifiée
+        if evaluated_hypotheses:
+            best_solution = evaluated_hypotheses[0]
+        elif ranked:
+            key, score = ranked[0]
+            best_solution = CaesarHypothesis(ciphertext, key, score, self._get_confidence_level(score))
+        else:
+            best_solution = None
+        
+        # Analyse fréquentielle pour comparaison
+        frequency_start = time.perf_counter_ns()
+        freq_analysis = CaesarCipher.frequency_analysis(analyzed_text, self.scorer.letter_frequencies)
+        frequency_ns = time.perf_counter_ns() - frequency_start
+        
+        results = {
             'best_solution': best_solution,
-            'top_solutions': evaluated_hypotheses[:top_n],
+            'top_solutions': evaluated_hypotheses,
             'frequency_analysis': freq_analysis,
-            'statistics': {
-                'analysis_time_seconds': round(analysis_time, 3),
-                'total_hypotheses': len(hypotheses),
-                'score_range': score_range,
-                'mean_score': sum(scores)/len(scores) if scores else 0,
-                'std_deviation': self._calculate_std_dev(scores) if len(scores) > 1 else 0,
-                'confidence_gap': scores[0] - scores[1] if len(scores) > 1 else 0
-            },
+            'statistics': self._score_statistics(ranked),
             'metadata': {
                 'ciphertext_length': len(ciphertext),
-                'alphabetic_chars': sum(1 for c in ciphertext if c.isalpha()),
+                'alphabetic_chars': count_letters(ciphertext),
                 'analysis_date': time.strftime("%Y-%m-%d %H:%M:%S"),
+                'language': self.scorer.language,
                 'scoring_methods': list(self.scoring_weights.keys()),
                 'weights_used': self.scoring_weights
             }
         }
+        
+        if timings is not None:
+            timings['frequency_analysis'] = timings.get('frequency_analysis', 0) + frequency_ns
+            _add_timing(timings, 'assembly', start + frequency_ns)
+        return results
+    
+    def _score_statistics(self, ranked: List[Tuple[int, float]]) -> Dict[str, Any]:
+        """Statistiques des scores d'un classement (meilleure clé en tête)."""
+        # Calculer des statistiques intelligentes
+        scores = [score for _, score in ranked]
+        score_range = (min(scores), max(scores)) if scores else (0, 0)
+        
+        return {
+            'analysis_time_seconds': 0.0,
+            'total_hypotheses': 25,
+            'evaluated_hypotheses': len(ranked),
+            'skipped_evaluations': 0,
+            'score_range': score_range,
+            'mean_score': sum(scores)/len(scores) if scores else 0,
+            'std_deviation': self._calculate_std_dev(scores) if len(scores) > 1 else 0,
+            'confidence_gap': scores[0] - scores[1] if len(scores) > 1 else 0
+        }
     
     def analyze_text_complexity(self, text: str) -> Dict[str, Any]:
         """
@@ -285,6 +1152,8 @@ class CombinedAnalyzer:
             results: Résultats d'analyse
             filename: Chemin du fichier de sortie
         """
+        import json
+        
         with open(filename, 'w', encoding='utf-8') as f:
             json.dump(results, f, indent=2, ensure_ascii=False)
     
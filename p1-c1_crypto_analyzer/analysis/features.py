@@ -0,0 +1,230 @@
+# analysis/features.py - Single-pass text features shared by every scorer
+import operator
+import string
+from collections import Counter
+from typing import Dict, List, NamedTuple, Optional, Union
+
+from crypto.caesar import CaesarCipher
+
+
+# Lowercase ASCII letters kept, every other ASCII character becomes a word separator
+_WORD_TABLE = {
+    code: chr(code).lower() if chr(code) in string.ascii_letters else ' '
+    for code in range(128)
+}
+
+# ASCII bytes, deleted to isolate the non-ASCII characters of a UTF-8 text
+_ASCII_BYTES = bytes(range(128))
+
+
+class Boundary(NamedTuple):
+    """Edges of the text a TextFeatures was computed from, for merging."""
+    head: str           # leading letter run (lowercased), '' if none
+    tail: str           # trailing letter run (lowercased), '' if none
+    first_letter: str
+    last_letter: str
+    unbroken: bool      # no separator at all: head == tail == every letter
+
+
+class TextFeatures:
+    """
+    Letter, bigram and word counts of a text, gathered in a single pass.
+
+    Every TextScorer.score_* method accepts a TextFeatures instead of a
+    string, so scoring one text with several methods scans it only once.
+    Counts follow the historical scorer rules: letters are str.isalpha()
+    characters lowercased, words are runs of letters, bigrams span the
+    whole letter sequence (across word boundaries).
+
+    The counts are mergeable: features of consecutive chunks, computed
+    separately (in other processes, on other machines), combine with
+    merge() or update() into exactly the counts of the whole text, words
+    and bigrams cut at chunk boundaries included.
+    """
+
+    __slots__ = ('letter_counts', 'letter_total', 'bigram_counts', 'bigram_total',
+                 'word_counts', 'word_total', 'boundary')
+
+    def __init__(self, letter_counts: Counter, letter_total: int,
+                 bigram_counts: Counter, bigram_total: int,
+                 word_counts: Counter, word_total: int,
+                 boundary: Optional[Boundary] = None):
+        self.letter_counts = letter_counts    # first-appearance order
+        self.letter_total = letter_total
+        self.bigram_counts = bigram_counts
+        self.bigram_total = bigram_total
+        self.word_counts = word_counts
+        self.word_total = word_total
+        self.boundary = boundary              # None: cannot be merged
+
+    @classmethod
+    def empty(cls) -> 'TextFeatures':
+        """Features of the empty text, to be filled with update()."""
+        return cls(Counter(), 0, Counter(), 0, Counter(), 0, Boundary('', '', '', '', True))
+
+    @classmethod
+    def from_text(cls, text: str) -> 'TextFeatures':
+        """Compute the features of a text."""
+        table = _WORD_TABLE if text.isascii() else cls._word_table_for(text)
+        if table is None:
+            return cls._from_text_by_char(text)
+
+        separated = text.translate(table)
+        words = separated.split()
+        letters = ''.join(words)
+        return cls(
+            Counter(letters), len(letters),
+            Counter(map(operator.add, letters, letters[1:])), max(len(letters) - 1, 0),
+            Counter(words), len(words),
+            Boundary(
+                words[0] if separated[:1] not in ('', ' ') else '',
+                words[-1] if separated[-1:] not in ('', ' ') else '',
+                letters[:1], letters[-1:],
+                len(letters) == len(separated)
+            )
+        )
+
+    @staticmethod
+    def _word_table_for(text: str) -> Optional[Dict[int, str]]:
+        """
+        Translation table for a non-ASCII text, or None when a letter
+        lowercases to several characters (e.g. 'İ') and must be handled
+        character by character.
+        """
+        extras = text.encode('utf-8', 'surrogatepass').translate(None, _ASCII_BYTES)
+        table = dict(_WORD_TABLE)
+        for char in set(extras.decode('utf-8', 'surrogatepass')):
+            if not char.isalpha():
+                table[ord(char)] = ' '
+            elif len(char.lower()) == 1:
+                table[ord(char)] = char.lower()
+            else:
+                return None
+        return table
+
+    @classmethod
+    def _from_text_by_char(cls, text: str) -> 'TextFeatures':
+        """Reference character-by-character extraction."""
+        letters = []
+        words = []
+        current_word = []
+        unbroken = True
+        for char in text:
+            if char.isalpha():
+                lowered = char.lower()
+                letters.append(lowered)
+                current_word.append(lowered)
+            else:
+                unbroken = False
+                if current_word:
+                    words.append(''.join(current_word))
+                    current_word = []
+        if current_word:
+            words.append(''.join(current_word))
+
+        cleaned = ''.join(letters)
+        return cls(
+            Counter(letters), len(letters),
+            Counter(map(operator.add, cleaned, cleaned[1:])), max(len(cleaned) - 1, 0),
+            Counter(words), len(words),
+            Boundary(
+                words[0] if text[:1].isalpha() else '',
+                words[-1] if text[-1:].isalpha() else '',
+                cleaned[:1], cleaned[-1:], unbroken
+            )
+        )
+
+    def update(self, chunk: Union[str, 'TextFeatures']) -> None:
+        """
+        Add the counts of the text that directly follows this one, given
+        as a str or as its TextFeatures.
+        """
+        self._absorb(chunk if isinstance(chunk, TextFeatures) else TextFeatures.from_text(chunk))
+
+    def merge(self, other: 'TextFeatures') -> 'TextFeatures':
+        """
+        Features of this text followed by the text of other, leaving both
+        unchanged: functools.reduce(TextFeatures.merge, parts) combines the
+        features of consecutive chunks.
+
+        Raises:
+            ValueError: If either side has no boundary (e.g. shifted() features)
+        """
+        merged = TextFeatures(
+            Counter(self.letter_counts), self.letter_total,
+            Counter(self.bigram_counts), self.bigram_total,
+            Counter(self.word_counts), self.word_total,
+            self.boundary
+        )
+        merged._absorb(other)
+        return merged
+
+    def _absorb(self, other: 'TextFeatures') -> None:
+        """In-place merge of the features of the text following this one."""
+        if self.boundary is None or other.boundary is None:
+            raise ValueError("Only features computed from text can be merged")
+        head, tail, first_letter, last_letter, unbroken = self.boundary
+        other_head, other_tail, other_first, other_last, other_unbroken = other.boundary
+
+        self.letter_counts.update(other.letter_counts)
+        self.letter_total += other.letter_total
+
+        # Bigram across the boundary, counted before other's to keep first-appearance order
+        if last_letter and other_first:
+            self.bigram_counts[last_letter + other_first] += 1
+            self.bigram_total += 1
+        self.bigram_counts.update(other.bigram_counts)
+        self.bigram_total += other.bigram_total
+
+        self.word_counts.update(other.word_counts)
+        self.word_total += other.word_total
+        if tail and other_head:
+            # A word cut by the boundary was counted as two words
+            self._discount(self.word_counts, tail)
+            self._discount(self.word_counts, other_head)
+            self.word_counts[tail + other_head] += 1
+            self.word_total -= 1
+
+        self.boundary = Boundary(
+            head + other_head if unbroken else head,
+            tail + other_tail if other_unbroken else other_tail,
+            first_letter or other_first,
+            other_last or last_letter,
+            unbroken and other_unbroken
+        )
+
+    @staticmethod
+    def _discount(counts: Counter, key: str) -> None:
+        """Remove one occurrence of key, dropping it at zero."""
+        if counts[key] == 1:
+            del counts[key]
+        else:
+            counts[key] -= 1
+
+    def shifted(self, key: int, letters: bool = True, words: bool = True) -> 'TextFeatures':
+        """
+        Features of CaesarCipher.decrypt(text, key), derived from the counts
+        alone. Exact when every letter of the text is ASCII, e.g. for
+        features of CaesarCipher.decrypt(ciphertext, 0).
+
+        letters=False or words=False skips the letter/bigram or word counts
+        (left empty, totals kept) when only some scores are needed.
+        """
+        letter_counts = Counter()
+        bigram_counts = Counter()
+        word_counts = Counter()
+        if letters:
+            shifted_letters = CaesarCipher.decrypt(''.join(self.letter_counts), key)
+            letter_counts = Counter(dict(zip(shifted_letters, self.letter_counts.values())))
+            bigrams = self._decrypt_keys(self.bigram_counts, key)
+            bigram_counts = Counter(dict(zip(bigrams, self.bigram_counts.values())))
+        if words:
+            shifted_words = self._decrypt_keys(self.word_counts, key)
+            word_counts = Counter(dict(zip(shifted_words, self.word_counts.values())))
+        return TextFeatures(letter_counts, self.letter_total, bigram_counts, self.bigram_total,
+                            word_counts, self.word_total)
+
+    @staticmethod
+    def _decrypt_keys(counts: Counter, key: int) -> List[str]:
+        """Decrypt every key of a counter with a single translate call."""
+        return CaesarCipher.decrypt(' '.join(counts), key).split()
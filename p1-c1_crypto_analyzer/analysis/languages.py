@@ -0,0 +1,99 @@
+# analysis/languages.py - Where each language's scoring data lives
+"""
+Per-language scoring data: letter frequencies, common bigrams, stopwords,
+dictionary and n-gram tables.
+
+English keeps its files at the root of the data directory; every other
+language has a data/<lang>/ directory holding the same files with its own
+code as suffix:
+
+    letters_<lang>.txt      "letter percentage" per line, all 26 letters (required)
+    bigrams_<lang>.txt      common bigrams, one per line
+    profile_<lang>.txt      "name value" score targets (TextScorer.ENGLISH_PROFILE)
+    stopwords_<lang>.txt    one word per line
+    words_<lang>.txt        dictionary, one word per line
+    ngrams_<lang>_<n>.npy   n-gram tables (python -m analysis.ngrams data <lang>)
+
+English letter frequencies, bigrams and score targets are built into
+TextScorer; a letters_en.txt, bigrams_en.txt or profile_en.txt at the data
+root overrides them, and a language without profile uses the English
+targets. Lines starting with '#' are comments.
+"""
+from pathlib import Path
+from string import ascii_lowercase
+from typing import Dict, Iterable, List, Set
+
+DEFAULT_LANGUAGE = "en"
+
+
+def language_dir(data_dir, language: str) -> Path:
+    """Directory holding the files of a language."""
+    data_dir = Path(data_dir)
+    return data_dir if language == DEFAULT_LANGUAGE else data_dir / language
+
+
+def language_file(data_dir, language: str, kind: str, suffix: str = ".txt") -> Path:
+    """Path of one file of a language, e.g. ("fr", "words") -> data/fr/words_fr.txt."""
+    return language_dir(data_dir, language) / f"{kind}_{language}{suffix}"
+
+
+def is_available(data_dir, language: str) -> bool:
+    """Whether a language can be scored with this data directory."""
+    if language == DEFAULT_LANGUAGE:
+        return True
+    return (bool(language) and language.isidentifier()
+            and language_file(data_dir, language, "letters").is_file())
+
+
+def available_languages(data_dir) -> List[str]:
+    """English followed by every language directory with a letters file, by code."""
+    data_dir = Path(data_dir)
+    others = []
+    if data_dir.is_dir():
+        others = sorted(path.name for path in data_dir.iterdir()
+                        if path.is_dir() and path.name != DEFAULT_LANGUAGE
+                        and is_available(data_dir, path.name))
+    return [DEFAULT_LANGUAGE] + others
+
+
+def _data_lines(path: Path) -> List[str]:
+    with open(path, 'r', encoding='utf-8') as f:
+        return [line.strip() for line in f if line.strip() and not line.lstrip().startswith('#')]
+
+
+def load_letter_frequencies(path: Path) -> Dict[str, float]:
+    """Letter percentages of a letters file, keyed by each lowercase ASCII letter."""
+    frequencies = {}
+    for line in _data_lines(path):
+        fields = line.split()
+        letter = fields[0].lower()
+        if len(fields) != 2 or len(letter) != 1 or not ('a' <= letter <= 'z'):
+            raise ValueError(f"{path}: expected 'letter percentage', got {line!r}")
+        frequencies[letter] = float(fields[1])
+    missing = [letter for letter in ascii_lowercase if letter not in frequencies]
+    if missing:
+        raise ValueError(f"{path}: no percentage for {', '.join(missing)}")
+    return frequencies
+
+
+def load_bigrams(path: Path) -> Set[str]:
+    """Common bigrams of a bigrams file, lowercase."""
+    bigrams = {line.lower() for line in _data_lines(path)}
+    malformed = sorted(bigram for bigram in bigrams
+                       if len(bigram) != 2 or not bigram.isascii() or not bigram.isalpha())
+    if malformed:
+        raise ValueError(f"{path}: not ASCII letter pairs: {', '.join(malformed)}")
+    return bigrams
+
+
+def load_profile(path: Path, names: Iterable[str]) -> Dict[str, float]:
+    """Score targets of a profile file, restricted to the given names."""
+    names = set(names)
+    profile = {}
+    for line in _data_lines(path):
+        fields = line.split()
+        if len(fields) != 2 or fields[0] not in names:
+            raise ValueError(f"{path}: expected one of {', '.join(sorted(names))} "
+                             f"followed by a value, got {line!r}")
+        profile[fields[0]] = float(fields[1])
+    return profile
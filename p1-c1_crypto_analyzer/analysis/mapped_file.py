@@ -0,0 +1,158 @@
+# analysis/mapped_file.py - Features of huge files, memory-mapped and split across processes
+"""
+Letter, bigram and word counts of a file too large to read into a str.
+
+The file is memory-mapped and cut into byte ranges that end on an ASCII
+separator (never inside a UTF-8 sequence, and almost never inside a word).
+Each range is decoded and counted on its own, in a process pool, and the
+TextFeatures of the ranges are merged in file order: the result equals
+TextFeatures.from_text(CaesarCipher.decrypt(whole_text, 0)) while memory
+stays bounded by the range size and the vocabulary.
+"""
+import mmap
+import os
+import re
+import string
+from collections import Counter
+from typing import Iterator, List, Optional, Tuple
+
+from analysis.features import Boundary, TextFeatures
+from crypto.caesar import CaesarCipher
+
+# Ranges are sized for about RANGES_PER_WORKER ranges per process, within these bounds
+MIN_RANGE_SIZE = 1 << 20
+MAX_RANGE_SIZE = 64 << 20
+RANGES_PER_WORKER = 4
+
+# How far past a cut point to look for a separator before settling for a UTF-8 boundary
+ALIGN_WINDOW = 1 << 16
+
+# Any ASCII byte that is not a letter ends a word and starts a UTF-8 sequence
+_SEPARATOR = re.compile(rb'[^A-Za-z\x80-\xff]')
+
+# Same decoding as the CLI stream mode: undecodable bytes become non-letters
+_ERRORS = 'surrogateescape'
+
+# ASCII letters lowercased, every other byte becomes a word separator
+_BYTES_WORD_TABLE = bytes(
+    code | 0x20 if chr(code) in string.ascii_letters else ord(' ') for code in range(256)
+)
+
+
+def range_size_for(file_size: int, workers: int) -> int:
+    """Default range size for a file split across `workers` processes."""
+    target = file_size // max(workers * RANGES_PER_WORKER, 1)
+    return min(max(target, MIN_RANGE_SIZE), MAX_RANGE_SIZE)
+
+
+def aligned_ranges(data, range_size: int) -> List[Tuple[int, int]]:
+    """
+    Split a buffer (bytes, mmap) into consecutive (start, end) ranges of
+    about range_size bytes, each cut just before an ASCII separator or,
+    failing one within ALIGN_WINDOW bytes, before a UTF-8 lead byte.
+    """
+    if range_size <= 0:
+        raise ValueError(f"range_size must be positive, got {range_size}")
+    size = len(data)
+    ranges = []
+    start = 0
+    while start < size:
+        end = min(start + range_size, size)
+        if end < size:
+            match = _SEPARATOR.search(data, end, min(end + ALIGN_WINDOW, size))
+            if match:
+                end = match.start()
+            else:
+                while end < size and data[end] & 0xC0 == 0x80:
+                    end += 1
+        ranges.append((start, end))
+        start = end
+    return ranges
+
+
+def range_features(path: str, start: int, end: int) -> TextFeatures:
+    """Features of bytes [start, end) of a file (runs in a worker process)."""
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        data = mapped[start:end]
+    if data.isascii():
+        return ascii_features(data)
+    # Key 0 maps non-ASCII letters the same way every decryption does
+    return TextFeatures.from_text(CaesarCipher.decrypt(data.decode('utf-8', _ERRORS), 0))
+
+
+def ascii_features(data: bytes) -> TextFeatures:
+    """
+    TextFeatures.from_text(data.decode('ascii')) counted on the bytes, with
+    NumPy histograms for letters and bigrams (several times faster than
+    Counter on large ranges). Counts are equal; bigrams are listed in code
+    order rather than first-appearance order, which no score depends on.
+    """
+    import numpy as np
+
+    separated = data.translate(_BYTES_WORD_TABLE)
+    words = separated.split()
+    letters = separated.translate(None, b' ')
+    codes = np.frombuffer(letters, dtype=np.uint8)
+
+    letter_histogram = np.bincount(codes, minlength=128)
+    present = sorted(np.flatnonzero(letter_histogram).tolist(),
+                     key=lambda code: letters.find(bytes((code,))))
+    letter_counts = Counter({chr(code): int(letter_histogram[code]) for code in present})
+
+    pairs = (codes[:-1].astype(np.uint16) << 8) | codes[1:]
+    pair_histogram = np.bincount(pairs, minlength=1 << 16)
+    bigram_counts = Counter({chr(pair >> 8) + chr(pair & 0xFF): int(pair_histogram[pair])
+                             for pair in np.flatnonzero(pair_histogram).tolist()})
+
+    word_counts = Counter({word.decode('ascii'): count for word, count in Counter(words).items()})
+    return TextFeatures(
+        letter_counts, len(letters),
+        bigram_counts, max(len(letters) - 1, 0),
+        word_counts, len(words),
+        Boundary(
+            words[0].decode('ascii') if separated[:1] not in (b'', b' ') else '',
+            words[-1].decode('ascii') if separated[-1:] not in (b'', b' ') else '',
+            letters[:1].decode('ascii'), letters[-1:].decode('ascii'),
+            len(letters) == len(separated)
+        )
+    )
+
+
+def file_ranges(path: str, workers: int,
+                range_size: Optional[int] = None) -> Tuple[int, List[Tuple[int, int]]]:
+    """File size and aligned byte ranges of a file."""
+    file_size = os.path.getsize(path)
+    if not file_size:
+        return 0, []
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        return file_size, aligned_ranges(mapped, range_size or range_size_for(file_size, workers))
+
+
+def iter_range_features(path: str, ranges: List[Tuple[int, int]],
+                        workers: int) -> Iterator[TextFeatures]:
+    """Features of each range, in file order, computed by `workers` processes."""
+    if workers == 1 or len(ranges) < 2:
+        for start, end in ranges:
+            yield range_features(path, start, end)
+        return
+
+    # Deferred import: concurrent.futures is costly at startup
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(ranges))) as pool:
+        yield from pool.map(range_features, [path] * len(ranges),
+                            [start for start, _ in ranges], [end for _, end in ranges])
+
+
+def mapped_features(path: str, workers: Optional[int] = None,
+                    range_size: Optional[int] = None) -> TextFeatures:
+    """
+    Features of a whole file, as if decoded into one str, counted range by
+    range in parallel (workers defaults to the number of cores).
+    """
+    workers = workers or os.cpu_count() or 1
+    _, ranges = file_ranges(path, workers, range_size)
+    features = TextFeatures.empty()
+    for part in iter_range_features(path, ranges, workers):
+        features.update(part)
+    return features
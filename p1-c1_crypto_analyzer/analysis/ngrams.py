@@ -0,0 +1,133 @@
+# analysis/ngrams.py - Dense n-gram log-likelihood tables
+"""
+Dense n-gram tables: one float32 log10 probability per possible n-gram
+(26**n entries, index = letters read as a base-26 number), stored as .npy
+files under data/ (data/<lang>/ for languages other than English).
+
+Regenerate the bundled tables from the corpus files with:
+    python -m analysis.ngrams [data_dir [language]]
+"""
+import math
+import sys
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+
+from analysis.languages import DEFAULT_LANGUAGE, language_dir, language_file
+
+# Orders the bundled corpora (about 10 KB each) can train: they see most
+# common trigrams, but less than 2% of the 26**4 quadgrams, so a quadgram
+# table would be nearly all unseen floor
+NGRAM_ORDERS = (2, 3)
+CORPUS_FILES = ("samples/sample_plain.txt", "samples/ngram_corpus_en.txt")
+
+# Corpus of the other languages, inside their directory
+LANGUAGE_CORPUS_FILE = "samples/ngram_corpus_{language}.txt"
+
+# Probability mass given to n-grams never seen in the corpus (in counts)
+UNSEEN_COUNT = 0.01
+
+
+def ngram_table_path(data_dir, n: int, language: str = DEFAULT_LANGUAGE) -> Path:
+    """Path of the n-gram table file of a language inside a data directory."""
+    return language_file(data_dir, language, "ngrams", f"_{n}.npy")
+
+
+def letter_indices(text) -> np.ndarray:
+    """ASCII letters of a text (str or bytes) as 0-25 indices, case folded."""
+    if isinstance(text, str):
+        text = text.encode('utf-8', 'surrogatepass')
+    folded = np.frombuffer(text, dtype=np.uint8) | 0x20
+    letters = folded[(folded >= ord('a')) & (folded <= ord('z'))]
+    return letters.astype(np.intp) - ord('a')
+
+
+def ngram_indices(letters: np.ndarray, n: int) -> np.ndarray:
+    """
+    Table indices of every n-gram along the last axis of a letter index
+    array (1-D for one text, 2-D for one text per row).
+    """
+    count = letters.shape[-1] - n + 1
+    if count <= 0:
+        return np.zeros(letters.shape[:-1] + (0,), dtype=np.intp)
+
+    index = np.zeros(letters.shape[:-1] + (count,), dtype=np.intp)
+    for offset in range(n):
+        index = index * 26 + letters[..., offset:offset + count]
+    return index
+
+
+@lru_cache(maxsize=None)
+def shifted_indices(n: int) -> np.ndarray:
+    """
+    Read-only (25, 26**n) array: row k - 1 maps every n-gram index to the
+    index of the same n-gram with each letter shifted back by k (Caesar
+    decryption with key k).
+    """
+    letters = np.indices((26,) * n).reshape(n, -1)
+    keys = np.arange(1, 26)[:, np.newaxis]
+    index = np.zeros((25, 26 ** n), dtype=np.intp)
+    for letter in letters:
+        index = index * 26 + (letter - keys) % 26
+    index.flags.writeable = False
+    return index
+
+
+def build_ngram_table(text: str, n: int) -> np.ndarray:
+    """Log10 probability table of the n-grams of a training text."""
+    counts = np.bincount(ngram_indices(letter_indices(text), n), minlength=26 ** n)
+    total = counts.sum()
+    if not total:
+        raise ValueError(f"Training text has no {n}-gram")
+
+    table = np.full(26 ** n, math.log10(UNSEEN_COUNT / total), dtype=np.float32)
+    seen = counts > 0
+    table[seen] = np.log10(counts[seen] / total)
+    return table
+
+
+def load_ngram_table(data_dir, n: int, language: str = DEFAULT_LANGUAGE) -> np.ndarray:
+    """Load an n-gram table read-only (memory-mapped, pages shared between processes)."""
+    path = ngram_table_path(data_dir, n, language)
+    if not path.exists():
+        if n not in NGRAM_ORDERS:
+            raise FileNotFoundError(
+                f"No {n}-gram table at {path} (bundled orders: "
+                f"{', '.join(map(str, NGRAM_ORDERS))})")
+        raise FileNotFoundError(
+            f"No {n}-gram table at {path} "
+            f"(build it with: python -m analysis.ngrams {data_dir} {language})")
+    return np.load(path, mmap_mode='r')
+
+
+def table_calibration(table: np.ndarray):
+    """
+    (floor, expected) log-likelihoods of a table: the value of an unseen
+    n-gram and the mean log-likelihood of the training text itself.
+    """
+    floor = float(table.min())
+    seen = np.asarray(table[table > floor], dtype=np.float64)
+    expected = float((10 ** seen * seen).sum())
+    return floor, expected
+
+
+def main(argv=None) -> int:
+    argv = argv or []
+    data_dir = Path(argv[0] if argv else Path(__file__).parent.parent / "data")
+    language = argv[1] if len(argv) > 1 else DEFAULT_LANGUAGE
+    if language == DEFAULT_LANGUAGE:
+        corpus_files = [data_dir / name for name in CORPUS_FILES]
+    else:
+        corpus_files = [language_dir(data_dir, language) / LANGUAGE_CORPUS_FILE.format(language=language)]
+    corpus = "\n".join(path.read_text(encoding='utf-8') for path in corpus_files)
+
+    for n in NGRAM_ORDERS:
+        table = build_ngram_table(corpus, n)
+        np.save(ngram_table_path(data_dir, n, language), table)
+        print(f"{ngram_table_path(data_dir, n, language)}: {table.size} entries")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
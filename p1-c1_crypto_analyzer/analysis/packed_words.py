@@ -0,0 +1,241 @@
+# analysis/packed_words.py - Word lists packed into a memory-mapped binary file
+"""
+Large word lists stored as a read-only binary file instead of a Python set.
+
+The file holds the shape index of analysis.word_index (one entry per shape,
+with the mask of first-letter offsets) as sorted packed arrays, built once
+from the word file and memory-mapped on load: opening it costs a header
+read, lookups touch a few pages, and every process mapping the same file
+shares those pages instead of unpickling its own set. An optional Bloom
+filter in front of the arrays answers most misses without a binary search.
+
+Layout (native byte order, every section 4-byte aligned):
+
+    header    magic, version, byte order, Bloom probes, source digest, sizes
+    hashes    uint32[count]      crc32 of each shape, sorted
+    masks     uint32[count]      first-letter offset mask of each shape
+    offsets   uint32[count + 1]  start of each shape in the blob
+    blob      shapes, ASCII, concatenated
+    bloom     bloom_bytes bytes  (absent when built without a filter)
+    extras    entries that are not lowercase ASCII words, UTF-8, one per line
+
+Files live next to the snapshots in data/.snapshots/ and are rebuilt when
+the digest of the source signature changes.
+"""
+import bisect
+import hashlib
+import math
+import mmap
+import os
+import struct
+import sys
+import zlib
+from array import array
+from collections.abc import Set
+from pathlib import Path
+from typing import FrozenSet, Iterable, Iterator, Optional, Tuple
+
+from analysis.snapshot import SNAPSHOT_DIR
+from analysis.word_index import ShiftIndex, _SHAPE_TABLES, word_shapes
+
+PACKED_FORMAT = 1
+
+_MAGIC = b'PKWD'
+_HEADER = struct.Struct('<4sHBB16sIIIII')
+_BYTE_ORDER = 1 if sys.byteorder == 'little' else 2
+
+
+def packed_path(data_dir, name: str) -> Path:
+    """Path of a named packed word list inside a data directory."""
+    return Path(data_dir) / SNAPSHOT_DIR / f"{name}.packed"
+
+
+def _digest(signature: Tuple) -> bytes:
+    return hashlib.blake2b(repr(signature).encode(), digest_size=16).digest()
+
+
+def _padding(size: int) -> bytes:
+    return bytes(-size % 4)
+
+
+def _is_indexable(word: str) -> bool:
+    return word.isascii() and word.isalpha() and word.islower()
+
+
+def _bloom_probes(shape: bytes, bits: int, probes: int) -> Iterator[int]:
+    # Double hashing: probe i is h1 + i * h2 (h2 odd, so probes differ)
+    first = zlib.crc32(shape)
+    step = zlib.adler32(shape) | 1
+    for probe in range(probes):
+        yield (first + probe * step) % bits
+
+
+def save_packed_words(path: Path, signature: Tuple, words: Iterable[str],
+                      bloom_bits_per_word: int = 0) -> bool:
+    """
+    Write a word list as a packed file atomically, with a Bloom filter of
+    about bloom_bits_per_word bits per shape (0 for none).
+    Returns False when the data directory is not writable.
+    """
+    words = set(words)
+    extras = sorted(word for word in words if not _is_indexable(word))
+    entries = sorted((zlib.crc32(shape.encode('ascii')), shape, mask)
+                     for shape, mask in word_shapes(words).items())
+
+    hashes = array('I', (hashed for hashed, _, _ in entries))
+    masks = array('I', (mask for _, _, mask in entries))
+    blob = ''.join(shape for _, shape, _ in entries).encode('ascii')
+    offsets = array('I', [0])
+    for _, shape, _ in entries:
+        offsets.append(offsets[-1] + len(shape))
+
+    bloom = bytearray()
+    probes = 0
+    if bloom_bits_per_word > 0 and entries:
+        bloom = bytearray(-(-len(entries) * bloom_bits_per_word // 32) * 4)
+        probes = max(1, round(bloom_bits_per_word * math.log(2)))
+        for _, shape, _ in entries:
+            for bit in _bloom_probes(shape.encode('ascii'), len(bloom) * 8, probes):
+                bloom[bit >> 3] |= 1 << (bit & 7)
+
+    extras_blob = '\n'.join(extras).encode('utf-8')
+    header = _HEADER.pack(_MAGIC, PACKED_FORMAT, _BYTE_ORDER, probes, _digest(signature),
+                          len(entries), len(words), len(blob), len(bloom), len(extras_blob))
+
+    temporary = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        path.parent.mkdir(exist_ok=True)
+        with open(temporary, 'wb') as f:
+            f.write(header)
+            for section in (hashes, masks, offsets):
+                section.tofile(f)
+            f.write(blob + _padding(len(blob)))
+            f.write(bloom)
+            f.write(extras_blob)
+        os.replace(temporary, path)
+    except OSError:
+        try:
+            os.unlink(temporary)
+        except OSError:
+            pass
+        return False
+    return True
+
+
+def load_packed_words(path: Path, signature: Tuple) -> Optional['PackedWordSet']:
+    """Packed word list built from these sources, or None if missing, stale or unreadable."""
+    try:
+        words = PackedWordSet(path)
+    except (OSError, ValueError):
+        return None
+    if words.digest != _digest(signature):
+        words.close()
+        return None
+    return words
+
+
+class PackedWordSet(ShiftIndex, Set):
+    """
+    Read-only set of words backed by a packed file, usable wherever the
+    scorer expects a word set (membership, len, iteration) and as the
+    ShiftIndex of that set. Pickles as its path, so worker processes
+    reopen the file and share its pages.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        with open(self.path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._open()
+        except ValueError:
+            self.close()
+            raise
+
+    def _open(self) -> None:
+        if len(self._map) < _HEADER.size:
+            raise ValueError(f"{self.path} is not a packed word list")
+        (magic, version, byte_order, self._probes, self.digest,
+         count, self._word_count, blob_size, bloom_bytes,
+         extras_size) = _HEADER.unpack_from(self._map)
+        if magic != _MAGIC or version != PACKED_FORMAT or byte_order != _BYTE_ORDER:
+            raise ValueError(f"{self.path} is not a packed word list of this format")
+
+        position = _HEADER.size
+        sections = []
+        for size in (4 * count, 4 * count, 4 * (count + 1),
+                     blob_size + len(_padding(blob_size)), bloom_bytes, extras_size):
+            sections.append((position, position + size))
+            position += size
+        if position != len(self._map):
+            raise ValueError(f"{self.path} is truncated")
+
+        with memoryview(self._map) as view:
+            self._hashes, self._masks, self._offsets = (
+                view[start:end].cast('I') for start, end in sections[:3])
+        self._blob_start = sections[3][0]
+        self._bloom_start, bloom_end = sections[4]
+        self._bloom_bits = (bloom_end - self._bloom_start) * 8
+        start, end = sections[5]
+        self._extras: FrozenSet[str] = frozenset(
+            self._map[start:end].decode('utf-8').split('\n') if end > start else ())
+        self._count = count
+
+    def close(self) -> None:
+        """Release the mapping (lookups fail afterwards)."""
+        for name in ('_hashes', '_masks', '_offsets'):
+            view = self.__dict__.pop(name, None)
+            if view is not None:
+                view.release()
+        self._map.close()
+
+    def __reduce__(self):
+        return (PackedWordSet, (str(self.path),))
+
+    def __len__(self) -> int:
+        return self._word_count
+
+    def __contains__(self, word) -> bool:
+        if not isinstance(word, str):
+            return False
+        if word and _is_indexable(word):
+            offset = ord(word[0]) - ord('a')
+            return bool(self.mask(word.translate(_SHAPE_TABLES[offset])) >> offset & 1)
+        return word in self._extras
+
+    def __iter__(self) -> Iterator[str]:
+        blob_start = self._blob_start
+        offsets = self._offsets
+        for index in range(self._count):
+            shape = self._map[blob_start + offsets[index]:blob_start + offsets[index + 1]]
+            shape = shape.decode('ascii')
+            mask = self._masks[index]
+            while mask:
+                offset = (mask & -mask).bit_length() - 1
+                yield shape.translate(_SHAPE_TABLES[-offset % 26])
+                mask &= mask - 1
+        yield from self._extras
+
+    def mask(self, shape: str) -> int:
+        """Bit mask of the first-letter offsets of the list words with this shape."""
+        encoded = shape.encode('ascii')
+        hashed = zlib.crc32(encoded)
+        if self._probes:
+            # Same probes as _bloom_probes, inlined: this runs once per distinct word
+            bits = self._bloom_bits
+            bloom_start = self._bloom_start
+            step = zlib.adler32(encoded) | 1
+            for probe in range(self._probes):
+                bit = (hashed + probe * step) % bits
+                if not self._map[bloom_start + (bit >> 3)] >> (bit & 7) & 1:
+                    return 0
+
+        hashes = self._hashes
+        index = bisect.bisect_left(hashes, hashed)
+        blob_start = self._blob_start
+        offsets = self._offsets
+        while index < self._count and hashes[index] == hashed:
+            if self._map[blob_start + offsets[index]:blob_start + offsets[index + 1]] == encoded:
+                return self._masks[index]
+            index += 1
+        return 0
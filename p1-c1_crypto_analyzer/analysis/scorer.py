@@ -1,39 +1,233 @@
 # analysis/scorer.py - COMPLETE
 import string
 import math
-from collections import Counter
-from typing import Dict, List, Optional
+from time import perf_counter_ns
+from typing import AbstractSet, Dict, Iterable, List, Optional, Tuple, Union
 from pathlib import Path
 
+from analysis import languages
+from analysis.features import _WORD_TABLE, TextFeatures
+from analysis.languages import DEFAULT_LANGUAGE
+from analysis.word_index import ShiftIndex
+from analysis.snapshot import load_snapshot, save_snapshot, snapshot_path, source_signature
+from crypto.caesar import CaesarCipher
+
+
+# Scoring methods accept raw text or features computed once
+TextInput = Union[str, TextFeatures]
+
+# Word splitting of TextFeatures, keeping NUL as the text separator of score_many
+_BATCH_WORD_TABLE = {**_WORD_TABLE, 0: '\0'}
+
+
+def _add_timing(timings: Dict[str, int], stage: str, start: int) -> None:
+    """Add the nanoseconds elapsed since start to timings[stage]."""
+    timings[stage] = timings.get(stage, 0) + perf_counter_ns() - start
+
 
 class TextScorer:
-    """Scores text based on linguistic features to detect English plaintext."""
+    """
+    Scores text based on linguistic features to detect plaintext of one
+    language (English by default, see analysis.languages).
+    """
+    
+    DEFAULT_WEIGHTS = {
+        'stopwords': 0.30,    # Most important for short texts
+        'dictionary': 0.25,   # Important for word recognition
+        'frequency': 0.20,    # Good for longer texts
+        'bigrams': 0.15,      # Good for text structure
+        'entropy': 0.10       # Good for randomness detection
+    }
+    
+    # Cheap histogram-based methods vs. per-word set lookups
+    STATISTICAL_METHODS = ('frequency', 'bigrams', 'entropy')
+    WORD_METHODS = ('stopwords', 'dictionary')
+    
+    # Default n-gram order: the highest order bundled (analysis.ngrams.NGRAM_ORDERS)
+    NGRAM_ORDER = 3
+    
+    # English letter frequencies (percentages)
+    ENGLISH_FREQUENCIES = {
+        'e': 12.02, 't': 9.10, 'a': 8.12, 'o': 7.68, 'i': 7.31,
+        'n': 6.95, 's': 6.28, 'r': 6.02, 'h': 5.92, 'd': 4.32,
+        'l': 3.98, 'u': 2.88, 'c': 2.71, 'm': 2.61, 'f': 2.30,
+        'y': 2.11, 'w': 2.09, 'g': 2.03, 'p': 1.82, 'b': 1.49,
+        'v': 1.11, 'k': 0.69, 'x': 0.17, 'q': 0.11, 'j': 0.10, 'z': 0.07
+    }
+    
+    # Score targets of English text (see analysis.languages for other languages)
+    ENGLISH_PROFILE = {
+        'stopwords_percent': 25.0,   # Share of stopwords among words
+        'bigrams_percent': 12.5,     # Share of common bigrams among bigrams
+        'entropy_bits': 4.07         # Letter entropy
+    }
+    
+    # Common English bigrams
+    ENGLISH_BIGRAMS = frozenset({
+        'th', 'he', 'in', 'er', 'an', 're', 'nd', 'at', 'on', 'nt',
+        'ha', 'es', 'st', 'en', 'ed', 'to', 'it', 'ou', 'ea', 'hi',
+        'is', 'or', 'ti', 'as', 'te', 'et', 'ng', 'of', 'al', 'de',
+        'se', 'le', 'sa', 'si', 'ar', 've', 'ra', 'ld', 'ur'
+    })
+    
+    # Word list files (analysis.languages), parsed once then served from a binary snapshot
+    WORD_KINDS = ("stopwords", "words")
+    
+    # Dictionary storage: a Python set, or a memory-mapped packed file
+    # (analysis.packed_words); "auto" packs word files of at least this size
+    DICTIONARY_BACKENDS = ("auto", "set", "packed")
+    PACKED_DICTIONARY_MIN_BYTES = 1 << 20
     
-    def __init__(self, data_dir: str = "data"):
+    def __init__(self, data_dir: str = "data", use_snapshot: bool = True,
+                 dictionary_backend: str = "auto", language: str = DEFAULT_LANGUAGE):
+        if dictionary_backend not in self.DICTIONARY_BACKENDS:
+            raise ValueError(f"Unknown dictionary backend: {dictionary_backend!r} "
+                             f"(expected one of {', '.join(self.DICTIONARY_BACKENDS)})")
+        if not languages.is_available(data_dir, language):
+            raise ValueError(f"Unknown language: {language!r} (available: "
+                             f"{', '.join(languages.available_languages(data_dir))})")
         self.data_dir = Path(data_dir)
-        self.stopwords = self._load_stopwords()
-        self.dictionary = self._load_dictionary()
-        
-        # English letter frequencies (percentages)
-        self.english_frequencies = {
-            'e': 12.02, 't': 9.10, 'a': 8.12, 'o': 7.68, 'i': 7.31,
-            'n': 6.95, 's': 6.28, 'r': 6.02, 'h': 5.92, 'd': 4.32,
-            'l': 3.98, 'u': 2.88, 'c': 2.71, 'm': 2.61, 'f': 2.30,
-            'y': 2.11, 'w': 2.09, 'g': 2.03, 'p': 1.82, 'b': 1.49,
-            'v': 1.11, 'k': 0.69, 'x': 0.17, 'q': 0.11, 'j': 0.10, 'z': 0.07
-        }
+        self.language = language
+        self.language_dir = languages.language_dir(data_dir, language)
+        self.word_files = tuple(languages.language_file(data_dir, language, kind)
+                                for kind in self.WORD_KINDS)
+        self._use_snapshot = use_snapshot
+        self._dictionary_backend = dictionary_backend
+        self.stopwords, self.dictionary = self._load_word_sets(use_snapshot, dictionary_backend)
         
-        # Common English bigrams
-        self.common_bigrams = {
-            'th', 'he', 'in', 'er', 'an', 're', 'nd', 'at', 'on', 'nt',
-            'ha', 'es', 'st', 'en', 'ed', 'to', 'it', 'ou', 'ea', 'hi',
-            'is', 'or', 'ti', 'as', 'te', 'et', 'ng', 'of', 'al', 'de',
-            'se', 'le', 'sa', 'si', 'ar', 've', 'ra', 'ld', 'ur'
-        }
+        # Dense n-gram tables, loaded on first use by order
+        self._ngram_tables = {}
+        
+        # Shape indexes of the word sets (analysis.word_index), built on first use
+        self._word_indexes = {}
+        
+        # Scorers of every language loaded so far (for_language), shared between them
+        self._language_scorers = {language: self}
+        
+        self.letter_frequencies, self.common_bigrams, self.profile = self._load_language_tables()
+    
+    def _load_language_tables(self) -> Tuple[Dict[str, float], set, Dict[str, float]]:
+        """
+        Letter frequencies (percentages), common bigrams and score targets
+        of the language: built in for English unless overridden by files,
+        read from the language directory otherwise (targets default to
+        English ones).
+        """
+        letters_file = languages.language_file(self.data_dir, self.language, "letters")
+        bigrams_file = languages.language_file(self.data_dir, self.language, "bigrams")
+        if letters_file.exists() or self.language != DEFAULT_LANGUAGE:
+            letter_frequencies = languages.load_letter_frequencies(letters_file)
+        else:
+            letter_frequencies = dict(self.ENGLISH_FREQUENCIES)
+        if bigrams_file.exists():
+            common_bigrams = languages.load_bigrams(bigrams_file)
+        elif self.language == DEFAULT_LANGUAGE:
+            common_bigrams = set(self.ENGLISH_BIGRAMS)
+        else:
+            common_bigrams = set()
+        profile = dict(self.ENGLISH_PROFILE)
+        profile_file = languages.language_file(self.data_dir, self.language, "profile")
+        if profile_file.exists():
+            profile.update(languages.load_profile(profile_file, self.ENGLISH_PROFILE))
+        return letter_frequencies, common_bigrams, profile
+    
+    def _load_word_sets(self, use_snapshot: bool = True,
+                        dictionary_backend: str = "auto") -> Tuple[set, AbstractSet[str]]:
+        """
+        Stopword and dictionary sets, read from the data/.snapshots snapshot
+        when it matches the word files, otherwise parsed and snapshotted.
+        With the packed backend the dictionary is a PackedWordSet instead.
+        """
+        signature = source_signature(self.word_files)
+        if not use_snapshot or signature is None:
+            # Missing files: built-in fallbacks, nothing worth caching
+            return self._load_stopwords(), self._load_dictionary()
+        
+        if self._use_packed_dictionary(dictionary_backend, signature):
+            dictionary = self._load_packed_dictionary()
+            if dictionary is not None:
+                return self._load_stopwords(), dictionary
+        
+        path = snapshot_path(self.language_dir, f"words_{self.language}")
+        payload = load_snapshot(path, signature)
+        if payload is not None:
+            return payload
+        
+        word_sets = (self._load_stopwords(), self._load_dictionary())
+        save_snapshot(path, signature, word_sets)
+        return word_sets
+    
+    def _use_packed_dictionary(self, dictionary_backend: str, signature: Tuple) -> bool:
+        """Whether the dictionary should be served from a packed file."""
+        if dictionary_backend != "auto":
+            return dictionary_backend == "packed"
+        _, _, dictionary_size = signature[self.WORD_KINDS.index("words")]
+        return dictionary_size >= self.PACKED_DICTIONARY_MIN_BYTES
+    
+    def _load_packed_dictionary(self) -> Optional[AbstractSet[str]]:
+        """
+        Dictionary mapped from .snapshots/words_<lang>.packed, built from
+        the word file when missing or stale. None when it cannot be written.
+        """
+        # Deferred import: only large dictionaries need the packed format
+        from analysis.packed_words import load_packed_words, packed_path, save_packed_words
+        
+        dictionary_file = self.word_files[self.WORD_KINDS.index("words")]
+        signature = source_signature([dictionary_file])
+        if signature is None:
+            return None
+        path = packed_path(self.language_dir, f"words_{self.language}")
+        dictionary = load_packed_words(path, signature)
+        if dictionary is None and save_packed_words(path, signature, self._load_dictionary()):
+            dictionary = load_packed_words(path, signature)
+        return dictionary
+    
+    def publish_dictionary(self) -> str:
+        """
+        Make the dictionary shareable by worker processes: build (or refresh)
+        its packed file so that every worker maps the same read-only pages
+        instead of loading its own set. Returns the dictionary_backend the
+        workers should be created with: "set" when the backend is "set",
+        when "auto" would keep a set (word file under
+        PACKED_DICTIONARY_MIN_BYTES) or when it cannot be packed.
+        """
+        if isinstance(self.dictionary, ShiftIndex):
+            return "packed"
+        signature = source_signature(self.word_files)
+        if signature is None:
+            # Built-in fallback words, cheap to load in every worker
+            return "set"
+        if not self._use_packed_dictionary(self._dictionary_backend, signature):
+            # Small lists load faster as sets, and sets answer lookups faster
+            return "set"
+        dictionary = self._load_packed_dictionary()
+        if dictionary is None:
+            return "set"
+        dictionary.close()
+        return "packed"
+    
+    def data_signature(self) -> Tuple:
+        """
+        (name, mtime_ns, size) of every data file the scores depend on
+        (None values for a missing file), to key caches of results.
+        """
+        # Letter, bigram and profile files also override the built-in English tables
+        paths = list(self.word_files)
+        paths += [languages.language_file(self.data_dir, self.language, kind)
+                  for kind in ("letters", "bigrams", "profile")]
+        paths += sorted(self.language_dir.glob(f"ngrams_{self.language}_*.npy"))
+        signature = []
+        for path in paths:
+            try:
+                stat = path.stat()
+                signature.append((path.name, stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                signature.append((path.name, None, None))
+        return tuple(signature)
     
     def _load_stopwords(self) -> set:
         """Load stopwords from file."""
-        stopwords_file = self.data_dir / "stopwords_en.txt"
+        stopwords_file = self.word_files[self.WORD_KINDS.index("stopwords")]
         if stopwords_file.exists():
             try:
                 with open(stopwords_file, 'r', encoding='utf-8') as f:
@@ -41,6 +235,9 @@ class TextScorer:
             except:
                 pass
         
+        if self.language != DEFAULT_LANGUAGE:
+            return set()
+        
         # Fallback stopwords
         return {
             'the', 'and', 'to', 'of', 'a', 'in', 'that', 'is', 'was',
@@ -52,7 +249,7 @@ class TextScorer:
     
     def _load_dictionary(self) -> set:
         """Load dictionary words from file."""
-        dict_file = self.data_dir / "words_en.txt"
+        dict_file = self.word_files[self.WORD_KINDS.index("words")]
         if dict_file.exists():
             try:
                 with open(dict_file, 'r', encoding='utf-8') as f:
@@ -60,6 +257,9 @@ class TextScorer:
             except:
                 pass
         
+        if self.language != DEFAULT_LANGUAGE:
+            return set()
+        
         # Fallback dictionary
         return {
             'hello', 'world', 'test', 'message', 'text', 'analysis',
@@ -70,53 +270,553 @@ class TextScorer:
             'him', 'them', 'when', 'which', 'now', 'then', 'its', 'also'
         }
     
-    def score_stopwords(self, text: str) -> float:
+    def score_stopwords(self, text: TextInput) -> float:
         """
         Score based on stopwords count.
         Returns: 0-100
         """
-        words = self._extract_words(text)
-        if not words:
-            return 0.0
-        
-        stopword_count = sum(1 for word in words if word in self.stopwords)
-        percentage = (stopword_count / len(words)) * 100
+        features = self.features(text)
+        stopword_count = sum(count for word, count in features.word_counts.items()
+                             if word in self.stopwords)
+        return self._stopwords_score_from_counts(stopword_count, features.word_total)
+    
+    def score_dictionary(self, text: TextInput) -> float:
+        """
+        Score based on dictionary words.
+        Returns: 0-100
+        """
+        features = self.features(text)
+        dict_count = sum(count for word, count in features.word_counts.items()
+                         if word in self.dictionary)
+        return self._dictionary_score_from_counts(dict_count, features.word_total)
+    
+    def score_frequency(self, text: TextInput) -> float:
+        """
+        Score based on letter frequency match.
+        Returns: 0-100
+        """
+        features = self.features(text)
+        return self._frequency_score_from_counts(features.letter_counts, features.letter_total)
+    
+    def score_bigrams(self, text: TextInput) -> float:
+        """
+        Score based on common bigrams.
+        Returns: 0-100
+        """
+        features = self.features(text)
+        common_count = sum(features.bigram_counts[bigram] for bigram in self.common_bigrams)
+        return self._bigrams_score_from_counts(common_count, features.bigram_total)
+    
+    def score_entropy(self, text: TextInput) -> float:
+        """
+        Score based on character entropy.
+        English has entropy ~4.07 bits/character (profile 'entropy_bits').
+        Returns: 0-100
+        """
+        features = self.features(text)
+        return self._entropy_score_from_counts(features.letter_counts.values(),
+                                               features.letter_total)
+    
+    def combined_score(self, text: TextInput, weights: Optional[Dict[str, float]] = None) -> float:
+        """
+        Combined score using all methods with weights.
+        The text is scanned once, whatever the number of methods.
+        Returns: 0-100
+        """
+        return self._weighted_score(self._method_scores(self.features(text)), weights)
+    
+    def features(self, text: TextInput) -> TextFeatures:
+        """
+        Single-pass features of a text (returned as-is if already computed).
+        Features of consecutive chunks can be combined with
+        TextFeatures.merge()/update() and scored like the whole text.
+        """
+        if isinstance(text, TextFeatures):
+            return text
+        return TextFeatures.from_text(text)
+    
+    def score_shifts(self, ciphertext: str,
+                     weights: Optional[Dict[str, float]] = None) -> List[Tuple[int, float]]:
+        """
+        Combined score of every Caesar key (1-25) without decrypting the text.
         
-        # Optimal stopword percentage for English is ~20-30%
-        optimal = 25.0
-        score = 100.0 - min(abs(percentage - optimal) * 3, 100.0)
+        The ciphertext is scanned once: its letter, bigram and word counts
+        are rotated by each key, so the cost is one pass plus work
+        proportional to the number of distinct words.
+        Each value equals combined_score(CaesarCipher.decrypt(ciphertext, k)).
+        Returns: list of (key, score) in key order
+        """
+        # Key 0 maps non-ASCII letters the same way every decryption does
+        features = TextFeatures.from_text(CaesarCipher.decrypt(ciphertext, 0))
+        return [
+            (key, self._weighted_score(self._method_scores(features.shifted(key)), weights))
+            for key in range(1, 26)
+        ]
+    
+    def rank_shifts(self, ciphertext: TextInput, weights: Optional[Dict[str, float]] = None,
+                    decimals: int = 2, timings: Optional[Dict[str, int]] = None,
+                    keys: Iterable[int] = range(1, 26)) -> List[Tuple[int, float]]:
+        """
+        Rank the Caesar keys (1-25, or the given keys) by combined score, best first.
+        
+        Scores are rounded to `decimals` and ties keep key order, like a
+        stable sort of score_shifts. Statistical scorers run on the rotated
+        histograms of each key; word-level scores of every key come from a
+        single pass over the distinct words (word_hits).
+        
+        A TextFeatures argument must hold the counts of
+        CaesarCipher.decrypt(ciphertext, 0). When a timings dict is given,
+        perf_counter_ns durations are added to it per stage ('features',
+        'shift', 'sorting' and one entry per scoring method).
+        Returns: ranked list of (key, score)
+        """
+        if timings is None:
+            timings = {}
+        start = perf_counter_ns()
+        if isinstance(ciphertext, TextFeatures):
+            features = ciphertext
+        else:
+            # Key 0 maps non-ASCII letters the same way every decryption does
+            features = TextFeatures.from_text(CaesarCipher.decrypt(ciphertext, 0))
+            _add_timing(timings, 'features', start)
+        if weights is None:
+            weights = self.DEFAULT_WEIGHTS
+        word_methods = [method for method in self.WORD_METHODS if method in weights]
+        hits = self.word_hits(features, word_methods, timings)
+        
+        ranked = []
+        for key in keys:
+            start = perf_counter_ns()
+            shifted = features.shifted(key, words=False)
+            _add_timing(timings, 'shift', start)
+            scores = {method: self._timed_score(method, shifted, timings)
+                      for method in self.STATISTICAL_METHODS}
+            for method in word_methods:
+                scores[method] = self._word_score_from_hits(method, hits[method][key],
+                                                            features.word_total)
+            ranked.append((key, round(self._weighted_score(scores, weights), decimals)))
+        
+        start = perf_counter_ns()
+        ranked.sort(key=lambda item: (-item[1], item[0]))
+        _add_timing(timings, 'sorting', start)
+        return ranked
+    
+    def word_hits(self, features: TextFeatures, methods: Iterable[str] = WORD_METHODS,
+                  timings: Optional[Dict[str, int]] = None) -> Dict[str, List[int]]:
+        """
+        For each word method, the number of words of the features that
+        decrypt to a stopword / dictionary word under each key 0-25, from
+        one lookup per distinct word in a shape index of the word set.
+        """
+        if timings is None:
+            timings = {}
+        hits = {}
+        for method in methods:
+            start = perf_counter_ns()
+            hits[method] = self._word_index(method).hits(features.word_counts)
+            _add_timing(timings, method, start)
+        return hits
+    
+    def _word_index(self, method: str) -> ShiftIndex:
+        """Shape index of the stopword or dictionary set, rebuilt if the set was replaced."""
+        words = self.stopwords if method == 'stopwords' else self.dictionary
+        if isinstance(words, ShiftIndex):
+            # Packed word lists are their own index
+            return words
+        cached = self._word_indexes.get(method)
+        if cached is None or cached[0] is not words or cached[1] != len(words):
+            cached = (words, len(words), ShiftIndex(words))
+            self._word_indexes[method] = cached
+        return cached[2]
+    
+    def _word_score_from_hits(self, method: str, hits: int, total_words: int) -> float:
+        """Stopwords or dictionary score from a number of matching words."""
+        if method == 'stopwords':
+            return self._stopwords_score_from_counts(hits, total_words)
+        return self._dictionary_score_from_counts(hits, total_words)
+    
+    def _timed_score(self, method: str, features: TextFeatures, timings: Dict[str, int]) -> float:
+        """Score with one method, adding its duration to timings[method]."""
+        start = perf_counter_ns()
+        score = getattr(self, 'score_' + method)(features)
+        _add_timing(timings, method, start)
+        return score
+    
+    def ngram_log_likelihood(self, text: Union[str, bytes], n: int = NGRAM_ORDER) -> float:
+        """
+        Mean log10 probability per n-gram (n = 2 or 3 bundled) of the ASCII
+        letters of a text, using the dense table under data/. Higher is more
+        English-like; texts shorter than n letters get the unseen floor.
+        """
+        from analysis.ngrams import letter_indices, ngram_indices
         
-        return max(0.0, min(100.0, score))
+        table, floor, _ = self._ngram_table(n)
+        indices = ngram_indices(letter_indices(text), n)
+        if not indices.size:
+            return floor
+        return float(table[indices].mean(dtype='float64'))
     
-    def score_dictionary(self, text: str) -> float:
+    def score_ngrams(self, text: str, n: int = NGRAM_ORDER) -> float:
         """
-        Score based on dictionary words.
+        Score based on n-gram log-likelihood, scaled so that the unseen
+        floor maps to 0 and the training corpus average maps to 100.
         Returns: 0-100
         """
-        words = self._extract_words(text)
-        if not words:
-            return 0.0
+        from analysis.ngrams import letter_indices
         
-        dict_count = sum(1 for word in words if word in self.dictionary)
-        score = (dict_count / len(words)) * 100
+        if len(letter_indices(text)) < n:
+            return 0.0
+        return self._ngram_score_from_likelihood(self.ngram_log_likelihood(text, n), n)
+    
+    def score_ngrams_array(self, candidates: 'numpy.ndarray',
+                           n: int = NGRAM_ORDER) -> 'numpy.ndarray':
+        """
+        Vectorized score_ngrams over each row of a candidate matrix, such as
+        the one returned by CaesarCipher.brute_force_array.
+        Returns: float array of 0-100 scores, one per row
+        """
+        import numpy as np
+        from analysis.ngrams import ngram_indices
+        
+        candidates = np.atleast_2d(candidates)
+        table, _, _ = self._ngram_table(n)
+        
+        folded = candidates | 0x20
+        is_letter = (folded >= ord('a')) & (folded <= ord('z'))
+        if (is_letter == is_letter[0]).all():
+            # Brute-force matrices share one letter mask: index all rows at once
+            letters = folded[:, is_letter[0]].astype(np.intp) - ord('a')
+            indices = ngram_indices(letters, n)
+            if not indices.shape[1]:
+                return np.zeros(candidates.shape[0])
+            likelihoods = table[indices].mean(axis=1, dtype='float64')
+        else:
+            likelihoods = np.array([
+                self.ngram_log_likelihood(row.tobytes(), n) for row in candidates])
         
+        _, floor, expected = self._ngram_table(n)
+        scores = np.clip(100.0 * (likelihoods - floor) / (expected - floor), 0.0, 100.0)
+        letter_counts = is_letter.sum(axis=1)
+        return np.where(letter_counts >= n, scores, 0.0)
+    
+    def rank_ngram_shifts(self, ciphertext: str, n: int = NGRAM_ORDER, decimals: int = 2,
+                          timings: Optional[Dict[str, int]] = None) -> List[Tuple[int, float]]:
+        """
+        Rank the Caesar keys (1-25) by the score_ngrams of each decryption,
+        best first, without decrypting the text: its n-gram histogram is
+        counted once and each key reads the table through the shifted
+        indices (analysis.ngrams.shifted_indices). Scores are rounded and
+        ties ordered as in rank_shifts; timings get 'features' and 'ngrams'.
+        Returns: ranked list of (key, score)
+        """
+        import numpy as np
+        from analysis.ngrams import letter_indices, ngram_indices, shifted_indices
+        
+        if timings is None:
+            timings = {}
+        start = perf_counter_ns()
+        # Key 0 maps non-ASCII letters the same way every decryption does
+        indices = ngram_indices(letter_indices(CaesarCipher.decrypt(ciphertext, 0)), n)
+        counts = np.bincount(indices, minlength=26 ** n)
+        _add_timing(timings, 'features', start)
+        
+        start = perf_counter_ns()
+        if indices.size:
+            table, floor, expected = self._ngram_table(n)
+            likelihoods = np.asarray(table, dtype=np.float64)[shifted_indices(n)] @ counts / indices.size
+            scores = np.clip(100.0 * (likelihoods - floor) / (expected - floor), 0.0, 100.0)
+        else:
+            scores = np.zeros(25)
+        ranked = [(key, round(float(score), decimals)) for key, score in zip(range(1, 26), scores)]
+        _add_timing(timings, 'ngrams', start)
+        
+        start = perf_counter_ns()
+        ranked.sort(key=lambda item: (-item[1], item[0]))
+        _add_timing(timings, 'sorting', start)
+        return ranked
+    
+    def _ngram_table(self, n: int):
+        """(table, floor, expected) for order n, loaded on first use."""
+        if n not in self._ngram_tables:
+            from analysis.ngrams import load_ngram_table, table_calibration
+            
+            table = load_ngram_table(self.data_dir, n, self.language)
+            self._ngram_tables[n] = (table,) + table_calibration(table)
+        return self._ngram_tables[n]
+    
+    def _ngram_score_from_likelihood(self, likelihood: float, n: int) -> float:
+        """Scale a mean n-gram log-likelihood to 0-100."""
+        _, floor, expected = self._ngram_table(n)
+        score = 100.0 * (likelihood - floor) / (expected - floor)
         return max(0.0, min(100.0, score))
     
-    def score_frequency(self, text: str) -> float:
+    def _method_scores(self, features: TextFeatures,
+                       timings: Optional[Dict[str, int]] = None) -> Dict[str, float]:
         """
-        Score based on letter frequency match.
-        Returns: 0-100
+        Individual scores of every method from precomputed features,
+        timed per method into timings when given.
         """
-        letters = [char.lower() for char in text if char.isalpha()]
-        if not letters:
+        if timings is not None:
+            return {method: self._timed_score(method, features, timings)
+                    for method in ('stopwords', 'dictionary', 'frequency', 'bigrams', 'entropy')}
+        return {
+            'stopwords': self.score_stopwords(features),
+            'dictionary': self.score_dictionary(features),
+            'frequency': self.score_frequency(features),
+            'bigrams': self.score_bigrams(features),
+            'entropy': self.score_entropy(features)
+        }
+    
+    def letter_histograms(self, candidates: 'numpy.ndarray') -> 'numpy.ndarray':
+        """
+        Per-row ASCII letter counts of a uint8 candidate matrix, such as the
+        one returned by CaesarCipher.brute_force_array.
+        Returns: int array of shape (rows, 26)
+        """
+        import numpy as np
+        
+        candidates = np.atleast_2d(candidates)
+        folded = candidates | 0x20
+        is_letter = (folded >= ord('a')) & (folded <= ord('z'))
+        
+        rows, _ = np.nonzero(is_letter)
+        flat = rows * 26 + (folded[is_letter] - ord('a'))
+        return np.bincount(flat, minlength=candidates.shape[0] * 26).reshape(-1, 26)
+    
+    def score_frequency_array(self, candidates: 'numpy.ndarray') -> 'numpy.ndarray':
+        """
+        Vectorized score_frequency over each row of a candidate matrix.
+        Returns: float array of 0-100 scores, one per row
+        """
+        return self._frequency_scores_from_histograms(self.letter_histograms(candidates))
+    
+    def _frequency_scores_from_histograms(self, counts: 'numpy.ndarray') -> 'numpy.ndarray':
+        """Frequency scores of (rows, 26) letter histograms."""
+        import numpy as np
+        
+        totals = counts.sum(axis=1)
+        expected_percent = np.array(
+            [self.letter_frequencies[letter] for letter in string.ascii_lowercase])
+        expected = totals[:, np.newaxis] * (expected_percent / 100)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            chi_square = np.where(expected > 0, (counts - expected) ** 2 / expected, 0.0).sum(axis=1)
+        
+        # Same piecewise mapping as score_frequency
+        scores = np.clip(100.0 - (chi_square - 150) / 8.5, 0.0, 100.0)
+        return np.where(totals > 0, scores, 0.0)
+    
+    def score_entropy_array(self, candidates: 'numpy.ndarray') -> 'numpy.ndarray':
+        """
+        Vectorized score_entropy over each row of a candidate matrix.
+        Returns: float array of 0-100 scores, one per row
+        """
+        return self._entropy_scores_from_histograms(self.letter_histograms(candidates))
+    
+    def _entropy_scores_from_histograms(self, counts: 'numpy.ndarray') -> 'numpy.ndarray':
+        """Entropy scores of (rows, 26) letter histograms."""
+        import numpy as np
+        
+        totals = counts.sum(axis=1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            probabilities = counts / totals[:, np.newaxis]
+            terms = np.where(counts > 0, probabilities * np.log2(probabilities), 0.0)
+        entropy = -terms.sum(axis=1)
+        
+        # Same piecewise mapping as score_entropy
+        entropy_diff = np.abs(entropy - self.profile['entropy_bits'])
+        scores = np.where(entropy_diff < 0.5, 100.0,
+                          np.where(entropy_diff > 2.0, 0.0, 100.0 - entropy_diff * 50))
+        return np.where(totals < 10, 50.0, np.clip(scores, 0.0, 100.0))
+    
+    def score_bigrams_array(self, candidates: 'numpy.ndarray') -> 'numpy.ndarray':
+        """
+        Vectorized score_bigrams over each row of a candidate matrix.
+        Bigrams span non-letters, as in score_bigrams.
+        Returns: float array of 0-100 scores, one per row
+        """
+        import numpy as np
+        
+        candidates = np.atleast_2d(candidates)
+        folded = candidates | 0x20
+        is_letter = (folded >= ord('a')) & (folded <= ord('z'))
+        common = self._common_bigram_table()
+        
+        if (is_letter == is_letter[0]).all():
+            # Brute-force matrices share one letter mask: one gather for all rows
+            letter_rows = [(folded[:, is_letter[0]] - ord('a')).astype(np.intp)]
+        else:
+            letter_rows = [(row[mask] - ord('a')).astype(np.intp)[np.newaxis, :]
+                           for row, mask in zip(folded, is_letter)]
+        
+        counts = []
+        totals = []
+        for letters in letter_rows:
+            bigrams = letters[:, :-1] * 26 + letters[:, 1:]
+            counts.append(common[bigrams].sum(axis=1))
+            totals.append(np.full(letters.shape[0], letters.shape[1] - 1))
+        return self._bigram_scores_from_counts(np.concatenate(counts), np.concatenate(totals))
+    
+    def _common_bigram_table(self) -> 'numpy.ndarray':
+        """Boolean table of the common bigrams, indexed by first * 26 + second letter."""
+        import numpy as np
+        
+        common = np.zeros(26 * 26, dtype=bool)
+        for bigram in self.common_bigrams:
+            common[(ord(bigram[0]) - ord('a')) * 26 + ord(bigram[1]) - ord('a')] = True
+        return common
+    
+    def _bigram_scores_from_counts(self, counts: 'numpy.ndarray',
+                                   totals: 'numpy.ndarray') -> 'numpy.ndarray':
+        """Bigram scores from per-row common bigram and bigram counts."""
+        import numpy as np
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            percentage = counts / totals * 100
+        optimal = self.profile['bigrams_percent']
+        scores = np.clip(100.0 - np.minimum(np.abs(percentage - optimal) * 6, 100.0), 0.0, 100.0)
+        return np.where(totals > 0, scores, 0.0)
+    
+    def score_many(self, texts: Iterable[str],
+                   weights: Optional[Dict[str, float]] = None) -> 'numpy.ndarray':
+        """
+        analyze_text over a batch of texts, scored together: ASCII texts
+        (without NUL) are encoded into one buffer and every statistical
+        score is computed with array operations across the batch, word
+        scores from one set lookup per distinct word of the batch. Other
+        texts are scored one by one. Scores equal analyze_text up to float
+        rounding.
+        Returns: structured array with one 0-100 float field per method
+        and 'combined', one row per text
+        """
+        import numpy as np
+        
+        texts = list(texts)
+        fields = self.STATISTICAL_METHODS + self.WORD_METHODS
+        scores = np.zeros(len(texts), dtype=[(field, 'f8') for field in fields + ('combined',)])
+        
+        batched = [text.isascii() and '\0' not in text for text in texts]
+        batch = [row for row, is_batched in enumerate(batched) if is_batched]
+        for row, text in enumerate(texts):
+            if not batched[row]:
+                method_scores = self._method_scores(self.features(text))
+                scores[row] = tuple(method_scores[field] for field in fields) + (0.0,)
+        if batch:
+            batch_scores = self._ascii_method_scores([texts[row] for row in batch])
+            for field in fields:
+                scores[field][batch] = batch_scores[field]
+        
+        # Same weighted average as _weighted_score, row-wise
+        if weights is None:
+            weights = self.DEFAULT_WEIGHTS
+        total_weight = sum(weights.values())
+        combined = np.zeros(len(texts))
+        for method, weight in weights.items():
+            if method in fields:
+                combined += scores[method] * weight
+        if total_weight > 0:
+            combined /= total_weight
+        scores['combined'] = np.clip(combined, 0.0, 100.0)
+        return scores
+    
+    def _ascii_method_scores(self, texts: List[str]) -> Dict[str, 'numpy.ndarray']:
+        """Scores of every method for a batch of ASCII texts, one array per method."""
+        import numpy as np
+        
+        count = len(texts)
+        lengths = np.fromiter(map(len, texts), dtype=np.intp, count=count)
+        codes = np.frombuffer(''.join(texts).encode('ascii'), dtype=np.uint8)
+        folded = codes | 0x20
+        is_letter = (folded >= ord('a')) & (folded <= ord('z'))
+        letters = (folded[is_letter] - ord('a')).astype(np.intp)
+        rows = np.repeat(np.arange(count), lengths)[is_letter]
+        
+        histograms = np.bincount(rows * 26 + letters, minlength=count * 26).reshape(count, 26)
+        letter_totals = histograms.sum(axis=1)
+        
+        # Bigrams span non-letters but not text boundaries
+        same_text = rows[:-1] == rows[1:]
+        common = self._common_bigram_table()[(letters[:-1] * 26 + letters[1:])[same_text]]
+        common_counts = np.bincount(rows[:-1][same_text], weights=common, minlength=count)
+        
+        scores = {
+            'frequency': self._frequency_scores_from_histograms(histograms),
+            'bigrams': self._bigram_scores_from_counts(common_counts,
+                                                       np.maximum(letter_totals - 1, 0)),
+            'entropy': self._entropy_scores_from_histograms(histograms),
+        }
+        
+        # Texts are split apart after one translate of the whole batch
+        separated = '\0'.join(texts).translate(_BATCH_WORD_TABLE).split('\0')
+        word_lists = [text.split() for text in separated]
+        word_totals = np.fromiter(map(len, word_lists), dtype=np.intp, count=count)
+        word_rows = np.repeat(np.arange(count), word_totals)
+        batch_words = [word for word_list in word_lists for word in word_list]
+        vocabulary = set(batch_words)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            for method in self.WORD_METHODS:
+                words = self.stopwords if method == 'stopwords' else self.dictionary
+                known = {word for word in vocabulary if word in words}
+                is_known = np.fromiter(map(known.__contains__, batch_words), dtype=bool,
+                                       count=len(batch_words))
+                hits = np.bincount(word_rows, weights=is_known, minlength=count)
+                percentage = hits / word_totals * 100
+                if method == 'stopwords':
+                    # Same mapping as _stopwords_score_from_counts
+                    optimal = self.profile['stopwords_percent']
+                    percentage = 100.0 - np.minimum(np.abs(percentage - optimal) * 3, 100.0)
+                scores[method] = np.where(word_totals > 0, np.clip(percentage, 0.0, 100.0), 0.0)
+        return scores
+    
+    def _weighted_score(self, scores: Dict[str, float],
+                        weights: Optional[Dict[str, float]] = None) -> float:
+        """Weighted average of individual method scores. Returns: 0-100"""
+        if weights is None:
+            weights = self.DEFAULT_WEIGHTS
+        
+        # Calculate weighted average
+        total_weight = sum(weights.values())
+        weighted_score = 0.0
+        
+        for method, weight in weights.items():
+            if method in scores:
+                weighted_score += scores[method] * weight
+        
+        # Normalize by total weight
+        if total_weight > 0:
+            weighted_score /= total_weight
+        
+        return max(0.0, min(100.0, weighted_score))
+    
+    def _stopwords_score_from_counts(self, stopword_count: int, total_words: int) -> float:
+        """Stopwords score from the number of stopwords among total_words."""
+        if not total_words:
+            return 0.0
+        
+        percentage = (stopword_count / total_words) * 100
+        
+        # Optimal stopword percentage (English: ~20-30%)
+        optimal = self.profile['stopwords_percent']
+        score = 100.0 - min(abs(percentage - optimal) * 3, 100.0)
+        
+        return max(0.0, min(100.0, score))
+    
+    def _dictionary_score_from_counts(self, dict_count: int, total_words: int) -> float:
+        """Dictionary score from the number of known words among total_words."""
+        if not total_words:
             return 0.0
         
-        total = len(letters)
-        counter = Counter(letters)
+        score = (dict_count / total_words) * 100
+        
+        return max(0.0, min(100.0, score))
+    
+    def _frequency_score_from_counts(self, counter: Dict[str, int], total: int) -> float:
+        """Frequency score from a lowercase letter histogram."""
+        if not total:
+            return 0.0
         
         # Calculate chi-square like score
         chi_square = 0.0
-        for letter, expected_percent in self.english_frequencies.items():
+        for letter, expected_percent in self.letter_frequencies.items():
             observed_count = counter.get(letter, 0)
             expected_count = total * (expected_percent / 100)
             
@@ -135,56 +835,33 @@ class TextScorer:
         
         return max(0.0, min(100.0, score))
     
-    def score_bigrams(self, text: str) -> float:
-        """
-        Score based on common bigrams.
-        Returns: 0-100
-        """
-        # Clean text: keep only letters and convert to lowercase
-        cleaned = ''.join(char.lower() for char in text if char.isalpha())
-        
-        if len(cleaned) < 2:
+    def _bigrams_score_from_counts(self, common_count: int, total_bigrams: int) -> float:
+        """Bigram score from the number of common bigrams among total_bigrams."""
+        if total_bigrams < 1:
             return 0.0
         
-        # Count common bigrams
-        common_count = 0
-        for i in range(len(cleaned) - 1):
-            bigram = cleaned[i:i+2]
-            if bigram in self.common_bigrams:
-                common_count += 1
-        
         # Calculate percentage
-        total_bigrams = len(cleaned) - 1
         percentage = (common_count / total_bigrams) * 100
         
         # Optimal is around 10-15% for English
-        optimal = 12.5
+        optimal = self.profile['bigrams_percent']
         score = 100.0 - min(abs(percentage - optimal) * 6, 100.0)
         
         return max(0.0, min(100.0, score))
     
-    def score_entropy(self, text: str) -> float:
-        """
-        Score based on character entropy.
-        English has entropy ~4.07 bits/character.
-        Returns: 0-100
-        """
-        letters = [char.lower() for char in text if char.isalpha()]
-        
-        if len(letters) < 10:  # Need enough text for meaningful entropy
+    def _entropy_score_from_counts(self, counts: Iterable[int], total: int) -> float:
+        """Entropy score from letter counts (summed in the given order)."""
+        if total < 10:  # Need enough text for meaningful entropy
             return 50.0
         
-        total = len(letters)
-        counter = Counter(letters)
-        
         # Calculate Shannon entropy
         entropy = 0.0
-        for count in counter.values():
+        for count in counts:
             probability = count / total
             entropy -= probability * math.log2(probability)
         
         # English entropy is ~4.07 bits/character
-        optimal_entropy = 4.07
+        optimal_entropy = self.profile['entropy_bits']
         entropy_diff = abs(entropy - optimal_entropy)
         
         # Convert to score
@@ -197,43 +874,6 @@ class TextScorer:
         
         return max(0.0, min(100.0, score))
     
-    def combined_score(self, text: str, weights: Optional[Dict[str, float]] = None) -> float:
-        """
-        Combined score using all methods with weights.
-        Returns: 0-100
-        """
-        if weights is None:
-            weights = {
-                'stopwords': 0.30,    # Most important for short texts
-                'dictionary': 0.25,   # Important for word recognition
-                'frequency': 0.20,    # Good for longer texts
-                'bigrams': 0.15,      # Good for text structure
-                'entropy': 0.10       # Good for randomness detection
-            }
-        
-        # Calculate individual scores
-        scores = {
-            'stopwords': self.score_stopwords(text),
-            'dictionary': self.score_dictionary(text),
-            'frequency': self.score_frequency(text),
-            'bigrams': self.score_bigrams(text),
-            'entropy': self.score_entropy(text)
-        }
-        
-        # Calculate weighted average
-        total_weight = sum(weights.values())
-        weighted_score = 0.0
-        
-        for method, weight in weights.items():
-            if method in scores:
-                weighted_score += scores[method] * weight
-        
-        # Normalize by total weight
-        if total_weight > 0:
-            weighted_score /= total_weight
-        
-        return max(0.0, min(100.0, weighted_score))
-    
     def _extract_words(self, text: str) -> List[str]:
         """Extract words from text (letters only, converted to lowercase)."""
         words = []
@@ -252,15 +892,57 @@ class TextScorer:
         
         return words
     
-    def analyze_text(self, text: str) -> Dict[str, float]:
+    def analyze_text(self, text: TextInput) -> Dict[str, float]:
         """
         Return detailed analysis of text scores.
         """
-        return {
-            'stopwords': self.score_stopwords(text),
-            'dictionary': self.score_dictionary(text),
-            'frequency': self.score_frequency(text),
-            'bigrams': self.score_bigrams(text),
-            'entropy': self.score_entropy(text),
-            'combined': self.combined_score(text)
-        }
\ No newline at end of file
+        scores = self._method_scores(self.features(text))
+        scores['combined'] = self._weighted_score(scores)
+        return scores
+    
+    def available_languages(self) -> List[str]:
+        """Languages with data in this scorer's data directory (analysis.languages)."""
+        return languages.available_languages(self.data_dir)
+    
+    def for_language(self, language: str) -> 'TextScorer':
+        """
+        Scorer of another language on the same data directory and options,
+        loaded on first use and cached (shared by all the scorers it returns).
+        """
+        scorer = self._language_scorers.get(language)
+        if scorer is None:
+            scorer = TextScorer(self.data_dir, self._use_snapshot, self._dictionary_backend, language)
+            scorer._language_scorers = self._language_scorers
+            self._language_scorers[language] = scorer
+        return scorer
+    
+    def score_languages(self, text: TextInput, candidates: Optional[Iterable[str]] = None,
+                        weights: Optional[Dict[str, float]] = None) -> Dict[str, float]:
+        """
+        combined_score of a text under each candidate language (default:
+        all available), from one feature pass shared by every language.
+        Returns: {language: 0-100 score}, best first
+        """
+        features = self.features(text)
+        scores = {language: self.for_language(language).combined_score(features, weights)
+                  for language in candidates or self.available_languages()}
+        return dict(sorted(scores.items(), key=lambda item: item[1], reverse=True))
+    
+    def rank_languages(self, ciphertext: TextInput, candidates: Optional[Iterable[str]] = None,
+                       weights: Optional[Dict[str, float]] = None) -> List[Tuple[str, int, float]]:
+        """
+        Best Caesar key of a ciphertext under each candidate language
+        (default: all available). The ciphertext is scanned once: every
+        language ranks the keys from the same features (see rank_shifts for
+        a TextFeatures argument).
+        Returns: (language, key, score) per language, best score first
+        """
+        if not isinstance(ciphertext, TextFeatures):
+            ciphertext = TextFeatures.from_text(CaesarCipher.decrypt(ciphertext, 0))
+        best = []
+        for language in candidates or self.available_languages():
+            ranked = self.for_language(language).rank_shifts(ciphertext, weights)
+            if ranked:
+                best.append((language,) + ranked[0])
+        best.sort(key=lambda item: item[2], reverse=True)
+        return best
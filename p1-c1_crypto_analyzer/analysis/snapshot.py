@@ -0,0 +1,70 @@
+# analysis/snapshot.py - Versioned binary snapshots of data tables
+"""
+Binary snapshots of tables parsed from data/ text files.
+
+A snapshot is a marshal dump of (header, payload). The header records the
+snapshot format, the marshal version and the (name, mtime_ns, size) of
+every source file, so editing a source file, upgrading the format or
+changing Python invalidates it. Snapshots live in data/.snapshots/ (not
+versioned) and are rebuilt on demand.
+"""
+import marshal
+import os
+from pathlib import Path
+from typing import Any, Iterable, Optional, Tuple
+
+SNAPSHOT_FORMAT = 1
+SNAPSHOT_DIR = ".snapshots"
+
+
+def snapshot_path(data_dir, name: str) -> Path:
+    """Path of a named snapshot inside a data directory."""
+    return Path(data_dir) / SNAPSHOT_DIR / f"{name}.marshal"
+
+
+def source_signature(sources: Iterable[Path]) -> Optional[Tuple]:
+    """(name, mtime_ns, size) of every source file, or None if one is missing."""
+    signature = []
+    for source in sources:
+        try:
+            stat = os.stat(source)
+        except OSError:
+            return None
+        signature.append((Path(source).name, stat.st_mtime_ns, stat.st_size))
+    return tuple(signature)
+
+
+def _header(signature: Tuple) -> Tuple:
+    return (SNAPSHOT_FORMAT, marshal.version, signature)
+
+
+def load_snapshot(path: Path, signature: Tuple) -> Optional[Any]:
+    """Payload of a snapshot, or None if it is missing, stale or unreadable."""
+    try:
+        with open(path, 'rb') as f:
+            header, payload = marshal.loads(f.read())
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+    if header != _header(signature):
+        return None
+    return payload
+
+
+def save_snapshot(path: Path, signature: Tuple, payload: Any) -> bool:
+    """
+    Write a snapshot atomically (marshal-compatible payload only).
+    Returns False when the data directory is not writable.
+    """
+    temporary = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        path.parent.mkdir(exist_ok=True)
+        with open(temporary, 'wb') as f:
+            f.write(marshal.dumps((_header(signature), payload)))
+        os.replace(temporary, path)
+    except OSError:
+        try:
+            os.unlink(temporary)
+        except OSError:
+            pass
+        return False
+    return True
@@ -0,0 +1,111 @@
+# analysis/word_index.py - Word lists indexed by shift-invariant shape
+"""
+Word lists indexed by the shape of each word under Caesar shifts.
+
+A word's shape is the word rotated so that its first letter becomes 'a'
+("hello" -> "axeeh"): it only depends on the differences between letters,
+so a word and all 25 of its encryptions share it. Each shape maps to the
+offsets (first letter - 'a') of the list words with that shape, as a bit
+mask, so looking a ciphertext word up once tells every key under which it
+decrypts to a list word.
+"""
+import string
+from typing import Dict, Iterable, List, Mapping
+
+from crypto.caesar import CaesarCipher
+
+_LOWERCASE = string.ascii_lowercase
+
+# _SHAPE_TABLES[offset] rotates lowercase letters back by offset
+_SHAPE_TABLES = tuple(
+    str.maketrans(_LOWERCASE, _LOWERCASE[-offset:] + _LOWERCASE[:-offset]) if offset
+    else {}
+    for offset in range(26)
+)
+
+# Every character that may appear in an indexable word
+_NON_LETTERS = str.maketrans('', '', _LOWERCASE + ' ')
+
+
+def word_shapes(words: Iterable[str]) -> Dict[str, int]:
+    """
+    Shape of every lowercase ASCII word of a list, mapped to the bit mask
+    of the first-letter offsets (1 << offset) of the list words sharing it.
+    """
+    # Words grouped by first letter, each group rotated with one translate
+    groups: Dict[str, List[str]] = {}
+    for word in words:
+        if word.isascii() and word.isalpha() and word.islower():
+            groups.setdefault(word[0], []).append(word)
+
+    shapes: Dict[str, int] = {}
+    for first, group in groups.items():
+        offset = ord(first) - ord('a')
+        for shape in ' '.join(group).translate(_SHAPE_TABLES[offset]).split(' '):
+            shapes[shape] = shapes.get(shape, 0) | 1 << offset
+    return shapes
+
+
+class ShiftIndex:
+    """
+    Index of a word list by shape, answering for all 26 keys at once how
+    many words of a text decrypt to a list word.
+
+    Only lowercase ASCII words can be the decryption of a letter run, so
+    other entries of the list are left out of the index. Subclasses may
+    store the shapes elsewhere by overriding mask().
+    """
+
+    def __init__(self, words: Iterable[str]):
+        self.shapes = word_shapes(words)
+
+    def __len__(self) -> int:
+        return sum(bin(mask).count('1') for mask in self.shapes.values())
+
+    def mask(self, shape: str) -> int:
+        """Bit mask of the first-letter offsets of the list words with this shape."""
+        return self.shapes.get(shape, 0)
+
+    def hits(self, word_counts: Mapping[str, int]) -> List[int]:
+        """
+        Number of word occurrences that decrypt to a list word, for each
+        key 0-25: hits[k] == sum of the counts of the words w with
+        CaesarCipher.decrypt(w, k) in the list.
+        """
+        joined = ' '.join(word_counts)
+        if joined.isascii() and not joined.translate(_NON_LETTERS):
+            indexed = word_counts
+            hits = [0] * 26
+        else:
+            # Only the words that are not lowercase ASCII take the per-key path
+            indexed = {}
+            others = {}
+            for word, count in word_counts.items():
+                if word.isascii() and word.isalpha() and word.islower():
+                    indexed[word] = count
+                else:
+                    others[word] = count
+            hits = self._hits_by_key(others)
+
+        mask_of = self.mask
+        for word, count in indexed.items():
+            offset = ord(word[0]) - ord('a')
+            mask = mask_of(word.translate(_SHAPE_TABLES[offset]))
+            while mask:
+                # decrypt(word, k) starts with chr(ord('a') + offset - k)
+                word_offset = (mask & -mask).bit_length() - 1
+                hits[(offset - word_offset) % 26] += count
+                mask &= mask - 1
+        return hits
+
+    def _hits_by_key(self, word_counts: Mapping[str, int]) -> List[int]:
+        """Reference computation, used for the words that are not lowercase ASCII letters."""
+        hits = [0] * 26
+        for word, count in word_counts.items():
+            for key in range(26):
+                shifted = CaesarCipher.decrypt(word, key)
+                if shifted and shifted.isascii() and shifted.isalpha() and shifted.islower():
+                    offset = ord(shifted[0]) - ord('a')
+                    if self.mask(shifted.translate(_SHAPE_TABLES[offset])) >> offset & 1:
+                        hits[key] += count
+        return hits
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Benchmark du moteur de chiffrement César - Projet P1-C1
+Compare la boucle caractère par caractère historique au moteur par tables
+de translation (str.translate) et affiche le débit en MB/s.
+
+Usage:
+  python benchmarks/bench_caesar.py [--size-mb 4] [--repeat 3]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Ajouter la racine du projet au path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from crypto.caesar import CaesarCipher
+
+
+def reference_encrypt(plaintext: str, key: int) -> str:
+    """Implémentation historique (boucle Python), conservée comme référence."""
+    key = CaesarCipher.validate_key(key)
+    result = []
+    for char in plaintext:
+        if char.isalpha():
+            base = ord('A') if char.isupper() else ord('a')
+            original_pos = ord(char) - base
+            new_pos = (original_pos + key) % 26
+            result.append(chr(new_pos + base))
+        else:
+            result.append(char)
+    return ''.join(result)
+
+
+def build_corpus(size_mb: float) -> str:
+    """Construit un texte d'environ size_mb mégaoctets à partir de l'échantillon."""
+    sample_file = Path(__file__).parent.parent / "data" / "samples" / "sample_plain.txt"
+    sample = sample_file.read_text(encoding='utf-8')
+    target = int(size_mb * 1024 * 1024)
+    return (sample * (target // len(sample) + 1))[:target]
+
+
+def measure(func, text: str, key: int, repeat: int) -> float:
+    """Retourne le meilleur temps (secondes) sur `repeat` exécutions."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(text, key)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark du chiffrement César")
+    parser.add_argument("--size-mb", type=float, default=4.0,
+                        help="Taille du texte de test en MB (défaut: 4)")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="Nombre de répétitions par mesure (défaut: 3)")
+    args = parser.parse_args()
+    
+    text = build_corpus(args.size_mb)
+    size_mb = len(text.encode('utf-8')) / (1024 * 1024)
+    key = 7
+    
+    if CaesarCipher.encrypt(text, key) != reference_encrypt(text, key):
+        print("❌ Les deux implémentations divergent", file=sys.stderr)
+        return 1
+    
+    loop_time = measure(reference_encrypt, text, key, args.repeat)
+    table_time = measure(CaesarCipher.encrypt, text, key, args.repeat)
+    
+    print(f"Texte:               {size_mb:.2f} MB")
+    print(f"Boucle Python:       {size_mb / loop_time:10.1f} MB/s")
+    print(f"Tables translate:    {size_mb / table_time:10.1f} MB/s")
+    print(f"Gain:                {loop_time / table_time:10.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
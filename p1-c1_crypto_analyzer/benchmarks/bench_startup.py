@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Benchmark du démarrage de crack_caesar - Projet P1-C1
+Mesure le temps d'exécution complet de la CLI (meilleur de N lancements,
+interpréteur nu déduit) et vérifie qu'aucun module lourd n'est importé.
+Échoue (code 1) si le budget est dépassé.
+
+Usage:
+  python benchmarks/bench_startup.py [--runs 15] [--budget-ms 60]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+CLI = PROJECT_ROOT / "cli" / "crack_caesar.py"
+SAMPLE = PROJECT_ROOT / "test_message.txt"
+
+# Modules qui ne doivent être importés qu'à la demande
+HEAVY_MODULES = ("concurrent.futures", "multiprocessing", "numpy", "json", "glob")
+
+# Analyse complète dans un interpréteur neuf, puis liste des modules lourds chargés
+LEAK_CHECK = f"""
+import sys
+sys.path.insert(0, {str(PROJECT_ROOT)!r})
+from cli import crack_caesar as main
+main(["--input", {str(SAMPLE)!r}, "--quiet"])
+print("HEAVY:" + ",".join(name for name in {HEAVY_MODULES!r} if name in sys.modules))
+"""
+
+
+def best_time(command, runs: int, env) -> float:
+    """Meilleur temps (secondes) de `runs` lancements de la commande."""
+    best = float('inf')
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(command, env=env, stdout=subprocess.DEVNULL,
+                       stderr=subprocess.DEVNULL, check=True)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark du démarrage de la CLI")
+    parser.add_argument("--runs", type=int, default=15,
+                        help="Nombre de lancements par mesure (défaut: 15)")
+    parser.add_argument("--budget-ms", type=float, default=60.0,
+                        help="Budget au-delà de l'interpréteur nu, en ms (défaut: 60)")
+    args = parser.parse_args()
+
+    # Mesurer le cas réel: bytecode en cache (PYTHONDONTWRITEBYTECODE ignoré)
+    env = dict(os.environ)
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+
+    analyze = [sys.executable, str(CLI), "--input", str(SAMPLE), "--quiet"]
+    subprocess.run(analyze, env=env, stdout=subprocess.DEVNULL, check=True)  # préchauffage
+
+    bare = best_time([sys.executable, "-c", "pass"], args.runs, env)
+    help_time = best_time([sys.executable, str(CLI), "--help"], args.runs, env)
+    analyze_time = best_time(analyze, args.runs, env)
+    overhead_ms = (analyze_time - bare) * 1000
+
+    output = subprocess.run([sys.executable, "-c", LEAK_CHECK], env=env, check=True,
+                            capture_output=True, text=True).stdout
+    leaked = output.rsplit("HEAVY:", 1)[-1].strip()
+
+    print(f"Interpréteur nu:     {bare * 1000:7.1f} ms")
+    print(f"crack_caesar --help: {help_time * 1000:7.1f} ms")
+    print(f"Analyse complète:    {analyze_time * 1000:7.1f} ms "
+          f"(+{overhead_ms:.1f} ms, budget {args.budget_ms:.0f} ms)")
+    print(f"Modules lourds:      {leaked or 'aucun'}")
+
+    if leaked:
+        print(f"❌ Modules lourds importés au démarrage: {leaked}")
+        return 1
+    if overhead_ms > args.budget_ms:
+        print("❌ Budget de démarrage dépassé")
+        return 1
+    print("✅ Budget de démarrage respecté")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,21 +5,31 @@ Système Intelligent de Déchiffrement Automatique
 """
 
 import argparse
-import json
+import io
 import sys
 import os
+import time
 from pathlib import Path
+from typing import Iterator, List
 
 # Chemin absolu vers la racine du projet
 PROJECT_ROOT = Path(__file__).parent.parent
 
+# Données livrées avec le paquet, quel que soit le répertoire courant
+DATA_DIR = str(PROJECT_ROOT / "data")
+
 # Ajouter la racine du projet au path
 sys.path.insert(0, str(PROJECT_ROOT))
 
 from analysis.combined_analyzer import CombinedAnalyzer
+from crypto.caesar import CaesarCipher
 
 
-def main():
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] == "batch":
+        return _run_batch_mode(argv[1:])
+    
     parser = argparse.ArgumentParser(
         description="Outil de Cryptanalyse César Intelligent - Déchiffrement Automatique P1-C1",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -31,15 +41,23 @@ Exemples d'utilisation P1-C1:
   %(prog)s --input cipher.txt --find-flag        # Recherche de drapeau
   %(prog)s --input cipher.txt --verbose          # Sortie détaillée
   %(prog)s --input cipher.txt --complexity       # Analyse de complexité
+  %(prog)s --input logs.txt --encrypt 7 --output logs.enc   # Chiffrement en flux
+  %(prog)s --input logs.enc --decrypt 7 --output logs.txt   # Déchiffrement en flux
+  %(prog)s --input dump.enc --mmap --jobs 8 --output dump.txt  # Fichier de plusieurs Go
+  %(prog)s batch intercepts/ --jobs 8 --output results.ndjson  # Analyse par lots
+  cat cipher.txt | %(prog)s --input -            # Lecture sur l'entrée standard
+  tail -f feed.log | %(prog)s --input - --lines  # Un texte chiffré par ligne (NDJSON)
         """
     )
     
     # Arguments Entrée/Sortie
     input_group = parser.add_argument_group('Entrée/Sortie')
     input_group.add_argument("--input", "-i", required=True,
-                           help="Fichier contenant le texte chiffré")
+                           help="Fichier contenant le texte chiffré (- pour l'entrée standard)")
     input_group.add_argument("--output", "-o", 
                            help="Fichier de sortie pour résultats JSON")
+    input_group.add_argument("--cache", metavar="CHEMIN",
+                           help="Cache SQLite des résultats (réutilisé entre exécutions)")
     
     # Options d'analyse intelligente
     analysis_group = parser.add_argument_group('Options d\'Analyse Intelligente')
@@ -49,9 +67,34 @@ Exemples d'utilisation P1-C1:
                               help="Rechercher automatiquement le pattern FLAG{...}")
     analysis_group.add_argument("--flag-file", default="flag.txt",
                               help="Fichier pour sauvegarder le drapeau (défaut: flag.txt)")
+    analysis_group.add_argument("--lang", default="en", metavar="LANGUE",
+                               help="Langue du texte clair: en (défaut), fr... ou auto "
+                                    "(détectée pour chaque texte)")
     analysis_group.add_argument("--complexity", "-c", action="store_true",
                               help="Analyser la complexité linguistique du texte")
     
+    # Mode flux: chiffrement/déchiffrement fichier à fichier à mémoire constante
+    stream_group = parser.add_argument_group('Mode Flux (fichiers volumineux)')
+    stream_mode = stream_group.add_mutually_exclusive_group()
+    stream_mode.add_argument("--encrypt", type=int, metavar="CLÉ",
+                             help="Chiffrer l'entrée avec CLÉ vers --output (ou stdout)")
+    stream_mode.add_argument("--decrypt", type=int, metavar="CLÉ",
+                             help="Déchiffrer l'entrée avec CLÉ vers --output (ou stdout)")
+    stream_mode.add_argument("--mmap", action="store_true",
+                             help="Analyser le fichier projeté en mémoire sur plusieurs processus, "
+                                  "puis déchiffrer en flux avec la meilleure clé vers --output (ou stdout)")
+    stream_group.add_argument("--chunk-size", type=int, default=CaesarCipher.STREAM_CHUNK_SIZE,
+                              help="Taille des blocs lus en mode flux (défaut: 1 Mio)")
+    stream_group.add_argument("--jobs", "-j", type=int, default=None,
+                              help="Processus de comptage pour --mmap (défaut: nombre de cœurs)")
+    
+    # Mode lignes: un texte chiffré par ligne, une réponse NDJSON par ligne
+    lines_group = parser.add_argument_group('Mode Lignes (tubes et flux continus)')
+    lines_group.add_argument("--lines", action="store_true",
+                             help="Analyser chaque ligne de l'entrée séparément (NDJSON)")
+    lines_group.add_argument("--plaintext", action="store_true",
+                             help="Inclure le texte déchiffré complet à chaque ligne")
+    
     # Format de sortie
     output_group = parser.add_argument_group('Format de Sortie')
     output_group.add_argument("--json", action="store_true",
@@ -61,20 +104,48 @@ Exemples d'utilisation P1-C1:
     output_group.add_argument("--quiet", "-q", action="store_true",
                             help="Supprimer toute sortie sauf les résultats")
     
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
+    _check_language(parser, args, allow_auto=not args.mmap)
+    if args.mmap and args.top < 1:
+        parser.error("--top doit être positif avec --mmap (la meilleure clé est déchiffrée)")
+    if args.jobs is not None and args.jobs < 1:
+        parser.error("--jobs doit être positif")
     
-    # Résoudre le chemin du fichier d'entrée
+    # Résoudre le chemin du fichier d'entrée ("-": entrée standard)
     input_path = Path(args.input)
-    if not input_path.is_absolute():
+    if args.input == "-":
+        input_path = None
+    elif not input_path.is_absolute():
         # Essayer relatif au répertoire courant d'abord
         if not input_path.exists():
             # Essayer relatif à la racine du projet
             input_path = PROJECT_ROOT / args.input
     
+    if args.encrypt is not None or args.decrypt is not None:
+        return _run_stream_mode(args, input_path)
+    if args.mmap:
+        return _run_mmap_mode(args, input_path)
+    
+    # Le cache SQLite est fermé en sortie (point de contrôle du journal WAL)
+    cache = _open_cache(args)
+    try:
+        if args.lines:
+            return _run_lines_mode(args, input_path, cache)
+        return _run_single_mode(args, input_path, cache)
+    finally:
+        if cache is not None:
+            cache.close()
+
+
+def _run_single_mode(args, input_path, cache=None) -> int:
+    """Analyse d'un seul texte chiffré (fichier ou stdin) avec rapport détaillé."""
     # Lire le fichier d'entrée
     try:
-        with open(input_path, 'r', encoding='utf-8') as f:
-            ciphertext = f.read().strip()
+        if input_path is None:
+            ciphertext = sys.stdin.read().strip()
+        else:
+            with open(input_path, 'r', encoding='utf-8') as f:
+                ciphertext = f.read().strip()
     except FileNotFoundError:
         print(f"❌ Erreur: Fichier '{args.input}' non trouvé aux emplacements:", file=sys.stderr)
         print(f"   • Chemin relatif: {Path(args.input).absolute()}", file=sys.stderr)
@@ -90,7 +161,9 @@ Exemples d'utilisation P1-C1:
         return 1
     
     # Initialiser l'analyseur intelligent
-    analyzer = CombinedAnalyzer()
+    analyzer = _make_analyzer(args, cache)
+    if args.lang == "auto":
+        analyzer = _analyzer_for_text(analyzer, ciphertext)
     
     if not args.quiet:
         print("🔐 CRYPTANALYSE CÉSAR INTELLIGENTE - P1-C1")
@@ -100,6 +173,8 @@ Exemples d'utilisation P1-C1:
         print(f"Longueur texte:    {len(ciphertext)} caractères")
         print(f"Lettres:           {sum(1 for c in ciphertext if c.isalpha())}")
         print(f"Mode d'analyse:    Scoring linguistique intelligent")
+        print(f"Langue:            {analyzer.scorer.language}"
+              + (" (détectée)" if args.lang == "auto" else ""))
         print("-" * 60)
     
     # Analyser la complexité si demandé
@@ -124,10 +199,14 @@ Exemples d'utilisation P1-C1:
         print()
     
     # Effectuer l'analyse cryptographique
-    results = analyzer.analyze_caesar(ciphertext, args.top)
+    # --find-flag: recherche directe du crib FLAG{ sous les 25 clés avant tout scoring
+    crib = CombinedAnalyzer.FLAG_CRIB if args.find_flag else None
+    results = analyzer.analyze_caesar(ciphertext, args.top, crib=crib)
     
     # Sortir les résultats
     if args.json:
+        import json
+        
         output_data = results
         
         if args.output:
@@ -153,6 +232,9 @@ Exemples d'utilisation P1-C1:
             if flag_found:
                 flag = analyzer.find_flag(results)
                 print(f"\n🚩 DRAPEAU TROUVÉ: {flag}")
+                match = results.get('crib_match')
+                if match:
+                    print(f"   Trouvé directement: clé {match['key']}, position {match['offset']}")
                 print(f"✅ Sauvegardé dans: {args.flag_file}")
             else:
                 print("\n⚠️  Aucun pattern FLAG{...} trouvé dans les meilleures solutions")
@@ -163,10 +245,18 @@ Exemples d'utilisation P1-C1:
         print(f"\n📊 STATISTIQUES INTELLIGENTES:")
         print(f"   Temps d'analyse:    {stats.get('analysis_time_seconds', 0):.3f}s")
         print(f"   Hypothèses testées: {stats.get('total_hypotheses', 0)}")
+        if 'cache_hit' in stats:
+            print(f"   Cache:              {'✅ résultat réutilisé' if stats['cache_hit'] else 'résultat enregistré'}")
         print(f"   Plage des scores:   {stats.get('score_range', (0, 0))[0]:.1f} - {stats.get('score_range', (0, 0))[1]:.1f}")
         print(f"   Score moyen:        {stats.get('mean_score', 0):.1f}")
         print(f"   Écart-type:         {stats.get('std_deviation', 0):.1f}")
         print(f"   Écart de confiance: {stats.get('confidence_gap', 0):.1f}")
+        
+        if args.verbose and stats.get('stage_timings_ns'):
+            print(f"\n⏱️  TEMPS PAR ÉTAPE:")
+            for stage, duration in sorted(stats['stage_timings_ns'].items(),
+                                          key=lambda item: item[1], reverse=True):
+                print(f"   {stage:<20} {duration / 1e6:8.3f} ms")
     
     if not args.quiet:
         print("\n" + "=" * 60)
@@ -175,6 +265,346 @@ Exemples d'utilisation P1-C1:
     return 0
 
 
+def _open_cache(args):
+    """ResultCache de --cache (None sans --cache), à fermer par l'appelant."""
+    if not args.cache:
+        return None
+    from analysis.cache import ResultCache
+    
+    return ResultCache(args.cache)
+
+
+def _make_analyzer(args, cache=None) -> CombinedAnalyzer:
+    """
+    Analyseur de la CLI, dans la langue de --lang (anglais pour auto) et
+    avec le cache de résultats ouvert par _open_cache.
+    """
+    language = "en" if args.lang == "auto" else args.lang
+    return CombinedAnalyzer(DATA_DIR, cache=cache, language=language)
+
+
+def _check_language(parser: argparse.ArgumentParser, args, allow_auto: bool = True) -> None:
+    """Refuse (erreur argparse) une langue sans données dans DATA_DIR."""
+    from analysis.languages import available_languages
+    
+    # Même répertoire de données que les analyseurs de la CLI
+    available = available_languages(DATA_DIR)
+    if args.lang == "auto" and allow_auto:
+        return
+    if args.lang not in available:
+        choices = ", ".join(available + (["auto"] if allow_auto else []))
+        parser.error(f"langue inconnue '{args.lang}' (disponibles: {choices})")
+
+
+def _analyzer_for_text(analyzer: CombinedAnalyzer, ciphertext: str) -> CombinedAnalyzer:
+    """Analyseur de la langue détectée pour un texte (--lang auto)."""
+    detected = analyzer.detect_language(ciphertext)
+    return analyzer.for_language(detected[0]['language']) if detected else analyzer
+
+
+def _cache_summary(analyzer: CombinedAnalyzer) -> str:
+    """Résumé des accès au cache pour les messages de fin."""
+    if analyzer.cache is None:
+        return ""
+    stats = analyzer.cache.stats()
+    return f" - cache: {stats['hits']} succès, {stats['misses']} échecs ({stats['hit_rate']:.0%})"
+
+
+def _run_stream_mode(args, input_path: Path) -> int:
+    """
+    Chiffre ou déchiffre l'entrée par blocs vers --output (ou stdout),
+    sans jamais charger le fichier entier en mémoire.
+    """
+    if args.encrypt is not None:
+        return _stream_with_key(args, input_path, CaesarCipher.encrypt_stream, args.encrypt)
+    return _stream_with_key(args, input_path, CaesarCipher.decrypt_stream, args.decrypt)
+
+
+def _stream_with_key(args, input_path: Path, operation, key: int) -> int:
+    """
+    Applique operation (CaesarCipher.encrypt_stream ou decrypt_stream)
+    avec key de l'entrée vers --output (ou stdout).
+    """
+    # newline='' et surrogateescape: le contenu est réécrit à l'identique hors lettres
+    text_options = {'encoding': 'utf-8', 'errors': 'surrogateescape', 'newline': ''}
+    try:
+        if input_path is None:
+            source = io.TextIOWrapper(sys.stdin.buffer, **text_options)
+        else:
+            source = open(input_path, 'r', **text_options)
+        try:
+            if args.output:
+                with open(args.output, 'w', **text_options) as destination:
+                    processed = operation(source, destination, key, args.chunk_size)
+            else:
+                destination = io.TextIOWrapper(sys.stdout.buffer, write_through=True, **text_options)
+                processed = operation(source, destination, key, args.chunk_size)
+                destination.detach()
+        finally:
+            if input_path is None:
+                source.detach()
+            else:
+                source.close()
+    except (OSError, ValueError) as e:
+        print(f"❌ Erreur de traitement du flux: {e}", file=sys.stderr)
+        return 1
+    
+    if not args.quiet:
+        action = "chiffrés" if operation is CaesarCipher.encrypt_stream else "déchiffrés"
+        print(f"✅ {processed} caractères {action} (clé {key})", file=sys.stderr)
+    return 0
+
+
+def _run_mmap_mode(args, input_path) -> int:
+    """
+    Analyse un fichier volumineux sans le lire en mémoire: comptage
+    parallèle sur le fichier projeté (CombinedAnalyzer.analyze_file), puis
+    seul le texte de la meilleure clé est déchiffré en flux vers --output
+    (ou stdout). Le rapport est écrit sur stderr; avec --json, les
+    hypothèses n'ont pas de 'plaintext' (voir CombinedAnalyzer.analyze_file).
+    """
+    if input_path is None:
+        print("❌ Erreur: --mmap nécessite un fichier (pas l'entrée standard)", file=sys.stderr)
+        return 1
+    if args.find_flag:
+        print("❌ Erreur: --find-flag n'est pas disponible avec --mmap", file=sys.stderr)
+        return 1
+    
+    analyzer = CombinedAnalyzer(DATA_DIR, language=args.lang)
+    try:
+        results = analyzer.analyze_file(str(input_path), args.top, workers=args.jobs)
+    except (OSError, ValueError) as e:
+        print(f"❌ Erreur d'analyse du fichier: {e}", file=sys.stderr)
+        return 1
+    
+    best = results['best_solution']
+    stats = results['statistics']
+    metadata = results['metadata']
+    if args.json:
+        import json
+        
+        print(json.dumps(results, indent=2, ensure_ascii=False), file=sys.stderr)
+    elif not args.quiet:
+        megabytes = metadata['file_size'] / 1e6
+        print(f"🎯 Clé {best['key']} (score {best['score']}, confiance {best['confidence']}) - "
+              f"{megabytes:.1f} Mo en {metadata['ranges']} plages sur {metadata['workers']} processus, "
+              f"{stats['analysis_time_seconds']:.2f}s", file=sys.stderr)
+        for solution in results['top_solutions'][1:]:
+            print(f"   clé {solution['key']:<3} score {solution['score']}", file=sys.stderr)
+        if args.verbose:
+            for stage, duration in sorted(stats['stage_timings_ns'].items(),
+                                          key=lambda item: item[1], reverse=True):
+                print(f"   {stage:<20} {duration / 1e6:8.3f} ms", file=sys.stderr)
+    
+    # Même traitement que --decrypt: seul le texte retenu est produit, bloc par bloc
+    return _stream_with_key(args, input_path, CaesarCipher.decrypt_stream, best['key'])
+
+
+def _run_lines_mode(args, input_path, cache=None) -> int:
+    """
+    Analyse chaque ligne de l'entrée (fichier ou stdin) comme un texte
+    chiffré indépendant, avec un seul analyseur chargé une fois. Chaque
+    réponse NDJSON est écrite et vidée dès son analyse terminée, ce qui
+    permet de lire un flux continu (tail -f).
+    """
+    import json
+    
+    analyzer = _make_analyzer(args, cache)
+    crib = CombinedAnalyzer.FLAG_CRIB if args.find_flag else None
+    output = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+    source = sys.stdin if input_path is None else open(input_path, 'r', encoding='utf-8',
+                                                       errors='replace')
+    
+    analyzed = 0
+    start_time = time.perf_counter()
+    try:
+        # readline plutôt que l'itération: pas de lecture anticipée sur un tube
+        for number, line in enumerate(iter(source.readline, ''), 1):
+            ciphertext = line.strip()
+            if not ciphertext:
+                continue
+            line_analyzer = _analyzer_for_text(analyzer, ciphertext) if args.lang == "auto" else analyzer
+            results = line_analyzer.analyze_caesar(ciphertext, args.top, crib=crib)
+            output.write(json.dumps(_result_record(analyzer, {'line': number}, results, args),
+                                    ensure_ascii=False) + "\n")
+            output.flush()
+            analyzed += 1
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if input_path is not None:
+            source.close()
+        if args.output:
+            output.close()
+    
+    if not args.quiet:
+        print(f"✅ {analyzed} lignes analysées en {time.perf_counter() - start_time:.2f}s"
+              + _cache_summary(analyzer), file=sys.stderr)
+    return 0
+
+
+def _run_batch_mode(argv) -> int:
+    """
+    Sous-commande batch: analyse en parallèle des fichiers désignés par des
+    répertoires, motifs glob ou une liste, une ligne JSON compacte par fichier.
+    """
+    parser = argparse.ArgumentParser(
+        prog="crack_caesar.py batch",
+        description="Analyse César par lots - une ligne JSON (NDJSON) par fichier",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Exemples:
+  %(prog)s intercepts/ --jobs 8                  # Tous les fichiers d'un répertoire
+  %(prog)s "captures/**/*.txt" -o results.ndjson  # Motif glob récursif
+  %(prog)s --list fichiers.txt --find-flag       # Liste de chemins (- pour stdin)
+        """
+    )
+    parser.add_argument("inputs", nargs="*",
+                        help="Fichiers, répertoires ou motifs glob")
+    parser.add_argument("--list", "-l", metavar="FICHIER",
+                        help="Fichier listant un chemin par ligne (- pour stdin)")
+    parser.add_argument("--pattern", default="*",
+                        help="Motif des fichiers retenus dans les répertoires (défaut: *)")
+    parser.add_argument("--recursive", "-r", action="store_true",
+                        help="Parcourir les sous-répertoires")
+    parser.add_argument("--jobs", "-j", type=int, default=os.cpu_count() or 1,
+                        help="Nombre de processus d'analyse (défaut: nombre de cœurs)")
+    parser.add_argument("--top", "-t", type=int, default=3,
+                        help="Nombre de clés candidates par fichier (défaut: 3)")
+    parser.add_argument("--ordered", action="store_true",
+                        help="Écrire les résultats dans l'ordre des entrées")
+    parser.add_argument("--find-flag", "-f", action="store_true",
+                        help="Ajouter le drapeau FLAG{...} trouvé à chaque ligne")
+    parser.add_argument("--plaintext", action="store_true",
+                        help="Inclure le texte déchiffré complet à chaque ligne")
+    parser.add_argument("--output", "-o",
+                        help="Fichier NDJSON de sortie (défaut: stdout)")
+    parser.add_argument("--cache", metavar="CHEMIN",
+                        help="Cache SQLite des résultats (réutilisé entre exécutions)")
+    parser.add_argument("--lang", default="en", metavar="LANGUE",
+                        help="Langue du texte clair: en (défaut), fr...")
+    parser.add_argument("--quiet", "-q", action="store_true",
+                        help="Supprimer le résumé de débit")
+    args = parser.parse_args(argv)
+    _check_language(parser, args, allow_auto=False)
+    
+    if not args.inputs and not args.list:
+        parser.error("au moins une entrée ou --list est requis")
+    if args.jobs < 1:
+        parser.error("--jobs doit être positif")
+    
+    cache = _open_cache(args)
+    try:
+        return _analyze_batch(args, cache)
+    finally:
+        if cache is not None:
+            cache.close()
+
+
+def _analyze_batch(args, cache=None) -> int:
+    """Analyse les fichiers de la sous-commande batch et écrit leurs lignes NDJSON."""
+    import json
+    
+    output = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+    analyzer = _make_analyzer(args, cache)
+    
+    paths: List[str] = []    # fichiers lus, dans l'ordre des index de analyze_many
+    totals = {'files': 0, 'bytes': 0, 'errors': 0}
+    
+    def write_record(record: dict) -> None:
+        output.write(json.dumps(record, ensure_ascii=False) + "\n")
+    
+    def ciphertexts() -> Iterator[str]:
+        for path in _expand_batch_inputs(args):
+            try:
+                with open(path, 'rb') as f:
+                    raw = f.read()
+            except OSError as e:
+                totals['errors'] += 1
+                write_record({'file': path, 'error': str(e)})
+                continue
+            
+            text = raw.decode('utf-8', errors='replace').strip()
+            if not text:
+                totals['errors'] += 1
+                write_record({'file': path, 'error': "fichier vide"})
+                continue
+            
+            totals['files'] += 1
+            totals['bytes'] += len(raw)
+            paths.append(path)
+            yield text
+    
+    start_time = time.perf_counter()
+    try:
+        for index, results in analyzer.analyze_many(ciphertexts(), workers=args.jobs,
+                                                    ordered=args.ordered, top_n=args.top,
+                                                    crib=CombinedAnalyzer.FLAG_CRIB if args.find_flag else None):
+            write_record(_result_record(analyzer, {'file': paths[index]}, results, args))
+    finally:
+        if args.output:
+            output.close()
+        else:
+            output.flush()
+    elapsed = time.perf_counter() - start_time
+    
+    if not args.quiet:
+        rate = 1 / elapsed if elapsed > 0 else 0.0
+        print(f"✅ {totals['files']} fichiers ({totals['bytes'] / 1e6:.2f} Mo) en {elapsed:.2f}s - "
+              f"{totals['files'] * rate:.1f} fichiers/s, {totals['bytes'] / 1e6 * rate:.2f} Mo/s"
+              + (f", {totals['errors']} erreurs" if totals['errors'] else "")
+              + _cache_summary(analyzer), file=sys.stderr)
+    return 1 if totals['errors'] and not totals['files'] else 0
+
+
+def _expand_batch_inputs(args) -> Iterator[str]:
+    """Chemins des fichiers à analyser, dans l'ordre des entrées."""
+    entries = list(args.inputs)
+    if args.list:
+        if args.list == "-":
+            entries.extend(line.strip() for line in sys.stdin)
+        else:
+            with open(args.list, 'r', encoding='utf-8') as f:
+                entries.extend(line.strip() for line in f)
+    
+    for entry in entries:
+        if not entry:
+            continue
+        if os.path.isdir(entry):
+            directory = Path(entry)
+            found = directory.rglob(args.pattern) if args.recursive else directory.glob(args.pattern)
+            yield from sorted(str(path) for path in found if path.is_file())
+        elif any(char in entry for char in "*?["):
+            import glob
+            
+            yield from sorted(path for path in glob.glob(entry, recursive=True) if os.path.isfile(path))
+        else:
+            # Fichier (une erreur de lecture sera rapportée dans la sortie)
+            yield entry
+
+
+def _result_record(analyzer: CombinedAnalyzer, origin: dict, results: dict, args) -> dict:
+    """Ligne NDJSON compacte décrivant le résultat d'une entrée (fichier ou ligne)."""
+    best = results['best_solution']
+    stats = results['statistics']
+    record = dict(origin)
+    record.update({
+        'key': best['key'],
+        'score': best['score'],
+        'confidence': best['confidence'],
+        'confidence_gap': round(stats['confidence_gap'], 2),
+        'candidates': [[solution['key'], solution['score']] for solution in results['top_solutions']],
+        'preview': best['preview']
+    })
+    if args.lang != "en":
+        record['language'] = results['metadata']['language']
+    if args.find_flag:
+        record['flag'] = analyzer.find_flag(results)
+    if args.plaintext:
+        record['plaintext'] = best['plaintext']
+    return record
+
+
 def _print_pretty_results(results: dict, verbose: bool = False, top_n: int = 5):
     """Affiche les résultats en format lisible pour humains."""
     best = results.get('best_solution')
@@ -1,6 +1,68 @@
 # crypto/caesar.py - VERSION P1-C1
 import string
-from typing import List, Tuple, Dict, Any
+from functools import lru_cache
+from typing import IO, List, Optional, Tuple, Dict, Any, Union
+
+
+class _ShiftTable(dict):
+    """
+    Table de translation (code point -> code point) pour un décalage donné.
+    
+    Les 128 caractères ASCII sont précalculés. Les autres caractères sont
+    calculés au premier accès puis mémorisés, avec exactement la même
+    arithmétique que l'ancienne boucle caractère par caractère.
+    """
+    
+    def __init__(self, key: int):
+        super().__init__((code, code) for code in range(128))
+        self.key = key
+        for offset in range(26):
+            shifted = (offset + key) % 26
+            self[ord('a') + offset] = ord('a') + shifted
+            self[ord('A') + offset] = ord('A') + shifted
+    
+    def __missing__(self, code: int) -> int:
+        char = chr(code)
+        if char.isalpha():
+            base = ord('A') if char.isupper() else ord('a')
+            result = (code - base + self.key) % 26 + base
+        else:
+            result = code
+        self[code] = result
+        return result
+
+
+def _build_bytes_table(key: int) -> bytes:
+    """Construit la table bytes.translate d'un décalage (lettres ASCII uniquement)."""
+    lower = string.ascii_lowercase
+    upper = string.ascii_uppercase
+    return bytes.maketrans(
+        (lower + upper).encode('ascii'),
+        (lower[key:] + lower[:key] + upper[key:] + upper[:key]).encode('ascii')
+    )
+
+
+# Octets ASCII (supprimés pour isoler les caractères non ASCII d'un texte UTF-8)
+_ASCII_BYTES = bytes(range(128))
+
+
+@lru_cache(maxsize=2)
+def _crib_tables(ignore_case: bool) -> Tuple[bytes, ...]:
+    """
+    Tables bytes.translate qui déchiffrent par chaque clé (0-25), suivies
+    éventuellement d'une mise en minuscules, pour la recherche de crib.
+    """
+    lower = bytes.maketrans(string.ascii_uppercase.encode('ascii'),
+                            string.ascii_lowercase.encode('ascii'))
+    tables = []
+    for key in range(26):
+        table = _build_bytes_table((26 - key) % 26)
+        tables.append(table.translate(lower) if ignore_case else table)
+    return tuple(tables)
+
+
+# Au-delà de ce nombre de lettres non ASCII distinctes, str.translate direct est plus rapide
+_MAX_BYTES_REPLACEMENTS = 32
 
 
 class CaesarCipher:
@@ -12,6 +74,19 @@ class CaesarCipher:
         'v': 1.11, 'k': 0.69, 'x': 0.17, 'q': 0.11, 'j': 0.10, 'z': 0.07
     }
     
+    # Tables de translation des 26 décalages, construites une seule fois à l'import
+    _TRANSLATION_TABLES = tuple(_ShiftTable(key) for key in range(26))
+    _BYTES_TABLES = tuple(_build_bytes_table(key) for key in range(26))
+    
+    # Taille des blocs lus par les API de flux (caractères ou octets)
+    STREAM_CHUNK_SIZE = 1 << 20
+    
+    # Taille des blocs de encrypt_into (taille de son tampon d'index)
+    INTO_CHUNK_SIZE = 1 << 16
+    
+    # Taille des blocs parcourus par find_crib
+    CRIB_CHUNK_SIZE = 1 << 16
+    
     @staticmethod
     def validate_key(key: int) -> int:
         """
@@ -48,16 +123,32 @@ class CaesarCipher:
         if not plaintext:
             return plaintext
         
-        result = []
-        for char in plaintext:
-            if char.isalpha():
-                base = ord('A') if char.isupper() else ord('a')
-                original_pos = ord(char) - base
-                new_pos = (original_pos + key) % 26
-                result.append(chr(new_pos + base))
-            else:
-                result.append(char)
-        return ''.join(result)
+        return CaesarCipher._translate(plaintext, key)
+    
+    @staticmethod
+    def _translate(text: str, key: int) -> str:
+        """
+        Applique le décalage (déjà normalisé) via les tables précalculées.
+        
+        Texte ASCII: str.translate direct. Sinon le texte passe par
+        bytes.translate (bien plus rapide que str.translate sur une chaîne
+        non ASCII), puis chaque lettre non ASCII distincte est remplacée par
+        son équivalent historique.
+        """
+        table = CaesarCipher._TRANSLATION_TABLES[key]
+        if text.isascii():
+            return text.translate(table)
+        
+        data = text.encode('utf-8', 'surrogatepass')
+        extras = data.translate(None, _ASCII_BYTES).decode('utf-8', 'surrogatepass')
+        letters = [char for char in set(extras) if char.isalpha()]
+        if len(letters) > _MAX_BYTES_REPLACEMENTS:
+            return text.translate(table)
+        
+        result = data.translate(CaesarCipher._BYTES_TABLES[key])
+        for char in letters:
+            result = result.replace(char.encode('utf-8'), chr(table[ord(char)]).encode('ascii'))
+        return result.decode('utf-8', 'surrogatepass')
     
     @staticmethod
     def decrypt(ciphertext: str, key: int) -> str:
@@ -73,6 +164,160 @@ class CaesarCipher:
         """
         return CaesarCipher.encrypt(ciphertext, -key)
     
+    @staticmethod
+    def encrypt_bytes(data: Union[bytes, bytearray, memoryview], key: int) -> bytes:
+        """
+        Chiffre des octets sans décodage: seules les lettres ASCII sont
+        décalées, tous les autres octets restent inchangés.
+        
+        Args:
+            data: Octets à chiffrer (bytes, bytearray ou memoryview)
+            key: Valeur de décalage (n'importe quel entier, sera normalisé)
+            
+        Returns:
+            Octets chiffrés
+        """
+        key = CaesarCipher.validate_key(key)
+        if not isinstance(data, bytes):
+            data = bytes(memoryview(data).cast('B'))
+        return data.translate(CaesarCipher._BYTES_TABLES[key])
+    
+    @staticmethod
+    def decrypt_bytes(data: Union[bytes, bytearray, memoryview], key: int) -> bytes:
+        """
+        Déchiffre des octets chiffrés avec encrypt_bytes.
+        
+        Args:
+            data: Octets à déchiffrer (bytes, bytearray ou memoryview)
+            key: Valeur de décalage utilisée pour le chiffrement
+            
+        Returns:
+            Octets déchiffrés
+        """
+        return CaesarCipher.encrypt_bytes(data, -key)
+    
+    @staticmethod
+    def encrypt_into(data: Union[bytes, bytearray, memoryview],
+                     out: Union[bytearray, memoryview], key: int) -> int:
+        """
+        Chiffre des octets directement dans un tampon fourni par l'appelant
+        (bytearray, memoryview sur un mmap, ...). out peut être data lui-même
+        pour un chiffrement en place. Les octets passent par la table du
+        décalage avec numpy.take, écrit directement dans out: aucun objet
+        n'est alloué par bloc, seul un tampon d'index de INTO_CHUNK_SIZE
+        entrées est réutilisé d'un bloc à l'autre.
+        
+        Args:
+            data: Octets à chiffrer
+            out: Tampon inscriptible d'au moins len(data) octets
+            key: Valeur de décalage (n'importe quel entier, sera normalisé)
+            
+        Returns:
+            Nombre d'octets écrits
+            
+        Raises:
+            TypeError: Si out est en lecture seule
+            ValueError: Si out est plus petit que data
+        """
+        # Import différé: numpy pèse au démarrage de la CLI
+        import numpy as np
+        
+        key = CaesarCipher.validate_key(key)
+        table = np.frombuffer(CaesarCipher._BYTES_TABLES[key], dtype=np.uint8)
+        
+        source = memoryview(data).cast('B')
+        target = memoryview(out).cast('B')
+        if target.readonly:
+            raise TypeError("Le tampon de sortie doit être inscriptible")
+        if len(target) < len(source):
+            raise ValueError(
+                f"Tampon de sortie trop petit: {len(target)} octets pour {len(source)}")
+        
+        size = len(source)
+        if not size:
+            return 0
+        codes = np.frombuffer(source, dtype=np.uint8)
+        shifted = np.frombuffer(target, dtype=np.uint8)
+        # numpy.take veut des index intp: un seul tampon de conversion pour tous les blocs
+        indices = np.empty(min(size, CaesarCipher.INTO_CHUNK_SIZE), dtype=np.intp)
+        for start in range(0, size, CaesarCipher.INTO_CHUNK_SIZE):
+            end = min(start + CaesarCipher.INTO_CHUNK_SIZE, size)
+            np.copyto(indices[:end - start], codes[start:end])
+            # mode='clip' (index toujours < 256): écriture directe, sans copie de out
+            np.take(table, indices[:end - start], out=shifted[start:end], mode='clip')
+        return size
+    
+    @staticmethod
+    def decrypt_into(data: Union[bytes, bytearray, memoryview],
+                     out: Union[bytearray, memoryview], key: int) -> int:
+        """
+        Déchiffre des octets directement dans un tampon fourni par l'appelant.
+        
+        Args:
+            data: Octets à déchiffrer
+            out: Tampon inscriptible d'au moins len(data) octets
+            key: Valeur de décalage utilisée pour le chiffrement
+            
+        Returns:
+            Nombre d'octets écrits
+        """
+        return CaesarCipher.encrypt_into(data, out, -key)
+    
+    @staticmethod
+    def encrypt_stream(source: IO, destination: IO, key: int,
+                       chunk_size: int = STREAM_CHUNK_SIZE) -> int:
+        """
+        Chiffre un flux vers un autre par blocs de taille fixe.
+        La mémoire utilisée reste constante quelle que soit la taille du flux.
+        
+        Un flux texte donne exactement le même résultat que encrypt() sur tout
+        son contenu; un flux binaire ne décale que les lettres ASCII.
+        
+        Args:
+            source: Flux lisible (texte ou binaire)
+            destination: Flux inscriptible du même type
+            key: Valeur de décalage (n'importe quel entier, sera normalisé)
+            chunk_size: Taille des blocs lus
+            
+        Returns:
+            Nombre de caractères (ou d'octets) traités
+            
+        Raises:
+            ValueError: Si chunk_size n'est pas strictement positif
+        """
+        key = CaesarCipher.validate_key(key)
+        if chunk_size <= 0:
+            raise ValueError(f"La taille de bloc doit être positive, reçu {chunk_size}")
+        
+        processed = 0
+        while True:
+            chunk = source.read(chunk_size)
+            if not chunk:
+                break
+            if isinstance(chunk, str):
+                destination.write(CaesarCipher._translate(chunk, key))
+            else:
+                destination.write(chunk.translate(CaesarCipher._BYTES_TABLES[key]))
+            processed += len(chunk)
+        return processed
+    
+    @staticmethod
+    def decrypt_stream(source: IO, destination: IO, key: int,
+                       chunk_size: int = STREAM_CHUNK_SIZE) -> int:
+        """
+        Déchiffre un flux vers un autre par blocs de taille fixe.
+        
+        Args:
+            source: Flux lisible (texte ou binaire)
+            destination: Flux inscriptible du même type
+            key: Valeur de décalage utilisée pour le chiffrement
+            chunk_size: Taille des blocs lus
+            
+        Returns:
+            Nombre de caractères (ou d'octets) traités
+        """
+        return CaesarCipher.encrypt_stream(source, destination, -key, chunk_size)
+    
     @staticmethod
     def brute_force(ciphertext: str) -> List[Tuple[int, str]]:
         """
@@ -94,12 +339,130 @@ class CaesarCipher:
         return hypotheses
     
     @staticmethod
-    def frequency_analysis(ciphertext: str) -> Dict[str, Any]:
+    def brute_force_array(ciphertext: Union[str, bytes, bytearray, memoryview]) -> 'numpy.ndarray':
+        """
+        Génère les 25 hypothèses d'un coup sous forme de matrice NumPy.
+        Une seule addition modulaire vectorisée sur le masque des lettres
+        remplace les 25 déchiffrements successifs.
+        
+        Seules les lettres ASCII sont décalées: un texte str est encodé en
+        UTF-8 et les octets non ASCII restent inchangés.
+        
+        Args:
+            ciphertext: Texte (str) ou octets à analyser
+            
+        Returns:
+            Matrice uint8 de forme (25, N); la ligne i correspond à la clé i + 1
+        """
+        import numpy as np
+        
+        if isinstance(ciphertext, str):
+            ciphertext = ciphertext.encode('utf-8', 'surrogatepass')
+        codes = np.frombuffer(ciphertext, dtype=np.uint8)
+        
+        folded = codes | 0x20
+        is_letter = (folded >= ord('a')) & (folded <= ord('z'))
+        base = (codes & 0x20) + ord('A')  # 'A' ou 'a' selon la casse
+        offsets = folded - ord('a')
+        
+        # Décalage de déchiffrement de chaque clé: -k ≡ 26 - k (mod 26)
+        shifts = (26 - np.arange(1, 26, dtype=np.uint8))[:, np.newaxis]
+        shifted = (offsets + shifts) % 26 + base
+        return np.where(is_letter, shifted, codes)
+    
+    @staticmethod
+    def canonicalize(text: str) -> Tuple[str, int]:
+        """
+        Forme canonique d'un texte pour les rotations: le texte est décalé
+        pour que sa première lettre devienne 'a' (ou 'A'). Tous les chiffrés
+        d'un même texte clair, quelle que soit la clé, ont donc la même forme
+        canonique, et decrypt(text, k) == decrypt(canonique, (k - décalage) % 26).
+        
+        Un texte sans lettre, ou contenant des lettres non ASCII (dont le
+        décalage n'est pas réversible), est sa propre forme canonique.
+        
+        Args:
+            text: Texte (chiffré ou non)
+        
+        Returns:
+            (texte canonique, décalage) avec
+            texte canonique == decrypt(text, décalage)
+        """
+        if not text.isascii() and any(char.isalpha() and not char.isascii() for char in set(text)):
+            return text, 0
+        
+        first = next((char for char in text if char.isalpha()), None)
+        if first is None:
+            return text, 0
+        offset = ord(first.lower()) - ord('a')
+        if not offset:
+            return text, 0
+        return CaesarCipher._translate(text, 26 - offset), offset
+    
+    @staticmethod
+    def find_crib(ciphertext: str, crib: str,
+                  ignore_case: bool = True) -> Optional[Tuple[int, int]]:
+        """
+        Cherche un fragment connu du texte clair (crib, ex. "FLAG{") sous
+        les 25 clés possibles, sans scorer aucune hypothèse.
+        
+        Args:
+            ciphertext: Texte chiffré à parcourir
+            crib: Fragment de texte clair attendu (doit contenir une lettre)
+            ignore_case: Ignorer la casse lors de la recherche
+            
+        Returns:
+            (clé, position) de la première occurrence, avec
+            decrypt(ciphertext, clé) contenant le crib à cette position,
+            ou None si aucune clé ne convient
+            
+        Raises:
+            ValueError: Si le crib ne contient aucune lettre
+        """
+        if not any(char.isalpha() for char in crib):
+            raise ValueError("Le crib doit contenir au moins une lettre")
+        
+        # Le texte est parcouru par blocs (chevauchants) et les 25 clés sont
+        # testées sur chaque bloc: un crib présent tôt est trouvé sans lire
+        # la suite du texte. Texte ASCII: bytes.translate + bytes.find.
+        fast = ciphertext.isascii() and crib.isascii()
+        if fast:
+            tables = _crib_tables(ignore_case)
+            needle = (crib.lower() if ignore_case else crib).encode('ascii')
+        else:
+            import re
+            pattern = re.compile(re.escape(crib), re.IGNORECASE if ignore_case else 0)
+        
+        overlap = len(crib) - 1
+        for start in range(0, len(ciphertext), CaesarCipher.CRIB_CHUNK_SIZE):
+            chunk = ciphertext[start:start + CaesarCipher.CRIB_CHUNK_SIZE + overlap]
+            if fast:
+                chunk = chunk.encode('ascii')
+            
+            best = None
+            for key in range(1, 26):
+                if fast:
+                    offset = chunk.translate(tables[key]).find(needle)
+                else:
+                    match = pattern.search(CaesarCipher.decrypt(chunk, key))
+                    offset = match.start() if match else -1
+                if offset != -1 and (best is None or offset < best[1]):
+                    best = (key, offset)
+            
+            if best is not None:
+                return best[0], start + best[1]
+        return None
+    
+    @staticmethod
+    def frequency_analysis(ciphertext: str,
+                           frequencies: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
         """
         Effectue une analyse fréquentielle sur le texte chiffré.
         
         Args:
             ciphertext: Texte à analyser
+            frequencies: Fréquences des lettres de la langue attendue
+                (défaut: ENGLISH_FREQUENCIES)
             
         Returns:
             Dictionnaire avec résultats d'analyse
@@ -107,15 +470,34 @@ class CaesarCipher:
         from collections import Counter
         
         letters = [char.lower() for char in ciphertext if char.isalpha()]
-        if not letters:
+        return CaesarCipher.frequency_analysis_from_counts(Counter(letters), frequencies)
+    
+    @staticmethod
+    def frequency_analysis_from_counts(counter: 'Counter',
+                                       frequencies: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
+        """
+        Analyse fréquentielle à partir des effectifs des lettres (minuscules),
+        par exemple ceux d'un fichier compté par morceaux.
+        
+        Args:
+            counter: Effectif de chaque lettre
+            frequencies: Fréquences des lettres de la langue attendue
+                (défaut: ENGLISH_FREQUENCIES)
+            
+        Returns:
+            Dictionnaire avec résultats d'analyse (voir frequency_analysis)
+        """
+        total = sum(counter.values())
+        if not total:
             return {"error": "Aucune lettre trouvée pour l'analyse"}
         
-        total = len(letters)
-        counter = Counter(letters)
         sorted_letters = counter.most_common()
         
+        # La lettre la plus fréquente du texte chiffré est supposée être celle de la langue
+        frequencies = frequencies or CaesarCipher.ENGLISH_FREQUENCIES
+        expected = max(frequencies, key=frequencies.get)
         most_common = sorted_letters[0][0] if sorted_letters else None
-        estimated_key = (ord(most_common) - ord('e')) % 26 if most_common else None
+        estimated_key = (ord(most_common) - ord(expected)) % 26 if most_common else None
         
         percentages = {
             letter: (count / total) * 100 
@@ -1,8 +1,13 @@
 # crypto/utils.py - CORRECT VERSION
 import re
+import string
 from typing import List, Dict
 
 
+# Suppression des lettres ASCII (pour les compter par différence de longueur)
+_DELETE_ASCII_LETTERS = {ord(char): None for char in string.ascii_letters}
+
+
 def clean_text(text: str, keep_punctuation: bool = False) -> str:
     """Clean text by removing unwanted characters."""
     if keep_punctuation:
@@ -25,6 +30,13 @@ def validate_text(text: str, min_length: int = 10) -> bool:
     return True
 
 
+def count_letters(text: str) -> int:
+    """Count alphabetic characters (str.isalpha) without a Python-level loop."""
+    if text.isascii():
+        return len(text) - len(text.translate(_DELETE_ASCII_LETTERS))
+    return sum(map(str.isalpha, text))
+
+
 def calculate_letter_frequency(text: str) -> Dict[str, float]:
     """Calculate letter frequencies in text."""
     letters = [char.lower() for char in text if char.isalpha()]
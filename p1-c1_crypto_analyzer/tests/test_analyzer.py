@@ -28,6 +28,299 @@ class TestCombinedAnalyzer(unittest.TestCase):
         self.assertEqual(best["key"], 19)
         self.assertEqual(best["plaintext"], plaintext)
     
+    def test_histogram_ranking_matches_brute_force(self):
+        from crypto.caesar import CaesarCipher
+        
+        plaintext = "This is a secret message for testing the Caesar cipher"
+        ciphertext = CaesarCipher.encrypt(plaintext, 19)
+        
+        fast = self.analyzer.analyze_caesar(ciphertext, top_n=5)
+        slow = self.analyzer.analyze_caesar(ciphertext, top_n=5, ranking="brute_force")
+        
+        self.assertEqual(fast["best_solution"], slow["best_solution"])
+        self.assertEqual(fast["top_solutions"], slow["top_solutions"])
+        self.assertEqual(fast["statistics"]["score_range"], slow["statistics"]["score_range"])
+        self.assertEqual(fast["statistics"]["total_hypotheses"], 25)
+    
+    def test_lazy_hypotheses(self):
+        import json
+        from analysis.combined_analyzer import CaesarHypothesis
+        from crypto.caesar import CaesarCipher
+        
+        plaintext = "Lazy hypotheses only decrypt what is read. " * 10
+        ciphertext = CaesarCipher.encrypt(plaintext, 4)
+        
+        hypothesis = CaesarHypothesis(ciphertext, 4, 42.0, "Moyenne")
+        self.assertNotIn('plaintext', dict.keys(hypothesis))
+        self.assertEqual(hypothesis['preview'], plaintext[:120] + "...")
+        self.assertNotIn('plaintext', dict.keys(hypothesis))
+        self.assertEqual(hypothesis['plaintext'], plaintext)
+        
+        expected = {
+            'key': 4,
+            'plaintext': plaintext,
+            'score': 42.0,
+            'confidence': "Moyenne",
+            'preview': plaintext[:120] + "..."
+        }
+        self.assertEqual(json.loads(json.dumps(hypothesis)), expected)
+        self.assertEqual(list(json.loads(json.dumps(hypothesis))), list(expected))
+        self.assertEqual(hypothesis, expected)
+    
+    def test_sampled_analysis(self):
+        import random
+        from crypto.caesar import CaesarCipher
+        
+        corpus = os.path.join(os.path.dirname(__file__), '..', 'data', 'samples', 'ngram_corpus_en.txt')
+        with open(corpus, encoding='utf-8') as handle:
+            plaintext = handle.read() * 20
+        ciphertext = CaesarCipher.encrypt(plaintext, 7)
+        
+        for strategy in ("prefix", "windows"):
+            with self.subTest(strategy=strategy):
+                received = []
+                self.analyzer.telemetry = received.append
+                sampled = self.analyzer.analyze_caesar_sampled(
+                    ciphertext, sample_size=512, strategy=strategy)
+                stats = sampled["statistics"]
+                
+                self.assertEqual(sampled["best_solution"]["key"], 7)
+                self.assertEqual(sampled["best_solution"]["plaintext"], plaintext)
+                self.assertEqual(stats["sample_rounds"], 1)
+                self.assertGreaterEqual(stats["sample_confidence"],
+                                        CombinedAnalyzer.SAMPLE_CONFIDENCE_THRESHOLD)
+                self.assertEqual(stats["sampling_strategy"], strategy)
+                
+                # Seuls les caractères du texte chiffré comptent, pas les séparateurs
+                parts = self.analyzer._sample_parts(ciphertext, 512, strategy, 8)
+                self.assertEqual(stats["characters_examined"], sum(map(len, parts)))
+                self.assertEqual(stats["sample_size"], stats["characters_examined"])
+                
+                # Même forme de statistiques et même télémétrie que analyze_caesar
+                self.assertEqual(stats["ranking"], "ngrams")
+                self.assertEqual(stats["counters"]["characters_scanned"], stats["characters_examined"])
+                self.assertIn("ngrams", stats["stage_timings_ns"])
+                self.assertGreater(stats["analysis_time_ns"], 0)
+                self.assertEqual(len(received), 1)
+                self.assertEqual(received[0]["ranking"], "ngrams")
+                self.assertEqual(received[0]["counters"], stats["counters"])
+        self.analyzer.telemetry = None
+        
+        # Lettres aléatoires: aucun écart décisif, l'échantillon grandit jusqu'au texte complet
+        rng = random.Random(5)
+        noise = "".join(rng.choice("abcdefghijklmnopqrstuvwxyz ") for _ in range(20000))
+        escalated = self.analyzer.analyze_caesar_sampled(noise, sample_size=256)
+        stats = escalated["statistics"]
+        self.assertEqual(stats["sample_rounds"], 5)  # 256, 1024, 4096, 16384, tout
+        self.assertEqual(stats["sample_size"], len(noise))
+        self.assertLess(stats["sample_confidence"], CombinedAnalyzer.SAMPLE_CONFIDENCE_THRESHOLD)
+        
+        # Seuil inatteignable: même classement que sur le texte complet
+        exhaustive = self.analyzer.analyze_caesar_sampled(
+            ciphertext, sample_size=4096, confidence_threshold=1000)
+        self.assertEqual(exhaustive["statistics"]["sample_size"], len(ciphertext))
+        self.assertEqual([(solution["key"], solution["score"]) for solution in exhaustive["top_solutions"]],
+                         self.analyzer.scorer.rank_ngram_shifts(ciphertext)[:5])
+        
+        with self.assertRaises(ValueError):
+            self.analyzer.analyze_caesar_sampled(ciphertext, strategy="random")
+    
+    def test_analyze_many(self):
+        import pickle
+        from crypto.caesar import CaesarCipher
+        
+        plaintexts = [f"Message number {index} travels through the parallel analyzer." for index in range(12)]
+        ciphertexts = [CaesarCipher.encrypt(text, index % 25 + 1) for index, text in enumerate(plaintexts)]
+        expected = [self.analyzer.analyze_caesar(text)["top_solutions"] for text in ciphertexts]
+        
+        ordered = list(self.analyzer.analyze_many(iter(ciphertexts), workers=2, ordered=True, max_pending=3))
+        self.assertEqual([index for index, _ in ordered], list(range(len(ciphertexts))))
+        self.assertEqual([results["top_solutions"] for _, results in ordered], expected)
+        
+        unordered = dict(self.analyzer.analyze_many(ciphertexts, workers=2))
+        self.assertEqual(sorted(unordered), list(range(len(ciphertexts))))
+        self.assertEqual(unordered[5]["top_solutions"], expected[5])
+        
+        inline = list(self.analyzer.analyze_many(ciphertexts[:2], workers=1))
+        self.assertEqual([results["top_solutions"] for _, results in inline], expected[:2])
+        
+        # Rotations d'un même texte: un seul classement, clés décalées
+        rotations = [CaesarCipher.encrypt(plaintexts[0], key) for key in range(1, 9)]
+        for workers in (1, 2):
+            with self.subTest(workers=workers):
+                analyzed = list(self.analyzer.analyze_many(rotations, workers=workers, ordered=True, max_pending=3))
+                self.assertEqual([results["top_solutions"] for _, results in analyzed],
+                                 [self.analyzer.analyze_caesar(text)["top_solutions"] for text in rotations])
+                self.assertEqual(sum(results["statistics"]["memo_hit"] for _, results in analyzed), 7)
+                # Sans ResultCache, aucun résultat ne vient du cache
+                self.assertFalse(any(results["statistics"]["cache_hit"] for _, results in analyzed))
+        
+        hypothesis = ordered[0][1]["best_solution"]
+        self.assertEqual(pickle.loads(pickle.dumps(hypothesis)), hypothesis)
+        
+        # 0 n'est pas "tous les cœurs"
+        for options in ({'workers': 0}, {'workers': -1}, {'workers': 2, 'max_pending': 0}):
+            with self.subTest(**options), self.assertRaises(ValueError):
+                next(self.analyzer.analyze_many(ciphertexts, **options))
+    
+    def test_crib_skips_scoring(self):
+        from crypto.caesar import CaesarCipher
+        
+        # Texte trop court: le scoring seul classe mal la bonne clé
+        ciphertext = CaesarCipher.encrypt("Zyx qwv FLAG{mpq}", 1)
+        self.assertIsNone(self.analyzer.find_flag(self.analyzer.analyze_caesar(ciphertext, top_n=3)))
+        
+        results = self.analyzer.analyze_caesar(ciphertext, top_n=3, crib=CombinedAnalyzer.FLAG_CRIB)
+        self.assertEqual(results["crib_match"], {'crib': "FLAG{", 'key': 1, 'offset': 8})
+        self.assertEqual(results["best_solution"]["key"], 1)
+        self.assertEqual(results["statistics"]["evaluated_hypotheses"], 0)
+        self.assertEqual(self.analyzer.find_flag(results), "FLAG{mpq}")
+        
+        # Pas de crib: analyse complète
+        results = self.analyzer.analyze_caesar(CaesarCipher.encrypt("Hello world", 3),
+                                               crib=CombinedAnalyzer.FLAG_CRIB)
+        self.assertIsNone(results["crib_match"])
+        self.assertEqual(results["statistics"]["evaluated_hypotheses"], 25)
+    
+    def test_stage_timings_and_telemetry(self):
+        from crypto.caesar import CaesarCipher
+        
+        received = []
+        analyzer = CombinedAnalyzer(telemetry=received.append)
+        ciphertext = CaesarCipher.encrypt("The quick brown fox jumps over the lazy dog", 3)
+        
+        for ranking, first_stage in (("histogram", "features"), ("brute_force", "decrypt")):
+            with self.subTest(ranking=ranking):
+                stats = analyzer.analyze_caesar(ciphertext, ranking=ranking)["statistics"]
+                timings = stats["stage_timings_ns"]
+                
+                for stage in (first_stage, "stopwords", "dictionary", "frequency", "bigrams",
+                              "entropy", "sorting", "frequency_analysis", "assembly"):
+                    self.assertIn(stage, timings)
+                    self.assertGreaterEqual(timings[stage], 0)
+                self.assertLessEqual(sum(timings.values()), stats["analysis_time_ns"])
+                self.assertEqual(stats["counters"]["characters"], len(ciphertext))
+                self.assertEqual(stats["counters"]["words"], 9)
+                self.assertEqual(stats["counters"]["letters"], 35)
+                
+                self.assertEqual(received[-1]["ranking"], ranking)
+                self.assertEqual(received[-1]["stage_timings_ns"], timings)
+                self.assertFalse(received[-1]["crib_hit"])
+        self.assertEqual(len(received), 2)
+        
+        # analyze_many: une mesure par texte, rotations résolues par le lot comprises
+        received.clear()
+        rotations = [CaesarCipher.encrypt("The quick brown fox jumps over the lazy dog", key)
+                     for key in range(1, 7)]
+        analyzed = dict(analyzer.analyze_many(rotations, workers=2, max_pending=6))
+        self.assertEqual(len(received), len(rotations))
+        self.assertEqual(sorted(record["total_ns"] for record in received),
+                         sorted(results["statistics"]["analysis_time_ns"] for results in analyzed.values()))
+        for record in received:
+            self.assertEqual(record["ranking"], "histogram")
+            self.assertIn("canonicalize", record["stage_timings_ns"])
+            self.assertLessEqual(sum(record["stage_timings_ns"].values()), record["total_ns"])
+            self.assertEqual(record["counters"]["words"], 9)
+    
+    def test_result_cache(self):
+        import tempfile
+        from analysis.cache import ResultCache
+        from crypto.caesar import CaesarCipher
+        
+        ciphertext = CaesarCipher.encrypt("The quick brown fox jumps over the lazy dog", 3)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "results.db")
+            with ResultCache(path) as cache:
+                analyzer = CombinedAnalyzer(cache=cache)
+                first = analyzer.analyze_caesar(ciphertext)
+                second = analyzer.analyze_caesar(ciphertext)
+                analyzer.analyze_caesar(ciphertext, top_n=3)
+                
+                self.assertFalse(first["statistics"]["cache_hit"])
+                self.assertTrue(second["statistics"]["cache_hit"])
+                self.assertNotIn("stopwords", second["statistics"]["stage_timings_ns"])
+                self.assertEqual([(h["key"], h["score"]) for h in second["top_solutions"]],
+                                 [(h["key"], h["score"]) for h in first["top_solutions"]])
+                self.assertEqual(second["best_solution"]["plaintext"], first["best_solution"]["plaintext"])
+                self.assertEqual(cache.stats()["hits"], 2)
+                # Classement canonique partagé par les deux valeurs de top_n
+                self.assertEqual(cache.stats()["entries"], 1)
+                
+                # Autre clé, même texte clair: classement réutilisé, clés décalées
+                rotated_text = CaesarCipher.encrypt("The quick brown fox jumps over the lazy dog", 11)
+                rotated = analyzer.analyze_caesar(rotated_text)
+                reference = CombinedAnalyzer().analyze_caesar(rotated_text)
+                self.assertTrue(rotated["statistics"]["cache_hit"])
+                self.assertEqual(rotated["top_solutions"], reference["top_solutions"])
+                self.assertEqual(rotated["statistics"]["score_range"], reference["statistics"]["score_range"])
+            
+            # Le cache persiste entre instances ; ses entrées expirées sont purgées
+            with ResultCache(path) as cache:
+                results = CombinedAnalyzer(cache=cache).analyze_caesar(ciphertext)
+                self.assertTrue(results["statistics"]["cache_hit"])
+            with ResultCache(path, max_age_seconds=-1) as cache:
+                self.assertEqual(cache.stats()["entries"], 0)
+                self.assertEqual(cache.evictions, 1)
+            
+            with ResultCache(path, max_bytes=1) as cache:
+                cache.put("a", [1, 2, 3])
+                cache.put("b", [4, 5, 6])
+                self.assertEqual(cache.evict(), 2)
+                self.assertIsNone(cache.get("a"))
+                self.assertEqual(cache.stats()["misses"], 1)
+    
+    def test_analyze_file(self):
+        import tempfile
+        from analysis import mapped_file
+        from crypto.caesar import CaesarCipher
+        
+        with open(os.path.join(os.path.dirname(__file__), '..', 'test_message.txt'), encoding='utf-8') as f:
+            ciphertext = CaesarCipher.encrypt(f.read() * 3 + "Déjà vu à İstanbul!", 5)
+        expected = self.analyzer.analyze_caesar(ciphertext)
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "huge.txt")
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(ciphertext)
+            with open(path, 'rb') as f:
+                data = f.read()
+            
+            for range_size in (5, 64, None):
+                ranges = mapped_file.aligned_ranges(data, range_size or len(data))
+                self.assertEqual(b''.join(data[start:end] for start, end in ranges), data)
+                for workers in (1, 2):
+                    with self.subTest(range_size=range_size, workers=workers):
+                        results = self.analyzer.analyze_file(path, range_size=range_size, workers=workers)
+                        self.assertEqual([(solution["key"], solution["score"]) for solution in results["top_solutions"]],
+                                         [(solution["key"], solution["score"]) for solution in expected["top_solutions"]])
+                        self.assertEqual(results["statistics"]["score_range"], expected["statistics"]["score_range"])
+                        self.assertEqual(results["best_solution"]["preview"], expected["best_solution"]["preview"])
+                        self.assertEqual(results["statistics"]["counters"]["bytes"], len(data))
+            
+            for workers in (0, -1):
+                with self.subTest(workers=workers), self.assertRaises(ValueError):
+                    self.analyzer.analyze_file(path, workers=workers)
+    
+    def test_detect_language(self):
+        """Test a French ciphertext is analysed with the French model."""
+        from crypto.caesar import CaesarCipher
+        
+        ciphertext = CaesarCipher.encrypt("Le message parlait d'un rendez-vous au bord de la "
+                                          "rivière, sous le vieux pont de pierre, à minuit.", 5)
+        detected = self.analyzer.detect_language(ciphertext)
+        self.assertEqual(detected[0]["language"], "fr")
+        self.assertEqual(detected[0]["key"], 5)
+        
+        french = self.analyzer.for_language("fr")
+        self.assertIs(french.scorer, self.analyzer.scorer.for_language("fr"))
+        self.assertEqual(self.analyzer.scorer.language, "en")
+        results = french.analyze_caesar(ciphertext)
+        self.assertEqual(results["metadata"]["language"], "fr")
+        self.assertEqual(results["best_solution"]["key"], 5)
+        direct = CombinedAnalyzer(language="fr").analyze_caesar(ciphertext)
+        self.assertEqual([(h["key"], h["score"]) for h in results["top_solutions"]],
+                         [(h["key"], h["score"]) for h in direct["top_solutions"]])
+    
     def test_confidence_levels(self):
         test_cases = [
             (95, "Très Élevée"),
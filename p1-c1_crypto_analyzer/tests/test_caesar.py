@@ -174,6 +174,151 @@ class TestCaesarCipher(unittest.TestCase):
         decrypted = CaesarCipher.decrypt(encrypted, -3)
         self.assertEqual(decrypted, text)
 
+    
+    def test_translation_tables_match_reference_loop(self):
+        """Test table-driven engine matches the historical per-character loop"""
+        def reference(text, key):
+            result = []
+            for char in text:
+                if char.isalpha():
+                    base = ord('A') if char.isupper() else ord('a')
+                    result.append(chr((ord(char) - base + key) % 26 + base))
+                else:
+                    result.append(char)
+            return ''.join(result)
+        
+        cyrillic = ''.join(chr(code) for code in range(0x410, 0x450))
+        texts = [
+            "Hello, World! 123",
+            "Déjà vu: l'été à Noël, ÇA VA? straße İstanbul",
+            "Mixed 東京 text with emoji 🙂 and \udcff surrogate",
+            cyrillic + " plus ASCII",
+        ]
+        for text in texts:
+            for key in range(26):
+                with self.subTest(text=text[:10], key=key):
+                    self.assertEqual(CaesarCipher.encrypt(text, key), reference(text, key))
+
+    
+    def test_brute_force_array(self):
+        """Test vectorized brute-force matrix matches brute_force rows"""
+        import numpy as np
+        
+        ciphertext = "Khoor Zruog! 123"
+        matrix = CaesarCipher.brute_force_array(ciphertext)
+        
+        self.assertEqual(matrix.shape, (25, len(ciphertext)))
+        self.assertEqual(matrix.dtype, np.uint8)
+        for row, (key, plaintext) in zip(matrix, CaesarCipher.brute_force(ciphertext)):
+            self.assertEqual(row.tobytes().decode('ascii'), plaintext, f"Row mismatch for key {key}")
+        
+        # Bytes input, non-ASCII bytes untouched
+        matrix = CaesarCipher.brute_force_array("Zé".encode('utf-8'))
+        self.assertEqual(matrix[0].tobytes(), "Yé".encode('utf-8'))
+
+    
+    def test_stream_encrypt_decrypt(self):
+        """Test chunked stream API matches whole-text encryption"""
+        import io
+        
+        text = "Hello, World! Déjà vu.\r\nSecond line\n" * 50
+        for chunk_size in (1, 7, 4096):
+            with self.subTest(chunk_size=chunk_size):
+                encrypted = io.StringIO()
+                processed = CaesarCipher.encrypt_stream(io.StringIO(text), encrypted, 5, chunk_size)
+                self.assertEqual(processed, len(text))
+                self.assertEqual(encrypted.getvalue(), CaesarCipher.encrypt(text, 5))
+                
+                decrypted = io.StringIO()
+                CaesarCipher.decrypt_stream(io.StringIO(encrypted.getvalue()), decrypted, 5, chunk_size)
+                self.assertEqual(decrypted.getvalue(), CaesarCipher.decrypt(encrypted.getvalue(), 5))
+        
+        # Binary streams shift ASCII letters only
+        encrypted = io.BytesIO()
+        CaesarCipher.encrypt_stream(io.BytesIO("Zé, abc".encode('utf-8')), encrypted, 1, 3)
+        self.assertEqual(encrypted.getvalue(), "Aé, bcd".encode('utf-8'))
+        
+        with self.assertRaises(ValueError):
+            CaesarCipher.encrypt_stream(io.StringIO(text), io.StringIO(), 1, 0)
+
+    
+    def test_bytes_api(self):
+        """Test bytes/bytearray/memoryview API and in-place mode"""
+        data = "Hello, World! é".encode('utf-8')
+        expected = "Khoor, Zruog! é".encode('utf-8')
+        
+        for value in (data, bytearray(data), memoryview(data)):
+            with self.subTest(type=type(value).__name__):
+                self.assertEqual(CaesarCipher.encrypt_bytes(value, 3), expected)
+        self.assertEqual(CaesarCipher.decrypt_bytes(expected, 3), data)
+        
+        # In-place into the same buffer
+        buffer = bytearray(data)
+        written = CaesarCipher.encrypt_into(buffer, buffer, 3)
+        self.assertEqual(written, len(data))
+        self.assertEqual(bytes(buffer), expected)
+        
+        # Into a slice of a larger buffer
+        target = bytearray(len(data) + 4)
+        CaesarCipher.decrypt_into(expected, memoryview(target)[2:], 3)
+        self.assertEqual(bytes(target[2:-2]), data)
+        
+        # Several chunks, every byte value, in place
+        large = bytearray(range(256)) * (CaesarCipher.INTO_CHUNK_SIZE // 100)
+        expected_large = CaesarCipher.encrypt_bytes(large, 7)
+        self.assertEqual(CaesarCipher.encrypt_into(large, large, 7), len(expected_large))
+        self.assertEqual(bytes(large), expected_large)
+        self.assertEqual(CaesarCipher.encrypt_into(b"", bytearray(), 7), 0)
+        
+        with self.assertRaises(ValueError):
+            CaesarCipher.encrypt_into(data, bytearray(2), 3)
+        with self.assertRaises(TypeError):
+            CaesarCipher.encrypt_into(data, bytes(len(data)), 3)
+    
+    def test_find_crib(self):
+        """Test crib search across all keys"""
+        plaintext = "x" * 300 + " the secret is flag{crib_found} " + "y" * 50
+        
+        for key in (1, 13, 25):
+            with self.subTest(key=key):
+                ciphertext = CaesarCipher.encrypt(plaintext, key)
+                self.assertEqual(CaesarCipher.find_crib(ciphertext, "FLAG{"), (key, 315))
+                self.assertIsNone(CaesarCipher.find_crib(ciphertext, "FLAG{", ignore_case=False))
+        
+        # Non-ASCII ciphertext and crib crossing block boundaries
+        ciphertext = CaesarCipher.encrypt("café " * 20 + "FLAG{x}", 7)
+        self.assertEqual(CaesarCipher.find_crib(ciphertext, "FLAG{"), (7, 100))
+        
+        original_chunk_size = CaesarCipher.CRIB_CHUNK_SIZE
+        CaesarCipher.CRIB_CHUNK_SIZE = 16
+        try:
+            for position in range(40):
+                ciphertext = CaesarCipher.encrypt("a" * position + "FLAG{" + "b" * 10, 9)
+                self.assertEqual(CaesarCipher.find_crib(ciphertext, "FLAG{"), (9, position))
+        finally:
+            CaesarCipher.CRIB_CHUNK_SIZE = original_chunk_size
+        
+        self.assertIsNone(CaesarCipher.find_crib("Khoor zruog", "FLAG{"))
+        with self.assertRaises(ValueError):
+            CaesarCipher.find_crib("Khoor zruog", "{}")
+    
+    def test_canonicalize(self):
+        plaintext = "Hello, World! 123"
+        canonical, offset = CaesarCipher.canonicalize(plaintext)
+        self.assertEqual((canonical, offset), ("Axeeh, Phkew! 123", 7))
+        
+        for key in range(26):
+            ciphertext = CaesarCipher.encrypt(plaintext, key)
+            with self.subTest(key=key):
+                rotated, rotated_offset = CaesarCipher.canonicalize(ciphertext)
+                self.assertEqual(rotated, canonical)
+                self.assertEqual(CaesarCipher.decrypt(ciphertext, rotated_offset), canonical)
+                self.assertEqual(CaesarCipher.encrypt(canonical, rotated_offset), ciphertext)
+        
+        # Sans lettre ou avec des lettres non ASCII: texte inchangé
+        for text in ("", "123 !?", "Ça va"):
+            self.assertEqual(CaesarCipher.canonicalize(text), (text, 0))
+
 
 def run_tests():
     """Run all tests and display results"""
@@ -0,0 +1,267 @@
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from cli.crack_caesar import main
+from crypto.caesar import CaesarCipher
+
+PLAINTEXT = "Secret messages travel through the parallel analyzer before the final report."
+
+
+class TestCrackCaesar(unittest.TestCase):
+    
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+    
+    def path(self, name: str) -> str:
+        return os.path.join(self.tmpdir.name, name)
+    
+    def write(self, name: str, text: str) -> str:
+        path = self.path(name)
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            f.write(text)
+        return path
+    
+    def run_cli(self, argv, stdin: str = ""):
+        """Exécute main(argv): (code de retour, stdout, stderr)."""
+        stdout, stderr = io.StringIO(), io.StringIO()
+        stdin = io.TextIOWrapper(io.BytesIO(stdin.encode('utf-8')), encoding='utf-8')
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr), \
+                mock.patch('sys.stdin', stdin):
+            code = main(argv)
+        return code, stdout.getvalue(), stderr.getvalue()
+    
+    def test_stream_round_trip(self):
+        # Plusieurs blocs; symboles non ASCII et fins de ligne conservés à l'identique
+        plaintext = (PLAINTEXT + " 20 € — ok\r\n") * 200
+        source = self.write("plain.txt", plaintext)
+        
+        code, _, stderr = self.run_cli(["--input", source, "--encrypt", "7",
+                                        "--chunk-size", "1000", "--output", self.path("cipher.txt")])
+        self.assertEqual(code, 0)
+        self.assertIn(f"{len(plaintext)} caractères chiffrés (clé 7)", stderr)
+        with open(self.path("cipher.txt"), encoding='utf-8', newline='') as f:
+            self.assertEqual(f.read(), CaesarCipher.encrypt(plaintext, 7))
+        
+        code, _, _ = self.run_cli(["--input", self.path("cipher.txt"), "--decrypt", "7",
+                                   "--chunk-size", "1000", "--output", self.path("round.txt"),
+                                   "--quiet"])
+        self.assertEqual(code, 0)
+        with open(self.path("round.txt"), encoding='utf-8', newline='') as f:
+            self.assertEqual(f.read(), plaintext)
+    
+    
+    def test_batch(self):
+        import json
+        
+        texts = {
+            "a.txt": CaesarCipher.encrypt(PLAINTEXT, 3),
+            "b.txt": CaesarCipher.encrypt(PLAINTEXT, 11),
+            "c.log": CaesarCipher.encrypt(PLAINTEXT, 19),
+            "sub/d.txt": CaesarCipher.encrypt(PLAINTEXT, 7),
+        }
+        os.mkdir(self.path("sub"))
+        for name, text in texts.items():
+            self.write(name, text)
+        self.write("empty.txt", "\n")
+        keys = {self.path(name): int(key) for name, key in
+                (("a.txt", 3), ("b.txt", 11), ("c.log", 19), ("sub/d.txt", 7))}
+        
+        def records(stdout: str):
+            return [json.loads(line) for line in stdout.splitlines()]
+        
+        # Répertoire: motif et récursivité
+        code, stdout, stderr = self.run_cli(["batch", self.tmpdir.name, "--pattern", "*.txt",
+                                             "--jobs", "1"])
+        self.assertEqual(code, 0)
+        lines = records(stdout)
+        self.assertEqual([line['file'] for line in lines],
+                         [self.path("a.txt"), self.path("b.txt"), self.path("empty.txt")])
+        self.assertEqual(lines[-1], {'file': self.path("empty.txt"), 'error': "fichier vide"})
+        for line in lines[:-1]:
+            self.assertEqual(set(line), {'file', 'key', 'score', 'confidence', 'confidence_gap',
+                                         'candidates', 'preview'})
+            self.assertEqual(line['key'], keys[line['file']])
+            self.assertEqual(line['candidates'][0], [line['key'], line['score']])
+            self.assertLessEqual(len(line['candidates']), 3)
+        self.assertRegex(stderr, r"2 fichiers \(.* Mo\) en .*s - .* fichiers/s, .* Mo/s, 1 erreurs")
+        
+        code, stdout, _ = self.run_cli(["batch", self.tmpdir.name, "--pattern", "*.txt",
+                                        "--recursive", "--jobs", "1", "--quiet"])
+        self.assertIn(self.path("sub/d.txt"), [line['file'] for line in records(stdout)])
+        
+        # Motif glob et liste de chemins, fichier manquant rapporté dans la sortie
+        listing = self.write("list.txt", "\n".join([self.path("sub/d.txt"), self.path("missing.txt")]))
+        code, stdout, _ = self.run_cli(["batch", self.path("*.log"), "--list", listing,
+                                        "--jobs", "1", "--quiet", "--find-flag", "--plaintext"])
+        self.assertEqual(code, 0)
+        errors = [line for line in records(stdout) if 'error' in line]
+        lines = [line for line in records(stdout) if 'error' not in line]
+        self.assertEqual([line['file'] for line in errors], [self.path("missing.txt")])
+        self.assertEqual([(line['file'], line['key']) for line in lines],
+                         [(self.path("c.log"), 19), (self.path("sub/d.txt"), 7)])
+        for line in lines:
+            self.assertEqual(line['plaintext'], PLAINTEXT)
+            self.assertIsNone(line['flag'])
+        
+        # Plusieurs processus, dans l'ordre des entrées, vers --output
+        pattern = self.path("**/*.txt")
+        code, _, _ = self.run_cli(["batch", pattern, "--jobs", "2", "--ordered",
+                                   "--output", self.path("out.ndjson"), "--quiet"])
+        self.assertEqual(code, 0)
+        with open(self.path("out.ndjson"), encoding='utf-8') as f:
+            parallel = records(f.read())
+        code, stdout, _ = self.run_cli(["batch", pattern, "--jobs", "1", "--quiet"])
+        # Les erreurs sont écrites dès la lecture: seul l'ordre des résultats est fixé
+        self.assertEqual([line for line in parallel if 'error' not in line],
+                         [line for line in records(stdout) if 'error' not in line])
+        self.assertEqual(sorted(line['file'] for line in parallel),
+                         sorted(line['file'] for line in records(stdout)))
+        
+        # Aucune entrée lisible: échec
+        code, _, _ = self.run_cli(["batch", self.path("missing.txt"), "--quiet"])
+        self.assertEqual(code, 1)
+        with self.assertRaises(SystemExit), contextlib.redirect_stderr(io.StringIO()):
+            main(["batch", self.tmpdir.name, "--jobs", "0"])
+    
+    
+    def test_stdin_input(self):
+        import json
+        
+        code, stdout, _ = self.run_cli(["--input", "-", "--json", "--quiet", "--top", "2"],
+                                       stdin=CaesarCipher.encrypt(PLAINTEXT, 11) + "\n")
+        self.assertEqual(code, 0)
+        results = json.loads(stdout)
+        self.assertEqual(results['best_solution']['key'], 11)
+        self.assertEqual(results['best_solution']['plaintext'], PLAINTEXT)
+        self.assertEqual(len(results['top_solutions']), 2)
+        
+        code, _, stderr = self.run_cli(["--input", "-"], stdin="  \n")
+        self.assertEqual(code, 1)
+        self.assertIn("vide", stderr)
+    
+    def test_lines_mode(self):
+        import json
+        
+        keys = [3, 7, 19]
+        lines = [CaesarCipher.encrypt(PLAINTEXT, key) for key in keys]
+        stdin_text = lines[0] + "\n\n   \n" + lines[1] + "\n" + lines[2]
+        
+        class Output(io.StringIO):
+            """Sortie qui mémorise le nombre de réponses vidées."""
+            flushed = 0
+            
+            def flush(self):
+                super().flush()
+                self.flushed = self.getvalue().count("\n")
+        
+        class Input(io.StringIO):
+            """Entrée qui mémorise, à chaque lecture, les réponses déjà vidées."""
+            reads = []
+            
+            def readline(self, *args):
+                self.reads.append(output.flushed)
+                return super().readline(*args)
+        
+        output = Output()
+        with contextlib.redirect_stdout(output), contextlib.redirect_stderr(io.StringIO()) as stderr, \
+                mock.patch('sys.stdin', Input(stdin_text)):
+            code = main(["--input", "-", "--lines", "--plaintext"])
+        self.assertEqual(code, 0)
+        self.assertIn("3 lignes analysées", stderr.getvalue())
+        
+        records = [json.loads(line) for line in output.getvalue().splitlines()]
+        self.assertEqual([record['line'] for record in records], [1, 4, 5])
+        self.assertEqual([record['key'] for record in records], keys)
+        self.assertEqual({record['plaintext'] for record in records}, {PLAINTEXT})
+        self.assertNotIn('flag', records[0])
+        # Chaque réponse est vidée avant la lecture de la ligne suivante
+        self.assertEqual(Input.reads, [0, 1, 1, 1, 2, 3])
+        
+        # Fichier en entrée, NDJSON vers --output
+        source = self.write("feed.txt", stdin_text)
+        code, stdout, _ = self.run_cli(["--input", source, "--lines", "--find-flag", "--quiet",
+                                        "--output", self.path("out.ndjson")])
+        self.assertEqual((code, stdout), (0, ""))
+        with open(self.path("out.ndjson"), encoding='utf-8') as f:
+            records = [json.loads(line) for line in f]
+        self.assertEqual([(record['line'], record['key']) for record in records],
+                         [(1, 3), (4, 7), (5, 19)])
+        self.assertEqual({record['flag'] for record in records}, {None})
+    
+    
+    def test_mmap_mode(self):
+        import json
+        
+        plaintext = (PLAINTEXT + "\n") * 5
+        source = self.write("dump.enc", CaesarCipher.encrypt(plaintext, 7))
+        
+        code, stdout, stderr = self.run_cli(["--input", source, "--mmap", "--jobs", "2",
+                                             "--top", "3", "--output", self.path("dump.txt")])
+        self.assertEqual((code, stdout), (0, ""))
+        self.assertIn("Clé 7", stderr)
+        with open(self.path("dump.txt"), encoding='utf-8', newline='') as f:
+            self.assertEqual(f.read(), plaintext)
+        
+        # Rapport JSON sur stderr: hypothèses sans 'plaintext'
+        code, _, stderr = self.run_cli(["--input", source, "--mmap", "--jobs", "1", "--json",
+                                        "--top", "2", "--output", self.path("dump2.txt")])
+        self.assertEqual(code, 0)
+        report = json.loads(stderr[:stderr.rindex("}") + 1])
+        self.assertEqual(report['best_solution']['key'], 7)
+        self.assertEqual(len(report['top_solutions']), 2)
+        self.assertEqual(set(report['best_solution']), {'key', 'score', 'confidence', 'preview'})
+        
+        # Au moins une clé à déchiffrer et un processus; pas d'entrée standard
+        for top in ("0", "-1"):
+            with self.assertRaises(SystemExit), contextlib.redirect_stderr(io.StringIO()):
+                main(["--input", source, "--mmap", "--top", top])
+        for jobs in ("0", "-1"):
+            with self.assertRaises(SystemExit), contextlib.redirect_stderr(io.StringIO()):
+                main(["--input", source, "--mmap", "--jobs", jobs])
+        code, _, stderr = self.run_cli(["--input", "-", "--mmap"])
+        self.assertEqual(code, 1)
+    
+    
+    def test_cache_closed_on_exit(self):
+        from analysis.cache import ResultCache
+        
+        cache = self.path("results.db")
+        source = self.write("cipher.txt", CaesarCipher.encrypt(PLAINTEXT, 5) + "\n")
+        for argv in (["--input", source, "--quiet"],
+                     ["--input", source, "--lines", "--quiet"],
+                     ["batch", source, "--jobs", "1", "--quiet"]):
+            with self.subTest(argv=argv):
+                code, _, _ = self.run_cli(argv + ["--cache", cache])
+                self.assertEqual(code, 0)
+                # Dernière connexion fermée: journal WAL reporté dans la base et supprimé
+                self.assertFalse(os.path.exists(cache + "-wal"))
+        
+        with ResultCache(cache) as results:
+            self.assertEqual(results.stats()["entries"], 1)
+    
+    
+    def test_language_outside_project(self):
+        import json
+        
+        # Données du paquet, pas du répertoire courant
+        self.addCleanup(os.chdir, os.getcwd())
+        os.chdir(self.tmpdir.name)
+        source = self.write("message.txt", CaesarCipher.encrypt(PLAINTEXT, 5) + "\n")
+        code, stdout, _ = self.run_cli(["--input", source, "--lang", "fr", "--json", "--quiet"])
+        self.assertEqual(code, 0)
+        self.assertEqual(json.loads(stdout)['metadata']['language'], "fr")
+        
+        with self.assertRaises(SystemExit), contextlib.redirect_stderr(io.StringIO()) as stderr:
+            main(["--input", source, "--lang", "xx"])
+        self.assertIn("disponibles: en, fr, auto", stderr.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -235,6 +235,317 @@ class TestTextScorer(unittest.TestCase):
             self.assertAlmostEqual(scores1[method], scores2[method], places=5,
                                  msg=f"Scores for {method} not consistent")
 
+    
+    def test_score_shifts_matches_decrypted_scores(self):
+        """Test histogram rotation gives the same scores as decrypting each key."""
+        from crypto.caesar import CaesarCipher
+        
+        plaintext = "The quick brown fox jumps over the lazy dog. Déjà vu, naïve café!"
+        ciphertext = CaesarCipher.encrypt(plaintext, 11)
+        
+        results = self.scorer.score_shifts(ciphertext)
+        self.assertEqual([key for key, _ in results], list(range(1, 26)))
+        
+        for key, score in results:
+            expected = self.scorer.combined_score(CaesarCipher.decrypt(ciphertext, key))
+            self.assertEqual(score, expected, f"Score mismatch for key {key}")
+
+    
+    def test_array_scores_match_text_scores(self):
+        """Test vectorized scorers consume the brute-force matrix directly."""
+        from crypto.caesar import CaesarCipher
+        
+        ciphertext = CaesarCipher.encrypt("The quick brown fox jumps over the lazy dog", 5)
+        matrix = CaesarCipher.brute_force_array(ciphertext)
+        
+        frequency = self.scorer.score_frequency_array(matrix)
+        bigrams = self.scorer.score_bigrams_array(matrix)
+        entropy = self.scorer.score_entropy_array(matrix)
+        
+        for row, (key, plaintext) in enumerate(CaesarCipher.brute_force(ciphertext)):
+            with self.subTest(key=key):
+                self.assertAlmostEqual(frequency[row], self.scorer.score_frequency(plaintext), places=9)
+                self.assertAlmostEqual(bigrams[row], self.scorer.score_bigrams(plaintext), places=9)
+                self.assertAlmostEqual(entropy[row], self.scorer.score_entropy(plaintext), places=9)
+
+    
+    def test_features_shared_by_all_methods(self):
+        """Test every method gives the same score from precomputed features."""
+        from analysis.features import TextFeatures
+        
+        texts = [
+            "The quick brown fox jumps over the lazy dog",
+            "Hello, World! This is a test-text with punctuation.",
+            "Déjà vu: İstanbul, ΣΟΦΙΑ and naïve café",
+            "",
+        ]
+        for text in texts:
+            with self.subTest(text=text):
+                features = TextFeatures.from_text(text)
+                self.assertEqual(sum(features.word_counts.values()), len(self.scorer._extract_words(text)))
+                for method in ('score_stopwords', 'score_dictionary', 'score_frequency',
+                               'score_bigrams', 'score_entropy', 'combined_score'):
+                    self.assertEqual(getattr(self.scorer, method)(features),
+                                     getattr(self.scorer, method)(text), method)
+
+    
+    def test_merged_chunk_features(self):
+        """Test features merged over chunks equal the features of the whole text."""
+        import functools
+        from analysis.features import TextFeatures
+        
+        text = "The quick brown fox jumps over the lazy dog. Déjà vu in İstanbul!"
+        for size in (1, 2, 3, 7, 16, len(text)):
+            with self.subTest(size=size):
+                chunks = [text[start:start + size] for start in range(0, len(text), size)]
+                merged = functools.reduce(TextFeatures.merge, map(TextFeatures.from_text, chunks))
+                streamed = TextFeatures.empty()
+                for chunk in chunks:
+                    streamed.update(chunk)
+                whole = TextFeatures.from_text(text)
+                
+                for features in (merged, streamed):
+                    for name in ('letter_counts', 'letter_total', 'bigram_counts',
+                                 'bigram_total', 'word_counts', 'word_total'):
+                        self.assertEqual(getattr(features, name), getattr(whole, name), name)
+                    self.assertEqual(self.scorer.combined_score(features), self.scorer.combined_score(text))
+        
+        with self.assertRaises(ValueError):
+            TextFeatures.from_text("abc").shifted(1).merge(TextFeatures.from_text("def"))
+    
+    def test_score_many(self):
+        """Test batch scoring matches analyze_text text by text."""
+        from crypto.caesar import CaesarCipher
+        
+        texts = ["The quick brown fox jumps over the lazy dog",
+                 CaesarCipher.encrypt("Meet me at the old bridge after dark", 9),
+                 "", "a", "!!", "ab", "Déjà vu à l'école", "İstanbul", "the\0end"]
+        scores = self.scorer.score_many(texts)
+        self.assertEqual(scores.dtype.names,
+                         ('frequency', 'bigrams', 'entropy', 'stopwords', 'dictionary', 'combined'))
+        self.assertEqual(len(scores), len(texts))
+        for text, row in zip(texts, scores):
+            for method, expected in self.scorer.analyze_text(text).items():
+                with self.subTest(text=text, method=method):
+                    self.assertAlmostEqual(row[method], expected, places=9)
+        
+        weights = {'stopwords': 1.0, 'frequency': 2.0}
+        for text, row in zip(texts, self.scorer.score_many(texts, weights)):
+            self.assertAlmostEqual(row['combined'], self.scorer.combined_score(text, weights), places=9)
+        self.assertEqual(len(self.scorer.score_many([])), 0)
+    
+    def test_word_hits_match_set_lookups(self):
+        """Test the shape index counts the same hits as per-key set lookups."""
+        from analysis.features import TextFeatures
+        from crypto.caesar import CaesarCipher
+        
+        for text in ("The secret is hidden in the message of the day", "Déjà vu à İstanbul",
+                     "The café is the secret message", ""):
+            features = TextFeatures.from_text(CaesarCipher.decrypt(CaesarCipher.encrypt(text, 11), 0))
+            hits = self.scorer.word_hits(features)
+            for key in range(26):
+                with self.subTest(text=text, key=key):
+                    shifted = features.shifted(key)
+                    self.assertEqual(hits['stopwords'][key],
+                                     sum(count for word, count in shifted.word_counts.items()
+                                         if word in self.scorer.stopwords))
+                    self.assertEqual(hits['dictionary'][key],
+                                     sum(count for word, count in shifted.word_counts.items()
+                                         if word in self.scorer.dictionary))
+        
+        # Non-ASCII words take the per-key path
+        self.assertEqual(self.scorer.word_hits(TextFeatures.from_text("thé"))['stopwords'],
+                         [0] * 26)
+    
+    def test_languages(self):
+        """Test language models load on demand and score from shared features."""
+        import string
+        import tempfile
+        from analysis.languages import load_bigrams, load_letter_frequencies
+        from crypto.caesar import CaesarCipher
+        
+        self.assertEqual(self.scorer.language, "en")
+        self.assertIn("fr", self.scorer.available_languages())
+        french = self.scorer.for_language("fr")
+        self.assertIs(self.scorer.for_language("fr"), french)
+        self.assertIs(french.for_language("en"), self.scorer)
+        self.assertIn("les", french.stopwords)
+        self.assertIn("message", french.dictionary)
+        self.assertEqual(max(french.letter_frequencies, key=french.letter_frequencies.get), "e")
+        self.assertNotEqual(french.data_signature(), self.scorer.data_signature())
+        
+        text = ("Le soldat demandait à son frère d'apporter du pain et une lampe, "
+                "et de ne rien dire à personne avant le rendez-vous sous le pont.")
+        self.assertEqual(next(iter(self.scorer.score_languages(text))), "fr")
+        self.assertGreater(french.score_ngrams(text), self.scorer.score_ngrams(text))
+        
+        # One feature pass, each language ranks the keys as rank_shifts would
+        ciphertext = CaesarCipher.encrypt(text, 7)
+        ranked = self.scorer.rank_languages(ciphertext)
+        self.assertEqual(ranked[0][:2], ("fr", 7))
+        for language, key, score in ranked:
+            self.assertEqual((key, score),
+                             self.scorer.for_language(language).rank_shifts(ciphertext)[0])
+        
+        with self.assertRaises(ValueError):
+            TextScorer(language="xx")
+        with tempfile.TemporaryDirectory() as data_dir:
+            path = os.path.join(data_dir, "letters.txt")
+            with open(path, "w") as f:
+                f.write("# comment\ne 12.5\nab 3\n")
+            with self.assertRaises(ValueError):
+                load_letter_frequencies(path)
+            # Every letter needs a percentage
+            with open(path, "w") as f:
+                f.write("e 12.5\nt 9.1\n")
+            with self.assertRaises(ValueError):
+                load_letter_frequencies(path)
+            with open(path, "w") as f:
+                f.write("".join(f"{letter} 1\n" for letter in string.ascii_lowercase))
+            self.assertEqual(len(load_letter_frequencies(path)), 26)
+            with open(path, "w") as f:
+                f.write("Th\nhe\n")
+            self.assertEqual(load_bigrams(path), {"th", "he"})
+            
+            # English override files are part of the signature of cached results
+            english = TextScorer(data_dir=data_dir)
+            before = english.data_signature()
+            with open(os.path.join(data_dir, "bigrams_en.txt"), "w") as f:
+                f.write("th\n")
+            self.assertNotEqual(TextScorer(data_dir=data_dir).data_signature(), before)
+    
+    def test_score_ngrams(self):
+        """Test n-gram log-likelihood picks the right key on a short text."""
+        from crypto.caesar import CaesarCipher
+        
+        ciphertext = CaesarCipher.encrypt("Meet me at the old bridge after dark", 9)
+        candidates = CaesarCipher.brute_force(ciphertext)
+        matrix = CaesarCipher.brute_force_array(ciphertext)
+        
+        for n in (2, 3):
+            with self.subTest(n=n):
+                scores = [self.scorer.score_ngrams(plaintext, n) for _, plaintext in candidates]
+                best_key = candidates[scores.index(max(scores))][0]
+                self.assertEqual(best_key, 9)
+                
+                for score, array_score in zip(scores, self.scorer.score_ngrams_array(matrix, n)):
+                    self.assertAlmostEqual(score, array_score, places=6)
+                    self.assertGreaterEqual(score, 0.0)
+                    self.assertLessEqual(score, 100.0)
+        
+        # Too short for the order
+        self.assertEqual(self.scorer.score_ngrams("ab"), 0.0)
+        
+        # No quadgram table: the bundled corpus is too small to train one
+        with self.assertRaises(FileNotFoundError):
+            self.scorer.score_ngrams("Meet me at the old bridge", 4)
+    
+    def test_rank_ngram_shifts(self):
+        """Test n-gram key ranking from one histogram matches scoring each decryption."""
+        from crypto.caesar import CaesarCipher
+        
+        for text in ("Meet me at the old bridge after dark", "Café au lait, 20 € - déjà vu", "ab", ""):
+            ciphertext = CaesarCipher.encrypt(text, 9)
+            for n in (2, 3):
+                with self.subTest(text=text, n=n):
+                    ranked = self.scorer.rank_ngram_shifts(ciphertext, n)
+                    self.assertEqual(sorted(key for key, _ in ranked), list(range(1, 26)))
+                    self.assertEqual(ranked, sorted(ranked, key=lambda item: (-item[1], item[0])))
+                    for key, score in ranked:
+                        self.assertAlmostEqual(
+                            score, self.scorer.score_ngrams(CaesarCipher.decrypt(ciphertext, key), n),
+                            delta=0.01)
+        
+        self.assertEqual(self.scorer.rank_ngram_shifts(
+            CaesarCipher.encrypt("Meet me at the old bridge after dark", 9))[0][0], 9)
+    
+    def test_word_sets_snapshot(self):
+        """Test word sets are snapshotted and the snapshot follows the files."""
+        import tempfile
+        from analysis.snapshot import snapshot_path
+        
+        with tempfile.TemporaryDirectory() as data_dir:
+            with open(os.path.join(data_dir, "stopwords_en.txt"), "w") as f:
+                f.write("the\nand\n")
+            with open(os.path.join(data_dir, "words_en.txt"), "w") as f:
+                f.write("Hello\nworld\n")
+            
+            first = TextScorer(data_dir)
+            self.assertTrue(snapshot_path(data_dir, "words_en").exists())
+            
+            second = TextScorer(data_dir)
+            self.assertEqual(second.stopwords, {"the", "and"})
+            self.assertEqual(second.dictionary, first.dictionary)
+            self.assertEqual(second.dictionary, {"hello", "world"})
+            
+            # Editing a source file invalidates the snapshot
+            with open(os.path.join(data_dir, "words_en.txt"), "a") as f:
+                f.write("cipher\n")
+            self.assertIn("cipher", TextScorer(data_dir).dictionary)
+            self.assertEqual(TextScorer(data_dir, use_snapshot=False).dictionary,
+                             {"hello", "world", "cipher"})
+    
+    def test_packed_dictionary(self):
+        """Test the packed dictionary backend answers like the word set."""
+        import pickle
+        import tempfile
+        from analysis.features import TextFeatures
+        from analysis.packed_words import PackedWordSet, packed_path
+        from crypto.caesar import CaesarCipher
+        
+        words = ["the", "secret", "message", "hidden", "day", "Don't", "café", "x1", "ab", "bc"]
+        with tempfile.TemporaryDirectory() as data_dir:
+            with open(os.path.join(data_dir, "stopwords_en.txt"), "w") as f:
+                f.write("the\nof\n")
+            with open(os.path.join(data_dir, "words_en.txt"), "w", encoding="utf-8") as f:
+                f.write("\n".join(words) + "\n")
+            
+            # Small word files are not published; large ones are packed once
+            # and workers attach to the file published by the parent
+            as_set = TextScorer(data_dir, dictionary_backend="set")
+            self.assertEqual(as_set.publish_dictionary(), "set")
+            auto = TextScorer(data_dir)
+            self.assertEqual(auto.publish_dictionary(), "set")
+            self.assertFalse(packed_path(data_dir, "words_en").exists())
+            auto.PACKED_DICTIONARY_MIN_BYTES = 1
+            self.assertEqual(auto.publish_dictionary(), "packed")
+            self.assertTrue(packed_path(data_dir, "words_en").exists())
+            packed = TextScorer(data_dir, dictionary_backend="packed")
+            self.assertEqual(packed.publish_dictionary(), "packed")
+            self.assertIsInstance(packed.dictionary, PackedWordSet)
+            self.assertEqual(packed.dictionary, as_set.dictionary)
+            self.assertEqual(len(packed.dictionary), len(as_set.dictionary))
+            for word in ("secret", "don't", "café", "x1", "ab", "bc", "cd", "Secret", "", "zz"):
+                self.assertEqual(word in packed.dictionary, word in as_set.dictionary, word)
+            
+            for text in ("The secret is hidden in the message of the day", "ab bc cd café"):
+                features = TextFeatures.from_text(CaesarCipher.decrypt(CaesarCipher.encrypt(text, 5), 0))
+                self.assertEqual(packed.word_hits(features), as_set.word_hits(features))
+                self.assertEqual(packed.rank_shifts(features), as_set.rank_shifts(features))
+            
+            # Workers reopen the file instead of copying the words
+            copy = pickle.loads(pickle.dumps(packed.dictionary))
+            self.assertEqual(copy, as_set.dictionary)
+            
+            # A stale file is rebuilt from the word file
+            with open(os.path.join(data_dir, "words_en.txt"), "a") as f:
+                f.write("cipher\n")
+            rebuilt = TextScorer(data_dir, dictionary_backend="packed")
+            self.assertIn("cipher", rebuilt.dictionary)
+            
+            # Small word files stay sets by default
+            self.assertIsInstance(TextScorer(data_dir).dictionary, set)
+            for scorer in (packed, rebuilt):
+                scorer.dictionary.close()
+            copy.close()
+        
+        with self.assertRaises(ValueError):
+            TextScorer(dictionary_backend="trie")
+        
+        # Built-in fallback words are not published
+        with tempfile.TemporaryDirectory() as data_dir:
+            self.assertEqual(TextScorer(data_dir).publish_dictionary(), "set")
+
 
 def run_tests():
     """Run all scorer tests."""
@@ -0,0 +1,28 @@
+import unittest
+import subprocess
+import sys
+import os
+
+PROJECT_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+
+class TestStartup(unittest.TestCase):
+    
+    def test_heavy_modules_imported_lazily(self):
+        # Analyse complète dans un interpréteur neuf
+        script = (
+            "import sys\n"
+            f"sys.path.insert(0, {PROJECT_ROOT!r})\n"
+            "from cli import crack_caesar\n"
+            f"crack_caesar(['--input', {os.path.join(PROJECT_ROOT, 'test_message.txt')!r}, '--quiet'])\n"
+            "heavy = ('concurrent.futures', 'multiprocessing', 'numpy', 'json')\n"
+            "print('HEAVY:' + ','.join(name for name in heavy if name in sys.modules))\n"
+        )
+        result = subprocess.run([sys.executable, "-c", script], capture_output=True,
+                                text=True, check=True)
+        
+        self.assertEqual(result.stdout.rsplit("HEAVY:", 1)[-1].strip(), "")
+
+
+if __name__ == "__main__":
+    unittest.main()